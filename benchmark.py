@@ -0,0 +1,294 @@
+"""
+Benchmarks of the hot paths of rfxcom: decoding each protocol, dispatching
+packets to their callbacks, framing the bytes read and the packets per second
+handled end to end by the AsyncioTransport, talking to the simulator on a
+pseudo-terminal.
+
+The results are written as JSON so they can be compared between versions::
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+
+"""
+
+import json
+import platform
+from argparse import ArgumentParser
+from asyncio import Future, new_event_loop, set_event_loop, wait_for
+from sys import stdout
+from time import perf_counter, time
+from timeit import Timer
+
+from rfxcom import __version__, protocol
+from rfxcom.protocol import DEFAULT_HANDLER, DISPATCH_TABLE, HANDLERS
+from rfxcom.protocol.dispatch import packet_key
+from rfxcom.simulator import SAMPLE_PACKETS, Simulator
+from rfxcom.transport import AsyncioTransport
+from rfxcom.transport.base import BaseTransport
+
+#: A packet for every handler, the samples streamed by the simulator and the
+#: packets sent by the RFXtrx itself.
+PACKETS = SAMPLE_PACKETS + (
+    b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C\x2F\x01\x01\x00\x00',
+    b'\x04\x02\x01\x07\x00',
+    b'\x04\xFF\x00\x00\x00',
+)
+
+#: The traffic at a typical site, as ``(packet, count)``. Most of it is from
+#: temperature and humidity sensors, with some energy, weather and lighting.
+TRAFFIC_MIX = (
+    (SAMPLE_PACKETS[10], 8),  # TempHumidity
+    (SAMPLE_PACKETS[9], 4),  # Temperature
+    (SAMPLE_PACKETS[0], 4),  # Elec
+    (SAMPLE_PACKETS[11], 2),  # TempHumidityBaro
+    (SAMPLE_PACKETS[13], 2),  # Wind
+    (SAMPLE_PACKETS[8], 1),  # Rain
+    (SAMPLE_PACKETS[12], 1),  # UltraViolet
+    (SAMPLE_PACKETS[3], 1),  # Lighting2
+    (SAMPLE_PACKETS[6], 1),  # Lighting5
+)
+
+
+def handler_packets():
+    """Return the sample packet of each handler in ``HANDLERS``."""
+
+    packets = {}
+
+    for data in PACKETS:
+        Handler = DISPATCH_TABLE.get(packet_key(data), DEFAULT_HANDLER)
+        packets.setdefault(Handler, bytearray(data))
+
+    return [(Handler, packets[Handler]) for Handler in HANDLERS
+            if Handler in packets]
+
+
+def traffic():
+    """Return the packets of ``TRAFFIC_MIX``, interleaved."""
+
+    packets = []
+
+    for data, count in TRAFFIC_MIX:
+        packets.extend([bytearray(data)] * count)
+
+    # Spread the packets of each type out rather than grouping them.
+    return packets[::2] + packets[1::2]
+
+
+def timed(function, number, repeat):
+    """Time the function, returning the best of ``repeat`` runs of
+    ``number`` calls.
+    """
+
+    best = min(Timer(function).repeat(repeat, number)) / number
+
+    return {
+        'seconds_per_call': best,
+        'calls_per_second': 1 / best,
+    }
+
+
+def bench_parse(number, repeat):
+    """The cost of ``parse`` for each handler."""
+
+    results = {}
+
+    for Handler, data in handler_packets():
+        parser = Handler()
+        results[Handler.__name__] = timed(
+            lambda: parser.parse(data), number, repeat)
+
+    return results
+
+
+def _noop(parser):
+    pass
+
+
+def bench_dispatch(number, repeat):
+    """The cost of finding the handler and callback of each packet in the
+    traffic mix and loading it, with ``get_callback_parser``.
+    """
+
+    results = {}
+    packets = traffic()
+
+    for lazy in (False, True):
+
+        transport = BaseTransport(object(), callbacks={
+            protocol.Elec: _noop,
+            protocol.TempHumidity: _noop,
+            protocol.Temperature: _noop,
+            '*': _noop,
+        }, lazy=lazy)
+
+        def dispatch():
+            for pkt in packets:
+                transport.get_callback_parser(pkt)
+
+        result = timed(dispatch, number, repeat)
+        result['packets_per_second'] = (result['calls_per_second'] *
+                                        len(packets))
+        results['lazy' if lazy else 'eager'] = result
+
+    return results
+
+
+class _BurstDevice:
+    """A device that always has the same burst of packets waiting."""
+
+    def __init__(self, data):
+        self.data = data
+        self.in_waiting = len(data)
+
+    def read(self, size):
+        return self.data
+
+
+class _FramingTransport(BaseTransport):
+    """A transport that only frames the packets read."""
+
+    def do_callback(self, pkt):
+        pass
+
+
+def bench_read(number, repeat):
+    """The cost of reading a burst of packets and splitting it into frames
+    with ``read``, without calling the callbacks.
+    """
+
+    packets = traffic()
+    data = b''.join(packets)
+
+    transport = _FramingTransport(_BurstDevice(data), callback=_noop)
+
+    result = timed(transport.read, number, repeat)
+    result['packets_per_second'] = result['calls_per_second'] * len(packets)
+    result['bytes_per_call'] = len(data)
+
+    return result
+
+
+def bench_asyncio_transport(total, timeout=60):
+    """The packets per second handled end to end by the AsyncioTransport
+    reading from the simulator as fast as it can.
+    """
+
+    # The transport starts its handshake on the default loop.
+    loop = new_event_loop()
+    set_event_loop(loop)
+
+    done = Future(loop=loop)
+    times = []
+
+    def callback(parser):
+
+        times.append(perf_counter())
+
+        if len(times) == total and not done.done():
+            done.set_result(None)
+
+    packets = [data for data, _ in TRAFFIC_MIX]
+
+    try:
+        with Simulator(packets=packets, rate=None, total=total) as simulator:
+
+            transport = AsyncioTransport(simulator.port, loop, callbacks={
+                protocol.Status: _noop,
+                '*': callback,
+            })
+
+            try:
+                loop.run_until_complete(wait_for(done, timeout, loop=loop))
+            finally:
+                transport.close()
+    finally:
+        loop.close()
+        set_event_loop(None)
+
+    elapsed = times[-1] - times[0]
+
+    return {
+        'packets': total,
+        'seconds': elapsed,
+        'packets_per_second': (total - 1) / elapsed,
+    }
+
+
+def flatten(results, prefix=''):
+    """Yield the name and value of every number in the results."""
+
+    for name, value in results.items():
+
+        if isinstance(value, dict):
+            yield from flatten(value, prefix + name + '.')
+        else:
+            yield prefix + name, value
+
+
+def compare(results, previous):
+    """Print the change in each rate since the previous results."""
+
+    before = dict(flatten(previous['benchmarks']))
+
+    print("Compared with rfxcom %s:" % previous['rfxcom'])
+
+    for name, value in flatten(results['benchmarks']):
+
+        if not name.endswith('per_second') or not before.get(name):
+            continue
+
+        print("%-50s %+7.1f%%" % (name, (value / before[name] - 1) * 100))
+
+
+def main():
+
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', help="The file to write the JSON to, "
+                        "standard output by default")
+    parser.add_argument('--compare', help="A JSON file written before to "
+                        "compare the results with")
+    parser.add_argument('--number', type=int, default=10000,
+                        help="The number of calls timed")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="The number of times the calls are timed, the "
+                        "best is kept")
+    parser.add_argument('--packets', type=int, default=20000,
+                        help="The number of packets sent through the "
+                        "AsyncioTransport")
+    parser.add_argument('--skip-transport', action='store_true',
+                        help="Don't run the AsyncioTransport benchmark, it "
+                        "needs pseudo-terminals")
+    args = parser.parse_args()
+
+    benchmarks = {
+        'parse': bench_parse(args.number, args.repeat),
+        'dispatch': bench_dispatch(max(args.number // 10, 1), args.repeat),
+        'read': bench_read(max(args.number // 10, 1), args.repeat),
+    }
+
+    if not args.skip_transport:
+        benchmarks['asyncio_transport'] = bench_asyncio_transport(
+            args.packets)
+
+    results = {
+        'rfxcom': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time(),
+        'benchmarks': benchmarks,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -42,3 +42,29 @@ class UnknownPacketSubtype(RFXComException):
     """This exception is raised when the packet subtype isn't recognised by
     the used packet handler class.
     """
+
+
+class UnknownCommand(RFXComException):
+    """This exception is raised when a packet is encoded with a command that
+    isn't known for the packet subtype.
+    """
+
+
+class WriteQueueFull(RFXComException):
+    """This exception is raised when a packet is written to a transport with
+    a write queue that already holds as many packets as it allows.
+    """
+
+
+class TransmitFailed(RFXComException):
+    """This exception is raised when the RFXtrx doesn't acknowledge a packet
+    written for transmission, either because it answered with a NAK or
+    because no answer was received in time.
+    """
+
+
+class InvalidCapture(RFXComException):
+    """This exception is raised when a file read as a capture doesn't start
+    with the capture file header, or was written with an unknown version of
+    the format.
+    """
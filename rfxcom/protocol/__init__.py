@@ -4,7 +4,10 @@ Protocol Constants
 
 """
 
+from rfxcom.exceptions import RFXComException
+
 from .base import Packet
+from .dispatch import build_dispatch_table, iter_frames, packet_key
 from .elec import Elec
 from .humidity import Humidity
 from .lighting1 import Lighting1
@@ -18,6 +21,7 @@ from .status import Status
 from .temperature import Temperature
 from .temphumidity import TempHumidity
 from .temphumiditybaro import TempHumidityBaro
+from .transmitter import Transmitter
 from .ultraviolet import UltraViolet
 from .wind import Wind
 
@@ -50,7 +54,56 @@ HANDLERS = [
     Temperature,
     TempHumidity,
     TempHumidityBaro,
+    Transmitter,
     UltraViolet,
     Wind,
     Packet,  # At the end as we should try it last.
 ]
+
+#: A dictionary mapping ``(packet_type, packet_subtype)`` to the class in
+#: ``HANDLERS`` that understands that packet. It is built once at import time
+#: so finding a handler is a single dictionary lookup, anything missing from
+#: it is handled by ``DEFAULT_HANDLER``.
+DISPATCH_TABLE, DEFAULT_HANDLER = build_dispatch_table(
+    (Handler, Handler) for Handler in HANDLERS)
+
+
+def decode_packet(data):
+    """Decode a packet with the handler found in ``DISPATCH_TABLE``. A
+    packet the handler rejects, for example one too short for its layout,
+    is decoded by ``DEFAULT_HANDLER`` instead so a bad packet never stops
+    the packets after it from being decoded.
+
+    :param data: The packet
+    :type data: bytearray
+
+    :return: The parsed data of the packet
+    :rtype: dict
+    """
+
+    Handler = DISPATCH_TABLE.get(packet_key(data), DEFAULT_HANDLER)
+
+    try:
+        return Handler.decode(data)
+    except RFXComException:
+        return DEFAULT_HANDLER.decode(data)
+
+
+def parse_many(buffer):
+    """Decode all of the packets in a buffer, such as a capture of the bytes
+    read from the RFXtrx, and yield the result of each one. The frames are
+    found with :py:func:`rfxcom.protocol.dispatch.iter_frames`, so they are
+    never copied, and each is decoded by :py:func:`decode_packet`.
+
+    Results from the ``DEFAULT_HANDLER``, for unknown and bad packets,
+    contain the memoryview of the frame rather than a copy of the bytes.
+
+    :param buffer: The packets, one after another
+    :type buffer: bytes
+
+    :return: A generator of the parsed data of each packet.
+    :rtype: generator
+    """
+
+    for frame in iter_frames(buffer):
+        yield decode_packet(frame)
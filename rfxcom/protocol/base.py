@@ -7,12 +7,16 @@ Handlers.
 
 """
 
+from binascii import hexlify
+from collections import OrderedDict
 from datetime import datetime
 from logging import getLogger
 
 from rfxcom.exceptions import (InvalidPacketLength, MalformedPacket,
-                               UnknownPacketType, UnknownPacketSubtype,
-                               RFXComException)
+                               UnknownCommand, UnknownPacketType,
+                               UnknownPacketSubtype)
+from rfxcom.protocol.lazy import LazyPacket
+from rfxcom.protocol.results import make_result_class
 
 
 class BasePacket:
@@ -21,14 +25,83 @@ class BasePacket:
     base API.
     """
 
-    def __init__(self):
-        """The BasePacket class is initialised with no arguments. It simply
-        sets up a number of instance attributes when its created.
+    #: A dictionary mapping the packet types understood by this class to
+    #: their names. These are shared by every instance and must not be
+    #: changed at runtime.
+    PACKET_TYPES = {}
+
+    #: A dictionary mapping the packet subtypes understood by this class to
+    #: their names.
+    PACKET_SUBTYPES = {}
+
+    @property
+    def log(self):
+        """The logger for this packet class, it is looked up when it is used
+        rather than each time a packet is created.
+        """
+        return getLogger('rfxcom.protocol.%s' % self.__class__.__name__)
+
+    @classmethod
+    def handler(cls):
+        """Return the shared instance of this class. Parsing doesn't change
+        the state of a packet handler, so a single instance can be reused
+        for every packet rather than creating a new one each time.
+
+        :return: The shared instance of this class
+        :rtype: BasePacket
+        """
+        # Look in the class __dict__ so a subclass doesn't get the instance
+        # of its parent.
+        handler = cls.__dict__.get('_handler')
+
+        if handler is None:
+            handler = cls._handler = cls()
+
+        return handler
+
+    @classmethod
+    def decode(cls, data):
+        """Parse the data and return the result without storing anything on
+        a packet instance. This is the same as calling ``parse`` on a new
+        instance, but uses the shared instance from ``handler``.
+
+        :param data: bytearray to be parsed
+        :type data: bytearray
+
+        :return: The parsed data represented in a dictionary
+        :rtype: dict
         """
+        return cls.handler().parse(data)
 
-        self.log = getLogger('rfxcom.protocol.%s' % self.__class__.__name__)
-        self.PACKET_TYPES = {}
-        self.PACKET_SUBTYPES = {}
+    @classmethod
+    def view(cls, data):
+        """Return a read only mapping of the parsed data. Packet classes
+        which describe their fields return a
+        :py:class:`rfxcom.protocol.lazy.LazyPacket` that only decodes a field
+        when it is used, otherwise this is the same as ``decode``.
+
+        :param data: bytearray to be parsed
+        :type data: bytearray
+
+        :return: The parsed data represented in a mapping
+        :rtype: collections.abc.Mapping
+        """
+        return cls.decode(data)
+
+    @classmethod
+    def device_key(cls, data):
+        """Return a key identifying the device that sent the packet, or None
+        if packets of this type don't identify their device. Packets from
+        the same device have equal keys, so it can be used as a dictionary
+        key. The packet isn't validated.
+
+        :param data: bytearray of received data
+        :type data: bytearray
+
+        :return: The device key
+        :rtype: tuple
+        """
+        return None
 
     def dump_hex(self, data):
         """Given some bytes return the hex representation.
@@ -39,7 +112,7 @@ class BasePacket:
         :return: The formatted bytes as a readable hex string.
         :rtype: string
         """
-        return "0x%s" % (''.join('{:02x}'.format(x) for x in data)).upper()
+        return "0x%s" % hexlify(data).decode('ascii').upper()
 
     def parse(self, data):
         """Stub method to be implemented by subclasses. The parse method
@@ -83,42 +156,371 @@ class BasePacket:
             'sequence_number': sequence_number
         }
 
-    def load(self, data):
+    def load(self, data, lazy=False):
         """This is the entrance method for all data which is used to store the
         raw data and start parsing the data.
 
         :param data: The raw untouched bytearray as recieved by the RFXtrx
         :type data: bytearray
 
+        :param lazy: If True the data is stored as a lazy mapping from
+            ``view`` so fields are only decoded when they are accessed.
+        :type lazy: bool
+
         :return: The parsed data represented in a dictionary
         :rtype: dict
         """
         self.loaded_at = datetime.utcnow()
         self.raw = data
-        self.data = self.parse(data)
+
+        if lazy:
+            self.data = self.view(data)
+        else:
+            self.data = self.decode(data)
+
         return self.data
 
 
 class BasePacketHandler(BasePacket):
 
+    #: The :py:class:`rfxcom.protocol.fields.Layout` of packets of this type.
+    LAYOUT = None
+
+    #: A tuple of ``(name, decoder)`` pairs describing the fields in packets
+    #: of this type, see :py:mod:`rfxcom.protocol.fields`.
+    FIELDS = ()
+
+    #: The decoder of the integer ID of the sensor, for packets with an ID.
+    SENSOR_ID = None
+
+    #: The names of the values in ``LAYOUT`` which give the address of the
+    #: device a packet is sent to, see ``template``.
+    ADDRESS = ()
+
+    #: The code of each command name for each subtype, used when encoding
+    #: packets.
+    COMMAND_CODES = {}
+
+    #: The maximum number of templates cached by ``template``.
+    TEMPLATE_CACHE_SIZE = 1024
+
+    @classmethod
+    def template(cls, sub_type, *address):
+        """Return the template packet for sending to a device. It contains
+        the header and the values named in ``ADDRESS``, everything else is
+        zero. Templates are cached, so encoding a packet only needs to copy
+        the template and fill in the command.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param address: The values of ``ADDRESS`` in the same order
+
+        :raises: :py:class:`rfxcom.exceptions.UnknownPacketSubtype`: If the
+            packet sub type is unknown to this packet handler
+
+        :return: The template, it is shared so can't be changed.
+        :rtype: bytes
+        """
+
+        templates = cls.__dict__.get('_templates')
+
+        if templates is None:
+            templates = cls._templates = {}
+
+        key = (sub_type,) + address
+
+        try:
+            return templates[key]
+        except KeyError:
+            pass
+
+        if sub_type not in cls.PACKET_SUBTYPES:
+            raise UnknownPacketSubtype(
+                "Can't encode packet subtype %s" % sub_type)
+
+        packet_type, = cls.PACKET_TYPES
+        layout = cls.LAYOUT
+
+        template = bytes(layout.pack(packet_length=layout.size - 1,
+                                     packet_type=packet_type,
+                                     packet_subtype=sub_type,
+                                     **dict(zip(cls.ADDRESS, address))))
+
+        if len(templates) < cls.TEMPLATE_CACHE_SIZE:
+            templates[key] = template
+
+        return template
+
+    @classmethod
+    def command_code(cls, sub_type, command):
+        """Return the code of a command, given either its name or its code.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param command: The name or code of the command
+        :type command: str
+
+        :raises: :py:class:`rfxcom.exceptions.UnknownCommand`: If the command
+            name isn't known for the subtype
+
+        :rtype: int
+        """
+
+        if isinstance(command, int):
+            return command
+
+        try:
+            return cls.COMMAND_CODES[sub_type][command]
+        except KeyError:
+            raise UnknownCommand("Unknown command %r for packet subtype %s"
+                                 % (command, sub_type))
+
+    @classmethod
+    def sensor_id(cls, data):
+        """Return the ID of the sensor that sent the packet as an integer,
+        or None if packets of this type don't have an ID. Unlike the ``id``
+        returned by ``parse`` no string is built, so this is cheaper to use as
+        a dictionary key or to compare. The packet isn't validated.
+
+        :param data: bytearray of received data
+        :type data: bytearray
+
+        :return: The sensor ID
+        :rtype: int
+        """
+
+        if cls.SENSOR_ID is None:
+            return None
+
+        return cls.SENSOR_ID(cls.LAYOUT.unpack_from(data))
+
+    @classmethod
+    def _address_decoder(cls):
+        """Return a decoder of the values that identify the device sending
+        packets of this type, or None if there aren't any. This is the
+        ``ADDRESS`` of the device, as several devices can share an ID, or
+        else the ``SENSOR_ID``.
+        """
+
+        if cls.ADDRESS:
+            return cls.LAYOUT.combine(lambda *values: values, *cls.ADDRESS)
+
+        sensor_id = cls.SENSOR_ID
+
+        if sensor_id is not None:
+            return lambda values: (sensor_id(values), )
+
+        return None
+
+    @classmethod
+    def device_key(cls, data):
+        """Return a key identifying the device that sent the packet, the
+        packet type and subtype followed by the values of ``ADDRESS`` or the
+        ``SENSOR_ID``. This is None for packets that don't identify their
+        device. The packet isn't validated.
+
+        :param data: bytearray of received data
+        :type data: bytearray
+
+        :return: The device key
+        :rtype: tuple
+        """
+
+        try:
+            decode = cls.__dict__['_device_address']
+        except KeyError:
+            decode = cls._device_address = cls._address_decoder()
+
+        if decode is None:
+            return None
+
+        return (data[1], data[2]) + decode(cls.LAYOUT.unpack_from(data))
+
+    @classmethod
+    def fields(cls, sub_type):
+        """Return the ``(name, decoder)`` pairs of the fields present in a
+        packet of the given subtype. This is ``FIELDS`` unless a handler has
+        fields that only some of its subtypes provide.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :return: A tuple of ``(name, decoder)`` pairs
+        :rtype: tuple
+        """
+        return cls.FIELDS
+
+    @classmethod
+    def field_table(cls, sub_type):
+        """Return an ordered dictionary mapping the field names of a packet of
+        the given subtype to their decoder. It is built the first time each
+        subtype is seen and then reused.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :return: The decoders of the fields present in the packet
+        :rtype: collections.OrderedDict
+        """
+
+        # Look in the class __dict__ so a subclass doesn't get the tables of
+        # its parent.
+        tables = cls.__dict__.get('_field_tables')
+
+        if tables is None:
+            tables = cls._field_tables = {}
+
+        try:
+            return tables[sub_type]
+        except KeyError:
+            table = tables[sub_type] = OrderedDict(cls.fields(sub_type))
+            return table
+
+    def parse_fields(self, data):
+        """Decode all of the fields described by the handler into a
+        dictionary. This is the eager counterpart to ``view``.
+
+        :param data: bytearray to be parsed
+        :type data: bytearray
+
+        :return: Data dictionary containing the parsed values
+        :rtype: dict
+        """
+        values = self.LAYOUT.unpack_from(data)
+
+        return {name: decode(values)
+                for name, decode in self.field_table(data[2]).items()}
+
+    @classmethod
+    def view(cls, data):
+
+        if not cls.FIELDS:
+            return cls.decode(data)
+
+        cls.handler().validate_packet(data)
+
+        return LazyPacket(cls.LAYOUT, data, cls.field_table(data[2]))
+
+    @classmethod
+    def result_class(cls):
+        """Return the :py:class:`rfxcom.protocol.results.PacketResult`
+        subclass for this handler, which is created the first time it is
+        needed.
+
+        :return: The result class
+        :rtype: type
+        """
+
+        result_class = cls.__dict__.get('_result_class')
+
+        if result_class is None:
+            result_class = cls._result_class = make_result_class(cls)
+
+        return result_class
+
+    @classmethod
+    def _result_setters(cls, sub_type):
+        """Return ``(setter, decoder)`` pairs for the fields of the given
+        subtype where the setter stores a value in the slot of the result.
+        """
+
+        setters = cls.__dict__.get('_setters')
+
+        if setters is None:
+            setters = cls._setters = {}
+
+        try:
+            return setters[sub_type]
+        except KeyError:
+            result_class = cls.result_class()
+            pairs = setters[sub_type] = tuple(
+                (getattr(result_class, name).__set__, decode)
+                for name, decode in cls.fields(sub_type))
+            return pairs
+
+    @classmethod
+    def decode_result(cls, data):
+        """Parse the data into an instance of the result class for this
+        handler rather than a dictionary. It holds the same values as the
+        dictionary returned by ``parse`` in much less memory, and
+        ``to_dict`` converts it back. Handlers without ``FIELDS`` return
+        the dictionary from ``decode`` instead.
+
+        :param data: bytearray to be parsed
+        :type data: bytearray
+
+        :return: The parsed data
+        :rtype: rfxcom.protocol.results.PacketResult
+        """
+
+        if not cls.FIELDS:
+            return cls.decode(data)
+
+        cls.handler().validate_packet(data)
+
+        result_class = cls.result_class()
+        result = result_class.__new__(result_class)
+
+        values = cls.LAYOUT.unpack_from(data)
+
+        for set_, decode in cls._result_setters(data[2]):
+            set_(result, decode(values))
+
+        return result
+
     def can_handle(self, data):
         """Determine if the packet handler understand and can parse this
         packet. This is defined by the checks in the ``validate_packet``
         method but can_handle provides a neat interface to ignore errors and
-        see if the packet is good.
+        see if the packet is good. The checks are made by ``match``, which
+        doesn't raise any exceptions.
 
         :param data: bytearray to be verified
         :type data: bytearray
 
-        :return: The formatted bytes as a readable hex string.
+        :return: True if this handler can parse the packet.
         :rtype: boolean
         """
+        return self.match(data)
 
-        try:
-            return self.validate_packet(data)
-        except RFXComException:
+    def match(self, data):
+        """Make the same checks as ``validate_packet`` but return False
+        rather than raising an exception when one fails. Packets not matching
+        a handler is the normal case when looking for the right handler, so
+        this avoids the cost of creating the exceptions and their messages.
+        Use ``validate_packet`` to find out why a packet doesn't match.
+
+        :param data: bytearray to be verified
+        :type data: bytearray
+
+        :return: True if this handler can parse the packet.
+        :rtype: boolean
+        """
+
+        length = len(data)
+
+        if length < 4 or length != data[0] + 1:
             return False
 
+        packet_types = self.PACKET_TYPES
+
+        if packet_types and data[1] not in packet_types:
+            return False
+
+        packet_subtypes = self.PACKET_SUBTYPES
+
+        if packet_subtypes and data[2] not in packet_subtypes:
+            return False
+
+        layout = self.LAYOUT
+
+        if layout is not None and length < layout.size:
+            return False
+
+        return True
+
     def validate_packet(self, data):
         """Validate a packet against this packet handler and determine if it
         meets the requirements. This is done by checking the following
@@ -127,6 +529,7 @@ class BasePacketHandler(BasePacket):
         - The length of the packet is equal to the first byte.
         - The second byte is in the set of defined PACKET_TYPES for this class.
         - The third byte is in the set of this class defined PACKET_SUBTYPES.
+        - The packet is long enough for the LAYOUT of this class.
 
         If one or more of these conditions isn't met then we have a packet that
         isn't valid or at least isn't understood by this handler.
@@ -195,6 +598,13 @@ class BasePacketHandler(BasePacket):
                 "Expected packet type to be one of [%s] but recieved %s"
                 % (types, sub_type))
 
+        # Validate the length against the layout, a shorter packet can't be
+        # unpacked.
+        if self.LAYOUT is not None and expected_length < self.LAYOUT.size:
+            raise InvalidPacketLength(
+                "Expected packet length to be at least %s bytes but it was "
+                "%s bytes" % (self.LAYOUT.size, expected_length))
+
         return True
 
     def __str__(self):
@@ -0,0 +1,180 @@
+"""
+Columnar Decoding
+=================
+
+Decode large numbers of packets into NumPy arrays, with one array for each
+field, rather than a dictionary for each packet. Packets of the same type and
+subtype are all the same size, so each group is gathered into fixed size
+records and viewed as a structured array built from the ``LAYOUT`` of the
+packet handler. The fields are then computed for the whole group at once.
+
+This needs NumPy, which isn't installed with rfxcom. Install it with
+``pip install rfxcom[numpy]``.
+
+"""
+
+from collections import defaultdict
+
+from rfxcom.protocol import DEFAULT_HANDLER, DISPATCH_TABLE
+from rfxcom.protocol.dispatch import frame_offsets
+from rfxcom.protocol.elec import TOTAL_DIVISOR, Elec
+from rfxcom.protocol.temphumidity import TempHumidity
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+#: The NumPy types of the :py:mod:`struct` formats used in packet layouts.
+#: Byte strings such as IDs are read as big endian unsigned integers.
+DTYPES = {
+    'B': 'u1',
+    'H': '>u2',
+    'I': '>u4',
+    '2s': '>u2',
+    '4s': '>u4',
+}
+
+
+def layout_dtype(layout):
+    """Return the structured NumPy dtype of a packet layout.
+
+    :param layout: The layout of the packet
+    :type layout: rfxcom.protocol.fields.Layout
+
+    :return: A structured dtype with a field for each value in the layout
+    :rtype: numpy.dtype
+    """
+
+    fields = []
+
+    for name, format_ in zip(layout.names, layout.formats):
+
+        try:
+            fields.append((name, DTYPES[format_]))
+        except KeyError:
+            # Any other byte string is left as an array of bytes.
+            fields.append((name, 'u1', int(format_[:-1])))
+
+    return numpy.dtype(fields)
+
+
+def temperature(values):
+    """Compute the temperatures of an array of 16 bit values where the top
+    bit is the sign, in the same way as
+    :py:meth:`rfxcom.protocol.fields.Layout.temperature`.
+    """
+    magnitude = (values & 0x7fff) / 10
+    return numpy.where(values & 0x8000, -magnitude, magnitude)
+
+
+def _header_columns(records):
+    return {
+        'packet_subtype': records['packet_subtype'],
+        'sequence_number': records['sequence_number'],
+        'id': records['id'],
+        'signal_level': records['rssi'] >> 4,
+        'battery_level': records['rssi'] & 0x0f,
+    }
+
+
+def _elec_columns(records):
+
+    columns = _header_columns(records)
+
+    total = ((records['total_watts_high'].astype(numpy.uint64) << 32) +
+             records['total_watts_low'])
+
+    columns.update({
+        'count': records['count'],
+        'current_watts': records['current_watts'],
+        'total_watts': total / TOTAL_DIVISOR,
+    })
+
+    return columns
+
+
+def _temphumidity_columns(records):
+
+    columns = _header_columns(records)
+
+    columns.update({
+        'channel': records['id'] & 0xff,
+        'temperature': temperature(records['temperature']),
+        'humidity': records['humidity'],
+        'humidity_status': records['humidity_status'],
+    })
+
+    return columns
+
+
+#: The packet handlers that can be decoded into columns and the functions
+#: computing the columns from their records.
+COLUMNS = {
+    Elec: _elec_columns,
+    TempHumidity: _temphumidity_columns,
+}
+
+
+def decode_columns(buffer):
+    """Decode the packets in a buffer, such as a capture of the bytes read
+    from the RFXtrx, into arrays. The packets are grouped by their type and
+    subtype and the result is a dictionary mapping each
+    ``(packet_type, packet_subtype)`` found to a dictionary of arrays, one
+    for each field.
+
+    The values are the same as those returned by ``parse`` except that the
+    ``id`` is the integer value of the ID rather than a hex string and
+    ``humidity_status`` is the status number rather than its name. Only the
+    packet handlers in ``COLUMNS`` are supported, other packets and any with
+    the wrong length are skipped.
+
+    :param buffer: The packets, one after another
+    :type buffer: bytes
+
+    :raises: :py:class:`ImportError`: if NumPy isn't installed
+
+    :return: The columns of each type and subtype of packet
+    :rtype: dict
+    """
+
+    if numpy is None:
+        raise ImportError("NumPy is required to decode packets into columns")
+
+    data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    offsets = defaultdict(list)
+
+    for start, stop in frame_offsets(buffer):
+
+        if stop - start < 4:
+            continue
+
+        offsets[data[start + 1], data[start + 2]].append(start)
+
+    groups = {}
+
+    for key, starts in offsets.items():
+
+        Handler = DISPATCH_TABLE.get(key, DEFAULT_HANDLER)
+
+        if Handler not in COLUMNS:
+            continue
+
+        layout = Handler.LAYOUT
+        starts = numpy.array(starts)
+
+        # Drop any packets which don't have the expected length.
+        starts = starts[data[starts] == layout.size - 1]
+
+        if not len(starts):
+            continue
+
+        # Gather the bytes of every packet into a contiguous block of
+        # records and view them as the layout.
+        indexes = starts[:, None] + numpy.arange(layout.size)
+        records = data[indexes].view(layout_dtype(layout)).reshape(-1)
+
+        groups[int(key[0]), int(key[1])] = COLUMNS[Handler](records)
+
+    return groups
@@ -0,0 +1,125 @@
+"""
+Packet Dispatch
+===============
+
+Helpers used to find the packet handler for a packet with a single dictionary
+lookup rather than trying each handler in turn.
+
+"""
+
+
+def packet_key(data):
+    """Return the key used to look up the handler of a packet in a dispatch
+    table. This is the tuple ``(packet_type, packet_subtype)`` or ``None`` if
+    the packet is too short or its length byte doesn't match the number of
+    bytes received, in which case no packet handler would accept it.
+
+    :param data: bytearray of received data
+    :type data: bytearray
+
+    :return: The dispatch key for the packet.
+    :rtype: tuple
+    """
+    if len(data) < 4 or len(data) != data[0] + 1:
+        return None
+    return data[1], data[2]
+
+
+def _is_catch_all(Handler):
+    """A handler that defines neither packet types nor packet subtypes
+    accepts any well formed packet (and :py:class:`rfxcom.protocol.base.Packet`
+    accepts anything at all) so it can't be stored under specific keys.
+    """
+    return not (Handler.PACKET_TYPES or Handler.PACKET_SUBTYPES)
+
+
+def build_dispatch_table(entries):
+    """Build a dispatch table from an ordered iterable of ``(Handler, value)``
+    pairs. The table maps every ``(packet_type, packet_subtype)`` accepted by
+    a handler to its value. When more than one handler accepts the same key
+    the first one wins, which gives the same result as trying each handler in
+    order with ``can_handle``.
+
+    A catch-all handler (for example
+    :py:class:`rfxcom.protocol.base.Packet`) would match everything, so it
+    ends the table instead: its value is returned as the fallback and the
+    handlers after it are never reached.
+
+    :param entries: An iterable of ``(Handler, value)`` tuples.
+    :type entries: iterable
+
+    :return: A tuple containing the dispatch table and the fallback value, or
+        None if there is no catch-all handler.
+    :rtype: tuple
+    """
+
+    table = {}
+
+    for Handler, value in entries:
+
+        if _is_catch_all(Handler):
+            return table, value
+
+        # An empty set of packet types or subtypes isn't checked by
+        # validate_packet, so it accepts all of the 256 possible values.
+        packet_types = Handler.PACKET_TYPES or range(256)
+        packet_subtypes = Handler.PACKET_SUBTYPES or range(256)
+
+        for packet_type in packet_types:
+            for packet_subtype in packet_subtypes:
+                table.setdefault((packet_type, packet_subtype), value)
+
+    return table, None
+
+
+def frame_offsets(buffer):
+    """Walk the length prefixed frames in a buffer holding many packets, for
+    example a capture of the bytes read from the RFXtrx, and yield the
+    ``(start, stop)`` offsets of each one. Zero bytes between frames are
+    padding and are skipped, and a partial frame at the end of the buffer is
+    ignored.
+
+    :param buffer: The packets, one after another
+    :type buffer: bytes
+
+    :return: A generator of ``(start, stop)`` tuples, one for each frame.
+    :rtype: generator
+    """
+
+    view = memoryview(buffer).cast('B')
+
+    start = 0
+    end = len(view)
+
+    while start < end:
+
+        length = view[start]
+
+        if length == 0:
+            start += 1
+            continue
+
+        stop = start + length + 1
+
+        if stop > end:
+            return
+
+        yield start, stop
+        start = stop
+
+
+def iter_frames(buffer):
+    """Yield each of the frames found by :py:func:`frame_offsets` as a
+    :py:class:`memoryview` of the buffer so nothing is copied.
+
+    :param buffer: The packets, one after another
+    :type buffer: bytes
+
+    :return: A generator of memoryviews, one for each frame.
+    :rtype: generator
+    """
+
+    view = memoryview(buffer).cast('B')
+
+    for start, stop in frame_offsets(view):
+        yield view[start:stop]
@@ -4,8 +4,12 @@ Energy Usage Sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+
+
+#: The divisor applied to the raw total to give ``total_watts``.
+TOTAL_DIVISOR = 223.666
 
 
 class Elec(BasePacketHandler):
@@ -37,42 +41,37 @@ class Elec(BasePacketHandler):
     17      RSSI and Battery Level
     ====    ====
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x5A: "Energy usage sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: "CM119/160",
-            0x02: "CM180",
-        }
-
-    def _bytes_to_uint_32(self, bytes_):
-        """Converts an array of 4 bytes to a 32bit integer.
-
-        :param data: bytearray to be converted to a 32bit integer
-        :type data: bytearray
-
-        :return: the integer
-        :rtype: int
-        """
-        return ((bytes_[0] * pow(2, 24)) +
-                (bytes_[1] << 16) + (bytes_[2] << 8) + bytes_[3])
-
-    def _bytes_to_uint_48(self, bytes_):
-        """Converts an array of 6 bytes to a 48bit integer.
-
-        :param data: bytearray to be converted to a 48bit integer
-        :type data: bytearray
 
-        :return: the integer
-        :rtype: int
-        """
-        return ((bytes_[0] * pow(2, 40)) + (bytes_[1] * pow(2, 32)) +
-                (bytes_[2] * pow(2, 24)) + (bytes_[3] << 16) +
-                (bytes_[4] << 8) + bytes_[4])
+    PACKET_TYPES = {
+        0x5A: "Energy usage sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: "CM119/160",
+        0x02: "CM180",
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('count', 'B'),
+        ('current_watts', 'I'),
+        ('total_watts_high', 'H'),
+        ('total_watts_low', 'I'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('count', LAYOUT.value('count')),
+        ('current_watts', LAYOUT.value('current_watts')),
+        ('total_watts',
+         LAYOUT.combine(lambda high, low: ((high << 32) + low) / TOTAL_DIVISOR,
+                        'total_watts_high', 'total_watts_low')),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
 
     def parse(self, data):
         """Parse a 18 bytes packet in the Electricity format and return a
@@ -91,7 +90,7 @@ class Elec(BasePacketHandler):
                 'sequence_number': 0,
                 'packet_subtype': 1,
                 'packet_subtype_name': "CM119/160",
-                'total_watts': 920825.1947099693,
+                'total_watts': 920824.5195961836,
                 'signal_level': 9,
                 'battery_level': 6,
             }
@@ -105,25 +104,8 @@ class Elec(BasePacketHandler):
 
         self.validate_packet(data)
 
-        TOTAL_DIVISOR = 223.666
-
-        id_ = self.dump_hex(data[4:6])
-        count = data[6]
-        instant = data[7:11]
-        total = data[11:16]
-
-        current_watts = self._bytes_to_uint_32(instant)
-        total_watts = self._bytes_to_uint_48(total) / TOTAL_DIVISOR
-
-        sensor_specific = {
-            'count': count,
-            'current_watts': current_watts,
-            'id': id_,
-            'total_watts': total_watts
-        }
+        return self.parse_fields(data)
 
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[17]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Elec.decode_result`.
+ElecResult = Elec.result_class()
@@ -0,0 +1,206 @@
+"""
+Packet Fields
+=============
+
+Each packet handler declares the layout of its packets once as a
+:py:class:`Layout`, which is compiled into a :py:class:`struct.Struct` so all
+of the raw values in a packet are unpacked with a single ``unpack_from``
+call. The handler then describes the values it extracts as a tuple of
+``(name, decoder)`` pairs in its ``FIELDS`` attribute. A decoder is called
+with the tuple of unpacked values and returns the value of one field, doing
+any small fix-up needed such as scaling or looking up a name.
+
+"""
+
+from binascii import hexlify
+from operator import itemgetter
+from struct import Struct
+
+#: The maximum number of IDs cached by each :py:meth:`Layout.hex_id` decoder.
+HEX_ID_CACHE_SIZE = 1024
+
+
+class Layout:
+    """The layout of the bytes in a packet, given as ``(name, format)`` pairs
+    where the format is a :py:mod:`struct` format character. The RFX header
+    (packet length, packet type, packet subtype and sequence number) is
+    always at the start and doesn't need to be given. Values are big endian.
+
+    The methods create decoders for the values in the layout.
+    """
+
+    HEADER = (
+        ('packet_length', 'B'),
+        ('packet_type', 'B'),
+        ('packet_subtype', 'B'),
+        ('sequence_number', 'B'),
+    )
+
+    def __init__(self, *values):
+
+        values = self.HEADER + values
+
+        self.names = tuple(name for name, _ in values)
+        self.formats = tuple(format_ for _, format_ in values)
+        self.struct = Struct('>' + ''.join(self.formats))
+
+        #: The number of bytes in a packet with this layout.
+        self.size = self.struct.size
+
+        #: Unpack all of the values in the layout from a packet.
+        self.unpack_from = self.struct.unpack_from
+
+    def index(self, name):
+        """Return the position of the named value in the unpacked tuple."""
+        return self.names.index(name)
+
+    def pack(self, **values):
+        """Pack the named values into a new packet. Values that aren't given
+        are zero. Byte string values, such as IDs, can also be given as an
+        integer or as a hex string like the ones returned by :py:meth:`hex_id`.
+
+        :return: The packet
+        :rtype: bytearray
+        """
+
+        args = []
+
+        for name, format_ in zip(self.names, self.formats):
+
+            value = values.get(name, 0)
+
+            if format_.endswith('s'):
+
+                if isinstance(value, str):
+                    value = int(value, 16)
+
+                if isinstance(value, int):
+                    value = value.to_bytes(int(format_[:-1]), 'big')
+
+            args.append(value)
+
+        return bytearray(self.struct.pack(*args))
+
+    def header(self, packet_types, packet_subtypes):
+        """Return the fields of the RFX header, common to all packets.
+
+        :param packet_types: The names of the packet types
+        :type packet_types: dict
+
+        :param packet_subtypes: The names of the packet subtypes
+        :type packet_subtypes: dict
+
+        :return: A tuple of ``(name, decoder)`` pairs
+        :rtype: tuple
+        """
+        return (
+            ('packet_length', self.value('packet_length')),
+            ('packet_type', self.value('packet_type')),
+            ('packet_type_name', self.lookup('packet_type', packet_types)),
+            ('packet_subtype', self.value('packet_subtype')),
+            ('packet_subtype_name',
+             self.lookup('packet_subtype', packet_subtypes)),
+            ('sequence_number', self.value('sequence_number')),
+        )
+
+    def value(self, name):
+        """Decode the value unchanged."""
+        return itemgetter(self.index(name))
+
+    def hex_id(self, name):
+        """Decode a value of bytes as an upper case hex string, which is how
+        sensor IDs are presented. For example ``"0x2EB2"``. There are only a
+        few sensors in range of an RFXtrx, so the strings are cached rather
+        than formatted for every packet.
+        """
+        index = self.index(name)
+        cache = {}
+
+        def decode(values):
+
+            raw = values[index]
+
+            try:
+                return cache[raw]
+            except KeyError:
+                pass
+
+            value = "0x%s" % hexlify(raw).decode('ascii').upper()
+
+            if len(cache) < HEX_ID_CACHE_SIZE:
+                cache[raw] = value
+
+            return value
+
+        return decode
+
+    def int_id(self, name):
+        """Decode a value of bytes as a big endian unsigned integer. This is
+        the same ID as :py:meth:`hex_id` without building a string.
+        """
+        index = self.index(name)
+        return lambda values: int.from_bytes(values[index], 'big')
+
+    def lookup(self, name, table, default=None):
+        """Decode the value to its name in the ``table`` dictionary or
+        ``default`` when it isn't found.
+        """
+        index = self.index(name)
+        return lambda values: table.get(values[index], default)
+
+    def subtype_lookup(self, name, tables, default=None):
+        """Like :py:meth:`lookup`, but ``tables`` is a dictionary containing a
+        table for each packet subtype.
+        """
+        index = self.index(name)
+
+        def decode(values):
+            return tables.get(values[2], {}).get(values[index], default)
+
+        return decode
+
+    def scaled(self, name, factor):
+        """Decode the value multiplied by ``factor``."""
+        index = self.index(name)
+        return lambda values: values[index] * factor
+
+    def temperature(self, name):
+        """Decode a temperature in tenths of a degree stored as a 16 bit
+        value where the top bit is the sign.
+        """
+        index = self.index(name)
+
+        def decode(values):
+            value = values[index]
+            if value & 0x8000:
+                return -(value & 0x7fff) / 10
+            return value / 10
+
+        return decode
+
+    def signal(self, name):
+        """Decode the signal level from the upper 4 bits of the byte."""
+        index = self.index(name)
+        return lambda values: values[index] >> 4
+
+    def battery(self, name):
+        """Decode the battery level from the lower 4 bits of the byte."""
+        index = self.index(name)
+        return lambda values: values[index] & 0x0f
+
+    def combine(self, function, *names):
+        """Decode by calling ``function`` with the named values."""
+        indexes = tuple(self.index(name) for name in names)
+        return lambda values: function(*[values[i] for i in indexes])
+
+
+def reverse(table):
+    """Reverse a dictionary mapping codes to names, such as a table of
+    commands, so the code of a name can be looked up.
+    """
+    return {name: code for code, name in table.items()}
+
+
+def uint(bytes_):
+    """Convert big endian bytes of any length to an unsigned integer."""
+    return int.from_bytes(bytes_, 'big')
@@ -4,8 +4,17 @@ Humidity sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+
+
+#: The names of the humidity status values reported by humidity sensors.
+HUMIDITY_STATUS = {
+    0x00: "Dry",
+    0x01: "Comfort",
+    0x02: "Normal",
+    0x03: "Wet",
+}
 
 
 class Humidity(BasePacketHandler):
@@ -26,17 +35,33 @@ class Humidity(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
 
-        self.PACKET_TYPES = {
-            0x51: "Humidity sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'LaCrosse TX3',
-            0x02: 'LaCrosse WS2300'
-        }
+    PACKET_TYPES = {
+        0x51: "Humidity sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'LaCrosse TX3',
+        0x02: 'LaCrosse WS2300'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('humidity', 'B'),
+        ('humidity_status', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('humidity', LAYOUT.value('humidity')),
+        ('humidity_status',
+         LAYOUT.lookup('humidity_status', HUMIDITY_STATUS, "--??--")),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
 
     def parse(self, data):
         """Parse a 9 bytes packet in the Humidity format and return a
@@ -68,41 +93,8 @@ class Humidity(BasePacketHandler):
 
         self.validate_packet(data)
 
-        id_ = self.dump_hex(data[4:6])
-        # channel = data[5] TBC
-
-        humidity = data[6]
-        humidity_status = self._extract_humidity_status(data[7])
-
-        sensor_specific = {
-            'id': id_,
-            # 'channel': channel, TBC
-            'humidity': humidity,
-            'humidity_status': humidity_status
-        }
+        return self.parse_fields(data)
 
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[8]))
-        results.update(sensor_specific)
 
-        return results
-
-    def _extract_humidity_status(self, data):
-        """Extract the humidity status.
-
-        :param data: byte to be parsed
-        :type data: byte
-
-        :return: String containing the human readable status
-        :rtype: string
-        """
-        if data == 0x00:
-            return "Dry"
-        elif data == 0x01:
-            return "Comfort"
-        elif data == 0x02:
-            return "Normal"
-        elif data == 0x03:
-            return "Wet"
-        else:
-            return "--??--"
+#: The result class returned by :py:meth:`Humidity.decode_result`.
+HumidityResult = Humidity.result_class()
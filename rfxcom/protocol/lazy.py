@@ -0,0 +1,67 @@
+"""
+Lazy Packets
+============
+
+"""
+
+from collections.abc import Mapping
+
+
+class LazyPacket(Mapping):
+    """A read only mapping of the fields in a packet which decodes each field
+    from the raw bytes the first time it is accessed and then caches it. It
+    contains the same keys and values as the dictionary returned by the
+    ``parse`` method of the packet handler and compares equal to it, but
+    costs nothing for the fields that are never used.
+
+    :param layout: The layout of the packet, its values are unpacked the
+        first time a field is accessed.
+    :type layout: rfxcom.protocol.fields.Layout
+
+    :param data: The raw bytes of the packet
+    :type data: bytearray
+
+    :param fields: A dictionary mapping the field names present in this packet
+        to their decoders.
+    :type fields: dict
+    """
+
+    __slots__ = ('_layout', '_data', '_fields', '_unpacked', '_values')
+
+    def __init__(self, layout, data, fields):
+        self._layout = layout
+        self._data = data
+        self._fields = fields
+        self._unpacked = None
+        self._values = {}
+
+    def __getitem__(self, name):
+
+        values = self._values
+
+        try:
+            return values[name]
+        except KeyError:
+            pass
+
+        decode = self._fields[name]
+
+        unpacked = self._unpacked
+
+        if unpacked is None:
+            unpacked = self._unpacked = self._layout.unpack_from(self._data)
+
+        value = values[name] = decode(unpacked)
+        return value
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def __repr__(self):
+        return "<LazyPacket %r>" % dict(self)
@@ -4,8 +4,8 @@ Lighting 1
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 HOUSE_CODES = {
     0x41: "A",
@@ -58,27 +58,78 @@ class Lighting1(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x10: "Lighting1 sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: "X10 Lightning",
+        0x01: "ARC",
+        0x02: "ELRO AB400D (Flamingo)",
+        0x03: "Waveman",
+        0x04: "Chacon EMW200",
+        0x05: "IMPULS",
+        0x06: "RisingSun",
+        0x07: "Philips SBC",
+        0x08: "Energenie ENER010",
+        0x09: "Energenie 5-gang",
+        0x0A: "COCO GDR2-2000R"
+    }
+
+    LAYOUT = fields.Layout(
+        ('house_code', 'B'),
+        ('unit_code', 'B'),
+        ('command', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.combine(lambda house, unit: HOUSE_CODES.get(house) +
+                              str(unit), 'house_code', 'unit_code')),
+        ('house_code', LAYOUT.lookup('house_code', HOUSE_CODES)),
+        ('unit_code', LAYOUT.value('unit_code')),
+        ('command', LAYOUT.value('command')),
+        ('command_text', LAYOUT.subtype_lookup('command', SUBTYPE_COMMANDS)),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.combine(lambda house, unit: (house << 8) + unit,
+                               'house_code', 'unit_code')
+
+    ADDRESS = ('house_code', 'unit_code')
+
+    # The commands are the same for every subtype.
+    COMMAND_CODES = dict.fromkeys(PACKET_SUBTYPES,
+                                  fields.reverse(SUBTYPE_COMMANDS[0x00]))
+
+    HOUSE_CODE_VALUES = fields.reverse(HOUSE_CODES)
 
-        super().__init__(*args, **kwargs)
+    @classmethod
+    def encode(cls, sub_type, house_code, unit_code, command):
+        """Build a packet sending a command to a device.
 
-        self.PACKET_TYPES = {
-            0x10: "Lighting1 sensors"
-        }
+        :param sub_type: The packet subtype
+        :type sub_type: int
 
-        self.PACKET_SUBTYPES = {
-            0x00: "X10 Lightning",
-            0x01: "ARC",
-            0x02: "ELRO AB400D (Flamingo)",
-            0x03: "Waveman",
-            0x04: "Chacon EMW200",
-            0x05: "IMPULS",
-            0x06: "RisingSun",
-            0x07: "Philips SBC",
-            0x08: "Energenie ENER010",
-            0x09: "Energenie 5-gang",
-            0x0A: "COCO GDR2-2000R"
-        }
+        :param house_code: The house code, either the letter or its code
+        :type house_code: str
+
+        :param unit_code: The unit code
+        :type unit_code: int
+
+        :param command: The name of the command, for example ``"On"``, or its
+            code
+        :type command: str
+
+        :return: The packet
+        :rtype: bytes
+        """
+
+        house_code = cls.HOUSE_CODE_VALUES.get(house_code, house_code)
+
+        pkt = bytearray(cls.template(sub_type, house_code, unit_code))
+        pkt[6] = cls.command_code(sub_type, command)
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 8 bytes packet in the Lighting1 format and return a
@@ -110,24 +161,8 @@ class Lighting1(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        house_code = HOUSE_CODES.get(data[4])
-        unit_code = data[5]
-        command = data[6]
-        command_text = SUBTYPE_COMMANDS.get(sub_type, {}).get(command)
-        id_ = house_code + str(unit_code)
-
-        sensor_specific = {
-            'id': id_,
-            'house_code': house_code,
-            'unit_code': unit_code,
-            'command': command,
-            'command_text': command_text,
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[7]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting1.decode_result`.
+Lighting1Result = Lighting1.result_class()
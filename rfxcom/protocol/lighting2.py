@@ -4,8 +4,8 @@ Lighting 2
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 SUB_TYPE_COMMANDS = {
@@ -72,19 +72,70 @@ class Lighting2(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x11: "Lighting2 sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: 'AC',
+        0x01: 'HomeEasy EU',
+        0x02: 'Anslut'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '4s'),
+        ('unit_code', 'B'),
+        ('command', 'B'),
+        ('dim_level', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('unit_code', LAYOUT.value('unit_code')),
+        ('command', LAYOUT.value('command')),
+        ('command_text', LAYOUT.subtype_lookup('command', SUB_TYPE_COMMANDS)),
+        ('dim_level',
+         LAYOUT.lookup('dim_level', DIM_LEVEL_TO_PERCENT, '--??--')),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    ADDRESS = ('id', 'unit_code')
+
+    COMMAND_CODES = {sub_type: fields.reverse(commands)
+                     for sub_type, commands in SUB_TYPE_COMMANDS.items()}
+
+    @classmethod
+    def encode(cls, sub_type, id_, unit_code, command, dim_level=0):
+        """Build a packet sending a command to a device.
 
-        super().__init__(*args, **kwargs)
+        :param sub_type: The packet subtype
+        :type sub_type: int
 
-        self.PACKET_TYPES = {
-            0x11: "Lighting2 sensors"
-        }
+        :param id_: The ID of the device, either an integer or a hex string
+        :type id_: int
 
-        self.PACKET_SUBTYPES = {
-            0x00: 'AC',
-            0x01: 'HomeEasy EU',
-            0x02: 'Anslut'
-        }
+        :param unit_code: The unit code
+        :type unit_code: int
+
+        :param command: The name of the command, for example ``"On"``, or its
+            code
+        :type command: str
+
+        :param dim_level: The dim level from 0 to 15, for the set level
+            commands
+        :type dim_level: int
+
+        :return: The packet
+        :rtype: bytes
+        """
+
+        pkt = bytearray(cls.template(sub_type, id_, unit_code))
+        pkt[9] = cls.command_code(sub_type, command)
+        pkt[10] = dim_level
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 12 bytes packet in the Lighting2 format and return a
@@ -117,25 +168,8 @@ class Lighting2(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:8])
-
-        unit_code = data[8]
-        command = data[9]
-        command_text = SUB_TYPE_COMMANDS.get(sub_type, {}).get(command)
-        dim_level = DIM_LEVEL_TO_PERCENT.get(data[10], '--??--')
-
-        sensor_specific = {
-            'id': id_,
-            'unit_code': unit_code,
-            'command': command,
-            'command_text': command_text,
-            'dim_level': dim_level
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[11]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting2.decode_result`.
+Lighting2Result = Lighting2.result_class()
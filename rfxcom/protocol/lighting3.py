@@ -4,8 +4,8 @@ Lighting 3
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 COMMANDS = {
@@ -45,17 +45,57 @@ class Lighting3(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x12: "Lighting3 sensors"
+    }
 
-        super().__init__(*args, **kwargs)
+    PACKET_SUBTYPES = {
+        0x00: 'Ikea Koppla',
+    }
 
-        self.PACKET_TYPES = {
-            0x12: "Lighting3 sensors"
-        }
+    LAYOUT = fields.Layout(
+        ('system', 'B'),
+        ('channel', 'H'),
+        ('command', 'B'),
+        ('rssi', 'B'),
+    )
 
-        self.PACKET_SUBTYPES = {
-            0x00: 'Ikea Koppla',
-        }
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('system', LAYOUT.value('system')),
+        ('channel', LAYOUT.value('channel')),
+        ('command', LAYOUT.value('command')),
+        ('command_text', LAYOUT.lookup('command', COMMANDS)),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    ADDRESS = ('system', 'channel')
+
+    COMMAND_CODES = {0x00: fields.reverse(COMMANDS)}
+
+    @classmethod
+    def encode(cls, sub_type, system, channel, command):
+        """Build a packet sending a command to a device.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param system: The system code
+        :type system: int
+
+        :param channel: The channels, one bit for each
+        :type channel: int
+
+        :param command: The name of the command, for example ``"On"``, or its
+            code
+        :type command: str
+
+        :return: The packet
+        :rtype: bytes
+        """
+
+        pkt = bytearray(cls.template(sub_type, system, channel))
+        pkt[7] = cls.command_code(sub_type, command)
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 8 bytes packet in the Lighting3 format and return a
@@ -86,21 +126,8 @@ class Lighting3(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-
-        system = data[4]
-        channel = (data[5] << 8) + data[6]
-        command = data[7]
-        command_text = COMMANDS.get(command)
-
-        sensor_specific = {
-            'system': system,
-            'channel': channel,
-            'command': command,
-            'command_text': command_text,
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[8]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting3.decode_result`.
+Lighting3Result = Lighting3.result_class()
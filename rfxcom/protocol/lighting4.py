@@ -4,8 +4,8 @@ Lighting 3
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 COMMANDS = {
@@ -45,17 +45,50 @@ class Lighting4(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x13: "Lighting4 sensors"
+    }
 
-        super().__init__(*args, **kwargs)
+    PACKET_SUBTYPES = {
+        0x00: 'PT2262',
+    }
 
-        self.PACKET_TYPES = {
-            0x13: "Lighting4 sensors"
-        }
+    LAYOUT = fields.Layout(
+        ('command', '3s'),
+        ('pulse', 'H'),
+        ('rssi', 'B'),
+    )
 
-        self.PACKET_SUBTYPES = {
-            0x00: 'PT2262',
-        }
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('command', LAYOUT.combine(fields.uint, 'command')),
+        ('pulse', LAYOUT.value('pulse')),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    #: The default pulse timing in microseconds.
+    DEFAULT_PULSE = 350
+
+    @classmethod
+    def encode(cls, sub_type, command, pulse=DEFAULT_PULSE):
+        """Build a packet sending a code.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param command: The 24 bit code
+        :type command: int
+
+        :param pulse: The pulse timing in microseconds
+        :type pulse: int
+
+        :return: The packet
+        :rtype: bytes
+        """
+
+        pkt = bytearray(cls.template(sub_type))
+        pkt[4:7] = command.to_bytes(3, 'big')
+        pkt[7:9] = pulse.to_bytes(2, 'big')
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 10 bytes packet in the Lighting4 format and return a
@@ -85,17 +118,8 @@ class Lighting4(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-
-        cmd = (data[4] << 16) + (data[5] << 8) + data[6]
-        pulse = data[7] << 8 + data[8]
-
-        sensor_specific = {
-            'command': cmd,
-            'pulse': pulse
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[9]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting4.decode_result`.
+Lighting4Result = Lighting4.result_class()
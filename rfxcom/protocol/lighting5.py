@@ -4,8 +4,8 @@ Lighting 5
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 SUB_TYPE_COMMANDS = {
@@ -100,23 +100,72 @@ class Lighting5(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x14: "Lighting5 sensors"
-        }
+    PACKET_TYPES = {
+        0x14: "Lighting5 sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: "LightwaveRF, Siemens",
+        0x01: "EMW100 GAO/Everflourish",
+        0x02: "BBSB new types",
+        0x03: "MDREMOTE LED dimmer",
+        0x04: "Conrad RSL2",
+        0x05: "Livolo",
+        0x06: "RGB TRC02",
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '3s'),
+        ('unit_code', 'B'),
+        ('command', 'B'),
+        ('level', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('unit_code', LAYOUT.value('unit_code')),
+        ('command', LAYOUT.value('command')),
+        ('command_text', LAYOUT.subtype_lookup('command', SUB_TYPE_COMMANDS)),
+        ('level', LAYOUT.value('level')),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    ADDRESS = ('id', 'unit_code')
+
+    COMMAND_CODES = {sub_type: fields.reverse(commands)
+                     for sub_type, commands in SUB_TYPE_COMMANDS.items()}
+
+    @classmethod
+    def encode(cls, sub_type, id_, unit_code, command, level=0):
+        """Build a packet sending a command to a device.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param id_: The ID of the device, either an integer or a hex string
+        :type id_: int
+
+        :param unit_code: The unit code
+        :type unit_code: int
+
+        :param command: The name of the command, for example ``"On"``, or its
+            code
+        :type command: str
+
+        :param level: The level, for the set level command
+        :type level: int
+
+        :return: The packet
+        :rtype: bytes
+        """
 
-        self.PACKET_SUBTYPES = {
-            0x00: "LightwaveRF, Siemens",
-            0x01: "EMW100 GAO/Everflourish",
-            0x02: "BBSB new types",
-            0x03: "MDREMOTE LED dimmer",
-            0x04: "Conrad RSL2",
-            0x05: "Livolo",
-            0x06: "RGB TRC02",
-        }
+        pkt = bytearray(cls.template(sub_type, id_, unit_code))
+        pkt[8] = cls.command_code(sub_type, command)
+        pkt[9] = level
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 11 bytes packet in the Lighting5 format and return a
@@ -149,24 +198,8 @@ class Lighting5(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:7])
-        unit_code = data[7]
-        command = data[8]
-        command_text = SUB_TYPE_COMMANDS.get(sub_type, {}).get(command)
-        level = data[9]
-
-        sensor_specific = {
-            'id': id_,
-            'unit_code': unit_code,
-            'command': command,
-            'command_text': command_text,
-            'level': level
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[10]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting5.decode_result`.
+Lighting5Result = Lighting5.result_class()
@@ -4,8 +4,8 @@ Lighting 3
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 COMMANDS = {
@@ -38,17 +38,72 @@ class Lighting6(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x15: "Lighting6 sensors"
+    }
 
-        super().__init__(*args, **kwargs)
+    PACKET_SUBTYPES = {
+        0x00: 'Blyss',
+    }
 
-        self.PACKET_TYPES = {
-            0x15: "Lighting6 sensors"
-        }
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('group_code', 'B'),
+        ('unit_code', 'B'),
+        ('command', 'B'),
+        ('command_seqnr', 'B'),
+        ('rfu', 'B'),
+        ('rssi', 'B'),
+    )
 
-        self.PACKET_SUBTYPES = {
-            0x00: 'Blyss',
-        }
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('group_code', LAYOUT.value('group_code')),
+        ('unit_code', LAYOUT.value('unit_code')),
+        ('command', LAYOUT.value('command')),
+        ('command_seqnr', LAYOUT.value('command_seqnr')),
+        ('rfu', LAYOUT.value('rfu')),
+        ('signal_level', LAYOUT.signal('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    ADDRESS = ('id', 'group_code', 'unit_code')
+
+    COMMAND_CODES = {0x00: fields.reverse(COMMANDS)}
+
+    @classmethod
+    def encode(cls, sub_type, id_, group_code, unit_code, command,
+               command_seqnr=0):
+        """Build a packet sending a command to a device.
+
+        :param sub_type: The packet subtype
+        :type sub_type: int
+
+        :param id_: The ID of the device, either an integer or a hex string
+        :type id_: int
+
+        :param group_code: The group code
+        :type group_code: int
+
+        :param unit_code: The unit code
+        :type unit_code: int
+
+        :param command: The name of the command, for example ``"On"``, or its
+            code
+        :type command: str
+
+        :param command_seqnr: The command sequence number
+        :type command_seqnr: int
+
+        :return: The packet
+        :rtype: bytes
+        """
+
+        pkt = bytearray(cls.template(sub_type, id_, group_code, unit_code))
+        pkt[8] = cls.command_code(sub_type, command)
+        pkt[9] = command_seqnr
+        return bytes(pkt)
 
     def parse(self, data):
         """Parse a 10 bytes packet in the Lighting6 format and return a
@@ -82,25 +137,8 @@ class Lighting6(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-
-        id_ = self.dump_hex(data[4:6])
-        group_code = data[6]
-        unit_code = data[7]
-        cmd = data[8]
-        cmd_seqnr = data[9]
-        rfu = data[10]
-
-        sensor_specific = {
-            'id': id_,
-            'group_code': group_code,
-            'unit_code': unit_code,
-            'command': cmd,
-            'command_seqnr': cmd_seqnr,
-            'rfu': rfu
-        }
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_upper(data[11]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Lighting6.decode_result`.
+Lighting6Result = Lighting6.result_class()
@@ -4,8 +4,8 @@ Rain sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 class Rain(BasePacketHandler):
@@ -33,21 +33,63 @@ class Rain(BasePacketHandler):
     Note:
     need example data to implement correctly subtype 6 (La Crosse TX5)
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x55: "Rain sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'RGR126/682/918',
-            0x02: 'PCR800',
-            0x03: 'TFA',
-            0x04: 'UPM RG700',
-            0x05: 'WS2300',
-            0x06: 'La Crosse TX5'
-        }
+
+    PACKET_TYPES = {
+        0x55: "Rain sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'RGR126/682/918',
+        0x02: 'PCR800',
+        0x03: 'TFA',
+        0x04: 'UPM RG700',
+        0x05: 'WS2300',
+        0x06: 'La Crosse TX5'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('rain_rate', 'H'),
+        ('rain_total_high', 'B'),
+        ('rain_total_low', 'H'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    #: The rain rate for each subtype that sends it.
+    RAIN_RATE_FIELDS = {
+        0x01: (
+            ('rain_rate', LAYOUT.value('rain_rate')),
+        ),
+        0x02: (
+            ('rain_rate', LAYOUT.combine(lambda rate: float(rate) / 100,
+                                         'rain_rate')),
+        ),
+    }
+
+    #: The rain total isn't decoded for the La Crosse TX5.
+    RAIN_TOTAL_FIELDS = (
+        ('rain_total',
+         LAYOUT.combine(lambda high, low: float(high * 0x1000 + low) / 10,
+                        'rain_total_high', 'rain_total_low')),
+    )
+
+    @classmethod
+    def fields(cls, sub_type):
+
+        fields_ = cls.FIELDS + cls.RAIN_RATE_FIELDS.get(sub_type, ())
+
+        if sub_type != 0x06:
+            fields_ += cls.RAIN_TOTAL_FIELDS
+
+        return fields_
 
     def parse(self, data):
         """Parse a 12 bytes packet in the Rain format and return a
@@ -79,37 +121,8 @@ class Rain(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:6])
-
-        rain_rate_high = data[6]
-        rain_rate_low = data[7]
-        if sub_type == 0x01:
-            rain_rate = rain_rate_high * 0x100 + rain_rate_low
-        elif sub_type == 0x02:
-            rain_rate = float(rain_rate_high * 0x100 + rain_rate_low) / 100
-        else:
-            rain_rate = '--??--'
-        rain_total1 = data[8]
-        rain_total2 = data[9]
-        rain_total3 = data[10]
-        if sub_type != 0x06:
-            rain_total = float(
-                rain_total1 * 0x1000 + rain_total2 * 0x100 + rain_total3) / 10
-        else:
-            rain_total = '--??--'
-
-        sensor_specific = {
-            'id': id_
-        }
-        if rain_rate != '--??--':
-            sensor_specific['rain_rate'] = rain_rate
-        if rain_total != '--??--':
-            sensor_specific['rain_total'] = rain_total
-
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[11]))
-        results.update(sensor_specific)
-
-        return results
+        return self.parse_fields(data)
+
+
+#: The result class returned by :py:meth:`Rain.decode_result`.
+RainResult = Rain.result_class()
@@ -0,0 +1,79 @@
+"""
+Packet Results
+==============
+
+Compact objects for holding the values decoded from a packet. A result class
+is created for each packet handler from the fields it describes and stores
+the values in ``__slots__`` rather than a dictionary, so it takes a fraction
+of the memory of the dictionary returned by ``parse``.
+
+"""
+
+
+class PacketResult:
+    """The base class of the result classes created by
+    :py:func:`make_result_class`. Each field of the packet is an attribute,
+    fields that aren't sent by the subtype of the packet are left unset.
+    """
+
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the values as a dictionary, the same as the one returned by
+        the ``parse`` method of the packet handler.
+
+        :return: Data dictionary containing the parsed values
+        :rtype: dict
+        """
+
+        result = {}
+
+        for name in self.__slots__:
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                pass
+
+        return result
+
+    def __eq__(self, other):
+
+        if isinstance(other, PacketResult):
+            other = other.to_dict()
+
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.to_dict())
+
+
+def make_result_class(Handler):
+    """Create the result class for a packet handler. It has a slot for every
+    field the handler can decode, whatever the subtype, and is named after
+    the handler, for example ``TemperatureResult``.
+
+    :param Handler: The packet handler class
+    :type Handler: rfxcom.protocol.base.BasePacketHandler
+
+    :return: A subclass of :py:class:`PacketResult`
+    :rtype: type
+    """
+
+    names = []
+
+    for sub_type in sorted(Handler.PACKET_SUBTYPES) or [None]:
+        for name, _ in Handler.fields(sub_type):
+            if name not in names:
+                names.append(name)
+
+    name = '%sResult' % Handler.__name__
+
+    return type(name, (PacketResult,), {
+        '__doc__': "The decoded values of a :py:class:`%s` packet." %
+                   Handler.__name__,
+        '__module__': Handler.__module__,
+        '__qualname__': name,
+        '__slots__': tuple(names),
+    })
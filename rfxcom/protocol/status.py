@@ -4,6 +4,8 @@ Interface Message
 
 """
 
+from logging import INFO
+
 from rfxcom.protocol.base import BasePacketHandler
 
 
@@ -60,6 +62,22 @@ _MSG5_PROTOCOLS = [
 PROTOCOLS = _MSG3_PROTOCOLS + _MSG4_PROTOCOLS + _MSG5_PROTOCOLS
 
 
+def enabled_protocols(data):
+    """Return the names of the protocols enabled by the flags in bytes 7 to 9
+    of a status or mode packet, sorted in the same order as the
+    ``enabled_protocols`` returned by :py:meth:`Status.parse`. This is used
+    to compare the mode of the RFXtrx with a mode packet.
+
+    :param data: The status or mode packet
+    :type data: bytearray
+
+    :return: The names of the enabled protocols
+    :rtype: list
+    """
+    flags = '{0:08b}{1:08b}{2:08b}'.format(data[7], data[8], data[9])
+    return sorted(name for name, flag in zip(PROTOCOLS, flags) if flag == '1')
+
+
 class Status(BasePacketHandler):
     """The Status packet is returned by the RFXtrx itself and is used to show
     the status and configuration of the device.
@@ -83,17 +101,15 @@ class Status(BasePacketHandler):
     13      Message 9
     ====    ====
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x01: "Interface message"
+    }
 
-        self.PACKET_TYPES = {
-            0x01: "Interface message"
-        }
-        self.PACKET_SUBTYPES = {
-            0x00: "Response on a mode command",
-            0xFF: "Wrong command received from the application.",
-        }
+    PACKET_SUBTYPES = {
+        0x00: "Response on a mode command",
+        0xFF: "Wrong command received from the application.",
+    }
 
     def _log_enabled_protocols(self, flags, protocols):
         """Given a list of single character strings of 1's and 0's and a list
@@ -114,6 +130,8 @@ class Status(BasePacketHandler):
         """
 
         enabled, disabled = [], []
+        log = self.log
+        log_status = log.isEnabledFor(INFO)
 
         for procol, flag in sorted(zip(protocols, flags)):
 
@@ -124,8 +142,8 @@ class Status(BasePacketHandler):
                 disabled.append(procol)
                 status = 'Disabled'
 
-            message = "{0:21}: {1}".format(procol, status)
-            self.log.info(message)
+            if log_status:
+                log.info("%-21s: %s", procol, status)
 
         return enabled, disabled
 
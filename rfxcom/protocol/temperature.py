@@ -4,8 +4,8 @@ Temperature sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 class Temperature(BasePacketHandler):
@@ -26,25 +26,38 @@ class Temperature(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x50: "Temperature sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'THR128/138, THC138',
-            0x02: 'THC238/268,THN132,THWR288,THRN122,THN122,AW129/131',
-            0x03: 'THWR800',
-            0x04: 'RTHN318',
-            0x05: 'La Crosse TX2, TX3, TX4, TX17',
-            0x06: 'TS15C',
-            0x07: 'Viking 02811',
-            0x08: 'La Crosse WS2300',
-            0x09: 'RUBiCSON',
-            0x0A: 'TFA 30.3133'
-        }
+
+    PACKET_TYPES = {
+        0x50: "Temperature sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'THR128/138, THC138',
+        0x02: 'THC238/268,THN132,THWR288,THRN122,THN122,AW129/131',
+        0x03: 'THWR800',
+        0x04: 'RTHN318',
+        0x05: 'La Crosse TX2, TX3, TX4, TX17',
+        0x06: 'TS15C',
+        0x07: 'Viking 02811',
+        0x08: 'La Crosse WS2300',
+        0x09: 'RUBiCSON',
+        0x0A: 'TFA 30.3133'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('temperature', 'H'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('temperature', LAYOUT.temperature('temperature')),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
 
     def parse(self, data):
         """Parse a 9 bytes packet in the Temperature format and return a
@@ -75,22 +88,8 @@ class Temperature(BasePacketHandler):
 
         self.validate_packet(data)
 
-        id_ = self.dump_hex(data[4:6])
-        # channel = data[5] TBC
-
-        temperature = ((data[6] & 0x7f) * 256 + data[7]) / 10
-        signbit = data[6] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-
-        sensor_specific = {
-            'id': id_,
-            # 'channel': channel, TBC
-            'temperature': temperature
-        }
+        return self.parse_fields(data)
 
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[8]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`Temperature.decode_result`.
+TemperatureResult = Temperature.result_class()
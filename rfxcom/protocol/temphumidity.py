@@ -4,8 +4,9 @@ Temperature and Humidity sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from rfxcom.protocol.humidity import HUMIDITY_STATUS
 
 
 class TempHumidity(BasePacketHandler):
@@ -28,27 +29,47 @@ class TempHumidity(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x52: "Temperature and humidity sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'THGN122/123, THGN132, THGR122/228/238/268',
-            0x02: 'THGR810, THGN801, THGN800',
-            0x03: 'RTGR328',
-            0x04: 'THGR328',
-            0x05: 'WTGR800',
-            0x06: 'THGR918/928, THGRN228, THGN500',
-            0x07: 'TFA TS34C, Cresta',
-            0x08: 'WT260,WT260H,WT440H,WT450,WT450H',
-            0x09: 'Viking 02035,02038 (02035 has no humidity)',
-            0x0A: 'Rubicson',
-            0x0B: 'EW109',
-            0x0C: 'Imagintronix Soil Sensor'
-        }
+
+    PACKET_TYPES = {
+        0x52: "Temperature and humidity sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'THGN122/123, THGN132, THGR122/228/238/268',
+        0x02: 'THGR810, THGN801, THGN800',
+        0x03: 'RTGR328',
+        0x04: 'THGR328',
+        0x05: 'WTGR800',
+        0x06: 'THGR918/928, THGRN228, THGN500',
+        0x07: 'TFA TS34C, Cresta',
+        0x08: 'WT260,WT260H,WT440H,WT450,WT450H',
+        0x09: 'Viking 02035,02038 (02035 has no humidity)',
+        0x0A: 'Rubicson',
+        0x0B: 'EW109',
+        0x0C: 'Imagintronix Soil Sensor'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('temperature', 'H'),
+        ('humidity', 'B'),
+        ('humidity_status', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        # The channel is the second byte of the ID.
+        ('channel', LAYOUT.combine(lambda id_: id_[1], 'id')),
+        ('temperature', LAYOUT.temperature('temperature')),
+        ('humidity', LAYOUT.value('humidity')),
+        ('humidity_status',
+         LAYOUT.lookup('humidity_status', HUMIDITY_STATUS, "--??--")),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
 
     def parse(self, data):
         """Parse a 11 bytes packet in the TemperatureHumidity format and return a
@@ -81,46 +102,8 @@ class TempHumidity(BasePacketHandler):
 
         self.validate_packet(data)
 
-        id_ = self.dump_hex(data[4:6])
-        channel = data[5]
-
-        temperature = ((data[6] & 0x7f) * 256 + data[7]) / 10
-        signbit = data[6] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-        humidity = data[8]
-        humidity_status = self._extract_humidity_status(data[9])
-
-        sensor_specific = {
-            'id': id_,
-            'channel': channel,
-            'temperature': temperature,
-            'humidity': humidity,
-            'humidity_status': humidity_status
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[10]))
-        results.update(sensor_specific)
+        return self.parse_fields(data)
 
-        return results
 
-    def _extract_humidity_status(self, data):
-        """Extract the humidity status.
-
-        :param data: byte to be parsed
-        :type data: byte
-
-        :return: String containing the human readable status
-        :rtype: string
-        """
-        if data == 0x00:
-            return "Dry"
-        elif data == 0x01:
-            return "Comfort"
-        elif data == 0x02:
-            return "Normal"
-        elif data == 0x03:
-            return "Wet"
-        else:
-            return "--??--"
+#: The result class returned by :py:meth:`TempHumidity.decode_result`.
+TempHumidityResult = TempHumidity.result_class()
@@ -4,8 +4,19 @@ Temperature and Humidity and Barometric sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from rfxcom.protocol.humidity import HUMIDITY_STATUS
+
+
+#: The names of the forecasts given by barometric sensors.
+FORECAST = {
+    0x00: "No forecast available",
+    0x01: "Sunny",
+    0x02: "Partly cloudy",
+    0x03: "Cloudy",
+    0x04: "Rainy",
+}
 
 
 class TempHumidityBaro(BasePacketHandler):
@@ -28,17 +39,40 @@ class TempHumidityBaro(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x54: "Temperature and humidity and barometric sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'BTHR918',
-            0x02: 'BTHR918N, BTHR968',
-        }
+    PACKET_TYPES = {
+        0x54: "Temperature and humidity and barometric sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'BTHR918',
+        0x02: 'BTHR918N, BTHR968',
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('temperature', 'H'),
+        ('humidity', 'B'),
+        ('humidity_status', 'B'),
+        ('barometry', 'H'),
+        ('forecast', 'B'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('temperature', LAYOUT.temperature('temperature')),
+        ('humidity', LAYOUT.value('humidity')),
+        ('humidity_status',
+         LAYOUT.lookup('humidity_status', HUMIDITY_STATUS, "--??--")),
+        ('barometry', LAYOUT.value('barometry')),
+        ('forecast', LAYOUT.value('forecast')),
+        ('forecast_status', LAYOUT.lookup('forecast', FORECAST, "--??--")),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
 
     def parse(self, data):
         """Parse a 14 bytes packet in the TemperatureHumidity format and return a
@@ -72,71 +106,8 @@ class TempHumidityBaro(BasePacketHandler):
 
         self.validate_packet(data)
 
-        id_ = self.dump_hex(data[4:6])
-        temperature = ((data[6] & 0x7f) * 256 + data[7]) / 10
-        signbit = data[6] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-        humidity = data[8]
-        humidity_status = self._extract_humidity_status(data[9])
-        baro = data[10] * 256 + data[11]
-        forecast = data[12]
-        forecast_status = self._extract_forecast(forecast)
-
-        sensor_specific = {
-            'id': id_,
-            'temperature': temperature,
-            'humidity': humidity,
-            'humidity_status': humidity_status,
-            'barometry': baro,
-            'forecast': forecast,
-            'forecast_status': forecast_status,
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[13]))
-        results.update(sensor_specific)
-
-        return results
-
-    def _extract_humidity_status(self, data):
-        """Extract the humidity status.
-
-        :param data: byte to be parsed
-        :type data: byte
-
-        :return: String containing the human readable status
-        :rtype: string
-        """
-        if data == 0x00:
-            return "Dry"
-        elif data == 0x01:
-            return "Comfort"
-        elif data == 0x02:
-            return "Normal"
-        elif data == 0x03:
-            return "Wet"
-        else:
-            return "--??--"
-
-    def _extract_forecast(self, data):
-        """Extract the forecast info.
-
-        :param data: byte to be parsed
-        :type data: byte
-
-        :return: String containing the human readable forecast
-        :rtype: string
-        """
-        if data == 0x00:
-            return "No forecast available"
-        elif data == 0x01:
-            return "Sunny"
-        elif data == 0x02:
-            return "Partly cloudy"
-        elif data == 0x03:
-            return "Cloudy"
-        elif data == 0x04:
-            return "Rainy"
-        else:
-            return "--??--"
+        return self.parse_fields(data)
+
+
+#: The result class returned by :py:meth:`TempHumidityBaro.decode_result`.
+TempHumidityBaroResult = TempHumidityBaro.result_class()
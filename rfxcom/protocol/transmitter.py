@@ -0,0 +1,99 @@
+"""
+Receiver/Transmitter Message
+============================
+
+"""
+
+from rfxcom.protocol import fields
+from rfxcom.protocol.base import BasePacketHandler
+
+
+#: The messages of each subtype. The RFXtrx only sends a message for the
+#: transmitter response.
+SUB_TYPE_MESSAGES = {
+    0x01: {
+        0x00: "ACK, transmit OK",
+        0x01: "ACK, but transmit started after 3 seconds delay anyway with "
+              "RF receive data",
+        0x02: "NAK, transmitter did not lock on the requested transmit "
+              "frequency",
+        0x03: "NAK, AC address zero in id1-id4 not allowed",
+    },
+}
+
+#: The transmitter response messages which acknowledge the packet was sent.
+ACK_MESSAGES = (0x00, 0x01)
+
+
+class Transmitter(BasePacketHandler):
+    """The Receiver/Transmitter Message is sent by the RFXtrx in answer to
+    every packet written to it for transmission. The sequence number is the
+    same as the sequence number of the packet written, so the answer can be
+    matched to the packet.
+
+    ====    ====
+    Byte    Meaning
+    ====    ====
+    0       Packet Length, 0x04 (excludes this byte)
+    1       Packet Type, 0x02
+    2       Sub Type
+    3       Sequence Number
+    4       Message
+    ====    ====
+    """
+
+    PACKET_TYPES = {
+        0x02: "Receiver/Transmitter Message"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: "Error, receiver did not lock",
+        0x01: "Transmitter response",
+    }
+
+    LAYOUT = fields.Layout(
+        ('message', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('message', LAYOUT.value('message')),
+        ('message_text', LAYOUT.subtype_lookup('message', SUB_TYPE_MESSAGES)),
+        ('acknowledged',
+         LAYOUT.combine(lambda sub_type, message:
+                        sub_type == 0x01 and message in ACK_MESSAGES,
+                        'packet_subtype', 'message')),
+    )
+
+    def parse(self, data):
+        """Parse a 5 bytes packet in the Receiver/Transmitter Message format
+        and return a dictionary containing the data extracted. An example of
+        a return value would be:
+
+        .. code-block:: python
+
+            {
+                'packet_length': 4,
+                'packet_type': 2,
+                'packet_type_name': 'Receiver/Transmitter Message',
+                'sequence_number': 7,
+                'packet_subtype': 1,
+                'packet_subtype_name': 'Transmitter response',
+                'message': 0,
+                'message_text': 'ACK, transmit OK',
+                'acknowledged': True,
+            }
+
+        :param data: bytearray to be parsed
+        :type data: bytearray
+
+        :return: Data dictionary containing the parsed values
+        :rtype: dict
+        """
+
+        self.validate_packet(data)
+
+        return self.parse_fields(data)
+
+
+#: The result class returned by :py:meth:`Transmitter.decode_result`.
+TransmitterResult = Transmitter.result_class()
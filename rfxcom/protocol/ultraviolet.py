@@ -4,8 +4,8 @@ UV sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 class UltraViolet(BasePacketHandler):
@@ -27,18 +27,45 @@ class UltraViolet(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x57: "UV sensors"
+    }
 
-        self.PACKET_TYPES = {
-            0x57: "UV sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'UVN128, UV138',
-            0x02: 'UVN800',
-            0x03: 'TFA'
-        }
+    PACKET_SUBTYPES = {
+        0x01: 'UVN128, UV138',
+        0x02: 'UVN800',
+        0x03: 'TFA'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('uv', 'B'),
+        ('temperature', 'H'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('uv', LAYOUT.value('uv')),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    #: Only the TFA sends the temperature.
+    TEMPERATURE_FIELDS = (
+        ('temperature', LAYOUT.temperature('temperature')),
+    )
+
+    @classmethod
+    def fields(cls, sub_type):
+
+        if sub_type == 0x03:
+            return cls.FIELDS + cls.TEMPERATURE_FIELDS
+
+        return cls.FIELDS
 
     def parse(self, data):
         """Parse a 10 bytes packet in the UltraViolet format and return a
@@ -70,25 +97,8 @@ class UltraViolet(BasePacketHandler):
 
         self.validate_packet(data)
 
-        id_ = self.dump_hex(data[4:6])
-
-        uv = data[6]
-        temperature = ((data[7] & 0x7f) * 256 + data[8]) / 10
-        signbit = data[7] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        sensor_specific = {
-            'id': id_,
-            'uv': uv
-        }
-        if sub_type == 0x03:
-            sensor_specific['temperature'] = temperature
+        return self.parse_fields(data)
 
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[9]))
-        results.update(sensor_specific)
 
-        return results
+#: The result class returned by :py:meth:`UltraViolet.decode_result`.
+UltraVioletResult = UltraViolet.result_class()
@@ -5,8 +5,8 @@ Wind sensors
 
 """
 
+from rfxcom.protocol import fields
 from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
 class Wind(BasePacketHandler):
@@ -35,21 +35,63 @@ class Wind(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x56: "Wind sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'WTGR800',
-            0x02: 'WGR800',
-            0x03: 'STR918, WGR918, WGR928',
-            0x04: 'TFA',
-            0x05: 'UPM WDS500',
-            0x06: 'WS2300'
-        }
+
+    PACKET_TYPES = {
+        0x56: "Wind sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x01: 'WTGR800',
+        0x02: 'WGR800',
+        0x03: 'STR918, WGR918, WGR928',
+        0x04: 'TFA',
+        0x05: 'UPM WDS500',
+        0x06: 'WS2300'
+    }
+
+    LAYOUT = fields.Layout(
+        ('id', '2s'),
+        ('direction', 'H'),
+        ('av_speed', 'H'),
+        ('wind_gust', 'H'),
+        ('temperature', 'H'),
+        ('wind_chill', 'H'),
+        ('rssi', 'B'),
+    )
+
+    FIELDS = LAYOUT.header(PACKET_TYPES, PACKET_SUBTYPES) + (
+        ('id', LAYOUT.hex_id('id')),
+        ('direction', LAYOUT.value('direction')),
+        ('wind_gust', LAYOUT.scaled('wind_gust', 0.1)),
+        ('signal_level', LAYOUT.signal('rssi')),
+        ('battery_level', LAYOUT.battery('rssi')),
+    )
+
+    SENSOR_ID = LAYOUT.int_id('id')
+
+    #: The average speed isn't sent by the UPM WDS500.
+    AV_SPEED_FIELDS = (
+        ('av_speed', LAYOUT.scaled('av_speed', 0.1)),
+    )
+
+    #: Only the TFA sends the temperature and wind chill.
+    TEMPERATURE_FIELDS = (
+        ('temperature', LAYOUT.temperature('temperature')),
+        ('wind_chill', LAYOUT.temperature('wind_chill')),
+    )
+
+    @classmethod
+    def fields(cls, sub_type):
+
+        fields_ = cls.FIELDS
+
+        if sub_type != 0x05:
+            fields_ += cls.AV_SPEED_FIELDS
+
+        if sub_type == 0x04:
+            fields_ += cls.TEMPERATURE_FIELDS
+
+        return fields_
 
     def parse(self, data):
         """Parse a 17 bytes packet in the Wind format and return a
@@ -84,45 +126,8 @@ class Wind(BasePacketHandler):
 
         self.validate_packet(data)
 
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
+        return self.parse_fields(data)
 
-        id_ = self.dump_hex(data[4:6])
 
-        direction = data[6] * 256 + data[7]
-        if sub_type != 0x05:
-            av_speed = (data[8] * 256 + data[9]) * 0.1
-        else:
-            av_speed = '--??--'
-        gust = (data[10] * 256 + data[11]) * 0.1
-        if sub_type == 0x04:
-            temperature = ((data[12] & 0x7f) * 256 + data[13]) / 10
-            signbit = data[12] & 0x80
-            if signbit != 0:
-                temperature = -temperature
-        else:
-            temperature = '--??--'
-        if sub_type == 0x04:
-            wind_chill = ((data[14] & 0x7f) * 256 + data[15]) / 10
-            signbit = data[14] & 0x80
-            if signbit != 0:
-                wind_chill = -wind_chill
-        else:
-            wind_chill = '--??--'
-
-        sensor_specific = {
-            'id': id_,
-            'direction': direction,
-            'wind_gust': gust
-        }
-        if av_speed != '--??--':
-            sensor_specific['av_speed'] = av_speed
-        if temperature != '--??--':
-            sensor_specific['temperature'] = temperature
-        if wind_chill != '--??--':
-            sensor_specific['wind_chill'] = wind_chill
-
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[16]))
-        results.update(sensor_specific)
-
-        return results
+#: The result class returned by :py:meth:`Wind.decode_result`.
+WindResult = Wind.result_class()
@@ -0,0 +1,273 @@
+"""
+rfxcom.simulator
+================
+
+A simulated RFXtrx on a pseudo-terminal, so the transports can be run and
+measured against a real tty without the hardware. The simulator answers the
+RESET, STATUS and MODE commands like the device does, acknowledges every
+other packet written to it and, once the transport has asked for the status
+or set the mode, streams packets from sensors at a configurable rate.
+
+.. code-block:: python
+
+    from rfxcom.simulator import Simulator
+    from rfxcom.transport import AsyncioTransport
+
+    with Simulator(rate=100) as simulator:
+        rfxcom = AsyncioTransport(simulator.port, loop, callback=handler)
+        loop.run_forever()
+
+This needs a system with pseudo-terminals, such as Linux.
+
+"""
+
+import fcntl
+import os
+import select
+import threading
+import tty
+from itertools import cycle
+from time import monotonic
+
+from rfxcom.transport.framer import PacketFramer
+
+#: A packet from a sensor or remote of every protocol supported by
+#: :py:mod:`rfxcom.protocol`. Byte 5 is part of the ID or unit code of each
+#: one, and is changed to simulate many sensors.
+SAMPLE_PACKETS = (
+    b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00\x02\xB4\x00\x00\x0C\x46\xA8\x11'
+    b'\x69',
+    b'\x08\x51\x01\x12\x70\x05\x26\x03\x59',
+    b'\x07\x10\x00\x01\x41\x0A\x01\x40',
+    b'\x0B\x11\x00\x01\x01\x11\xF3\x42\x0A\x01\x0F\x70',
+    b'\x08\x12\x00\x05\x02\x00\x09\x11\x40',
+    b'\x09\x13\x00\x05\x01\x02\x03\x01\x02\x40',
+    b'\x0A\x14\x00\xAD\xF3\x94\xAB\x01\x01\x00\x60',
+    b'\x0B\x15\x00\x05\x01\x02\x03\x01\x02\x05\x06\x40',
+    b'\x0B\x55\x02\x05\x70\x03\x00\x67\x00\x01\x05\x69',
+    b'\x08\x50\x06\x02\xAE\x01\x80\x55\x59',
+    b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03\x89',
+    b'\x0D\x54\x01\x11\x70\x02\x80\x25\x2D\x03\x03\xF3\x02\x89',
+    b'\x09\x57\x01\x00\x2E\xB2\x03\x05\x00\x69',
+    b'\x10\x56\x01\x05\x1C\x00\x00\xA2\x00\x02\x01\xB2\x00\x0C\x46\xA8\x98',
+)
+
+#: The interface commands, byte 4 of the packets with type 0x00.
+COMMAND_RESET = 0x00
+COMMAND_STATUS = 0x02
+COMMAND_MODE = 0x03
+
+
+class Simulator:
+    """Simulate an RFXtrx on a pseudo-terminal. The transport opens
+    ``port``, the simulator runs in a thread and talks to the other end.
+
+    Packets are streamed in bursts of ``burst`` packets written together, as
+    they arrive when several sensors transmit at once, with the bursts
+    spread out so that ``rate`` packets are sent per second on average.
+    Each packet is sent ``repeats`` times in a row, like the sensors that
+    transmit every reading more than once.
+
+    :param packets: The packets streamed in turn, ``SAMPLE_PACKETS`` by
+        default
+    :type packets: list
+
+    :param rate: The number of packets sent per second, or None to send
+        them as fast as the transport reads them
+    :type rate: float
+
+    :param burst: The number of packets written together
+    :type burst: int
+
+    :param repeats: The number of times each packet is sent
+    :type repeats: int
+
+    :param sensors: The number of different sensors simulated for each
+        packet
+    :type sensors: int
+
+    :param total: The number of packets to send before stopping, or None to
+        keep sending them
+    :type total: int
+    """
+
+    #: The transceiver type and firmware version given in the status.
+    transceiver_type = 0x53
+    firmware_version = 0x45
+
+    def __init__(self, packets=SAMPLE_PACKETS, rate=10, burst=1, repeats=1,
+                 sensors=1, total=None):
+
+        self.packets = [bytearray(pkt) for pkt in packets]
+        self.rate = rate
+        self.burst = burst
+        self.repeats = repeats
+        self.sensors = sensors
+        self.total = total
+
+        #: The flags of the enabled protocols, messages 3 to 5 of the status.
+        self.protocols = bytearray(b'\x00\x0C\x2F')
+
+        #: True once the status has been asked for or the mode set, packets
+        #: are only streamed from then on.
+        self.streaming = False
+
+        #: The number of packets streamed.
+        self.sent = 0
+
+        #: The packets written to the simulator, in order.
+        self.received = []
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+
+        flags = fcntl.fcntl(self._master, fcntl.F_GETFL)
+        fcntl.fcntl(self._master, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        #: The path of the pseudo-terminal to open as the RFXtrx.
+        self.port = os.ttyname(self._slave)
+
+        self._framer = PacketFramer()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start answering and streaming in a thread."""
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and close the pseudo-terminal."""
+
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        os.close(self._master)
+        os.close(self._slave)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _stream(self):
+        """Yield the packets to stream, changing the sequence number and the
+        sensor of each one.
+        """
+
+        sequence_number = 0
+
+        for sensor in cycle(range(self.sensors)):
+            for pkt in self.packets:
+
+                pkt = bytearray(pkt)
+                pkt[5] = (pkt[5] + sensor) % 256
+
+                for _ in range(self.repeats):
+                    pkt[3] = sequence_number
+                    sequence_number = (sequence_number + 1) % 256
+                    yield bytes(pkt)
+
+    def _run(self):
+
+        stream = self._stream()
+        interval = self.burst / self.rate if self.rate else 0
+        next_burst = None
+
+        while not self._stopped.is_set():
+
+            if self.total is not None and self.sent >= self.total:
+                self.streaming = False
+
+            if not self.streaming:
+                next_burst = None
+                timeout = 0.1
+            else:
+                if next_burst is None:
+                    next_burst = monotonic()
+                timeout = max(next_burst - monotonic(), 0)
+
+            readable, _, _ = select.select([self._master], [], [], timeout)
+
+            if readable:
+
+                try:
+                    data = os.read(self._master, 4096)
+                except BlockingIOError:
+                    data = b''
+
+                for pkt in self._framer.feed(data):
+                    self._answer(pkt)
+
+            if (self.streaming and next_burst is not None and
+                    monotonic() >= next_burst):
+
+                count = self.burst
+
+                if self.total is not None:
+                    count = min(count, self.total - self.sent)
+
+                self._write(b''.join(next(stream) for _ in range(count)))
+                self.sent += count
+                next_burst += interval
+
+    def _answer(self, pkt):
+        """Answer a packet written by the transport."""
+
+        self.received.append(bytes(pkt))
+
+        if len(pkt) < 5:
+            return
+
+        if pkt[1] != 0x00:
+            # Acknowledge everything sent for transmission.
+            self._write(bytes([0x04, 0x02, 0x01, pkt[3], 0x00]))
+            return
+
+        command = pkt[4]
+
+        if command == COMMAND_RESET:
+            self.streaming = False
+            self._framer.clear()
+
+        elif command == COMMAND_MODE:
+            self.transceiver_type = pkt[5]
+            self.protocols[:] = pkt[7:10]
+            self._write(self.status(pkt[3], command))
+            self.streaming = True
+
+        elif command == COMMAND_STATUS:
+            self._write(self.status(pkt[3], command))
+            self.streaming = True
+
+    def status(self, sequence_number, command):
+        """Return the status packet the RFXtrx answers the STATUS and MODE
+        commands with.
+        """
+
+        return bytes([0x0D, 0x01, 0x00, sequence_number, command,
+                      self.transceiver_type, self.firmware_version]) + bytes(
+            self.protocols) + b'\x01\x01\x00\x00'
+
+    def _write(self, data):
+        """Write all of the data, waiting while the transport isn't reading
+        fast enough to make room for it, unless the simulator is stopped.
+        """
+
+        view = memoryview(data)
+
+        while view and not self._stopped.is_set():
+
+            try:
+                written = os.write(self._master, view)
+            except BlockingIOError:
+                select.select([], [self._master], [], 0.1)
+                continue
+
+            view = view[written:]
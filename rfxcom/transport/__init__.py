@@ -4,4 +4,6 @@ rfxcom.transport.__init__
 
 """
 
-from .asyncio import AsyncioTransport  # NOQA
+from .asyncio import AsyncioTransport, blocking  # NOQA
+from .nonblocking import AsyncioProtocolTransport  # NOQA
+from .replay import ReplayTransport  # NOQA
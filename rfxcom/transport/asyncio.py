@@ -5,21 +5,143 @@ rfxcom.transport.asyncio
 """
 
 import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+from rfxcom.exceptions import TransmitFailed, WriteQueueFull
 from rfxcom.transport.base import BaseTransport
 from rfxcom.protocol import RESET_PACKET, STATUS_PACKET, MODE_PACKET
+from rfxcom.protocol.status import Status, enabled_protocols
+from rfxcom.protocol.transmitter import Transmitter
+
+#: The transmitter response message sent when the transmitter couldn't lock
+#: on the frequency, which is worth retrying.
+NAK_NO_LOCK = 0x02
+
+#: The states of the handshake with the RFXtrx made by
+#: :py:meth:`AsyncioTransport._setup`.
+STATE_STARTING = 'starting'
+STATE_RESETTING = 'resetting'
+STATE_WAITING_STATUS = 'waiting status'
+STATE_SETTING_MODE = 'setting mode'
+STATE_READY = 'ready'
+
+
+class BlockingCallback:
+    """A callback that blocks, for example by writing to a database, and so
+    is called in a thread pool rather than on the event loop. Create them
+    with :py:func:`blocking`.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __call__(self, parser):
+        return self.callback(parser)
+
+    def __repr__(self):
+        return "blocking(%r)" % (self.callback, )
+
+
+def blocking(callback):
+    """Mark a callback given to :py:class:`AsyncioTransport` as blocking. It
+    is called in the transport's thread pool, so the event loop carries on
+    reading from the RFXtrx while it runs. The packets from each sensor are
+    still given to the callback one at a time and in the order they were
+    read.
+
+    :param callback: The callback
+    :type callback: callable
+
+    :rtype: BlockingCallback
+    """
+    return BlockingCallback(callback)
 
 
 class AsyncioTransport(BaseTransport):
+
+    #: The number of seconds to wait after the RESET packet before talking to
+    #: the RFXtrx again. The SDK asks for at least 50ms.
+    reset_delay = 0.1
+
+    #: The number of seconds to wait for the RFXtrx to answer the STATUS
+    #: packet.
+    status_timeout = 2
+
+    #: The mode packet setting the protocols that should be enabled. It is
+    #: only written when the status of the RFXtrx shows different protocols.
+    mode_packet = MODE_PACKET
+
+    #: The minimum number of seconds between writing two packets. The RFXtrx
+    #: drops commands if it is sent them faster than it can transmit them.
+    write_gap = 0
+
+    #: The maximum number of packets waiting to be written.
+    write_queue_size = 100
+
+    #: The number of seconds ``transmit`` waits for the RFXtrx to acknowledge
+    #: a packet.
+    ack_timeout = 2
+
+    #: The number of times ``transmit`` writes a packet again when it isn't
+    #: acknowledged in time or the transmitter couldn't lock.
+    ack_retries = 1
+
+    #: The maximum number of threads calling :py:func:`blocking` callbacks.
+    callback_workers = 4
+
+    #: The maximum number of packets from one sensor waiting for its
+    #: :py:func:`blocking` callback, packets read when it is full are dropped.
+    callback_queue_size = 100
+
     def __init__(self, device, loop, callback=None, callbacks=None,
-                 SerialClass=None):
+                 SerialClass=None, **kwargs):
 
         super().__init__(device, callback=callback, callbacks=callbacks,
-                         SerialClass=SerialClass)
+                         SerialClass=SerialClass, **kwargs)
 
         self.loop = loop
+
+        #: The current state of the handshake with the RFXtrx.
+        self.state = STATE_STARTING
+
+        # The future waiting for the answer to the STATUS packet.
+        self._status_waiter = None
+
+        # Packets waiting to be written with the futures returned by write,
+        # and whether the last packet is still being written or the
+        # write_gap after it hasn't passed.
+        self._write_queue = deque()
+        self._write_waiting = False
+
+        # The sequence number of the last packet transmitted and the futures
+        # waiting for an acknowledgement of each sequence number.
+        self._sequence_number = 0
+        self._ack_waiters = {}
+
+        #: The thread pool the blocking callbacks are called in, it is
+        #: created when the first one is needed.
+        self.executor = None
+
+        # The blocking callbacks waiting for the one running for the same
+        # sensor to finish, by sensor.
+        self._blocking_pending = {}
+
+        #: The number of packets dropped because too many from the same
+        #: sensor were waiting for a blocking callback.
+        self.dropped_callbacks = 0
+
+        # The timer writing the packets buffered by the recorder, the loop
+        # reads nothing during a quiet period so it can't rely on reads.
+        self._flush_handle = None
+
+        if self.recorder is not None and self.recorder.flush_interval:
+            self._flush_recorder()
+
         asyncio.async(self._setup())
 
+    @asyncio.coroutine
     def _setup(self):
         """Performs the RFXtrx initialisation protocol in a Future.
 
@@ -31,57 +153,413 @@ class AsyncioTransport(BaseTransport):
         2. Wait at least 50ms and less than 9000ms
         3. Write the STATUS packet to verify the device is up.
         4. Receive status response
-        5. Write the MODE packet to enable or disabled the required protocols.
+        5. Write the MODE packet to enable or disabled the required protocols,
+           if the status shows they don't match already.
+
+        Each step moves ``state`` on, it is ``STATE_READY`` at the end.
         """
+        self.state = STATE_RESETTING
+
         self.log.info("Adding reader to prepare to receive.")
-        self.loop.add_reader(self.dev.fd, self.read)
+        self.start_reading()
 
         self.log.info("Flushing the RFXtrx buffer.")
-        self.flushSerialInput()
+        yield from self.flushSerialInput()
 
         self.log.info("Writing the reset packet to the RFXtrx. (blocking)")
         yield from self.sendRESET()
 
-        self.log.info("Waiting 0.4s")
-        yield from asyncio.sleep(0.4)
+        self.log.info("Waiting %ss", self.reset_delay)
+        yield from asyncio.sleep(self.reset_delay)
+
+        # Anything received while the RFXtrx was resetting is junk.
+        yield from self.flushSerialInput()
+
+        self.state = STATE_WAITING_STATUS
 
         self.log.info("Write the status packet (blocking)")
-        yield from self.sendSTATUS()
+        status = yield from self.requestStatus()
 
-        # TODO receive status response, compare it with the needed MODE and
-        # request a new MODE if required. Currently MODE is always sent.
+        if status is None:
+            self.log.warning("No status received from the RFXtrx in %ss",
+                             self.status_timeout)
+
+        elif self.mode_matches(status):
+            self.log.info("The required protocols are already enabled, "
+                          "not sending the mode packet")
+            self.state = STATE_READY
+            return
+
+        self.state = STATE_SETTING_MODE
 
         self.log.info("Adding mode packet to the write queue (blocking)")
         yield from self.sendMODE()
 
+        self.state = STATE_READY
+
+    @asyncio.coroutine
+    def requestStatus(self):
+        """Write the STATUS packet and wait for the RFXtrx to answer.
+
+        :return: The status packet received or None if there was no answer
+            within ``status_timeout`` seconds.
+        :rtype: bytearray
+        """
+
+        self._status_waiter = asyncio.Future(loop=self.loop)
+
+        try:
+            yield from self.sendSTATUS()
+            status = yield from asyncio.wait_for(
+                self._status_waiter, self.status_timeout, loop=self.loop)
+        except asyncio.TimeoutError:
+            status = None
+        finally:
+            self._status_waiter = None
+
+        return status
+
+    def mode_matches(self, status):
+        """Check if the receiver type, which sets the frequency, and the
+        protocols enabled in a status packet are the same as those set by
+        ``mode_packet``.
+
+        :param status: The status packet received from the RFXtrx
+        :type status: bytearray
+
+        :rtype: boolean
+        """
+
+        if status[5] != self.mode_packet[5]:
+            return False
+
+        enabled = Status.decode(status)['enabled_protocols']
+        return enabled == enabled_protocols(self.mode_packet)
+
+    def start_reading(self):
+        """Attach the reader to the asyncio loop so ``read`` is called when
+        the device has data waiting.
+        """
+        self.loop.add_reader(self.dev.fd, self.read)
+
     @asyncio.coroutine
     def flushSerialInput(self):
         self.dev.flushInput()
+        self.framer.clear()
 
     @asyncio.coroutine
     def sendRESET(self):
-        super().write(RESET_PACKET)
+        yield from self.write(RESET_PACKET)
 
     @asyncio.coroutine
     def sendMODE(self):
-        super().write(MODE_PACKET)
+        yield from self.write(self.mode_packet)
 
     @asyncio.coroutine
     def sendSTATUS(self):
-        super().write(STATUS_PACKET)
+        yield from self.write(STATUS_PACKET)
+
+    def write(self, data):
+        """Add the packet to the write queue. Packets are written in order
+        with at least ``write_gap`` seconds between them, so when the queue is
+        empty and the gap has passed the packet is written straight away.
+
+        :param data: The packet to be written
+        :type data: bytes
+
+        :raises: :py:class:`rfxcom.exceptions.WriteQueueFull`: if there are
+            already ``write_queue_size`` packets waiting to be written.
+
+        :return: A future which is done once the packet has been written to
+            the device.
+        :rtype: asyncio.Future
+        """
+
+        assert type(data) == bytes
+
+        if len(self._write_queue) >= self.write_queue_size:
+            raise WriteQueueFull(
+                "There are already %s packets waiting to be written"
+                % len(self._write_queue))
+
+        future = asyncio.Future(loop=self.loop)
+        self._write_queue.append((bytearray(data), future))
+
+        if not self._write_waiting:
+            self._write_next()
+
+        return future
+
+    def transmit(self, data, timeout=None, retries=None):
+        """Write a packet for the RFXtrx to transmit and wait for it to be
+        acknowledged. The sequence number of the packet (byte 3) is replaced
+        with the next one from the transport, and the Receiver/Transmitter
+        Message sent back with the same sequence number completes the
+        returned future. Many packets can be waiting for acknowledgement at
+        the same time.
+
+        :param data: The packet to be transmitted
+        :type data: bytes
+
+        :param timeout: The number of seconds to wait for the
+            acknowledgement, ``ack_timeout`` by default.
+        :type timeout: float
+
+        :param retries: The number of times to write the packet again if it
+            isn't acknowledged, ``ack_retries`` by default.
+        :type retries: int
+
+        :return: A future with the parsed acknowledgement as its result, or
+            :py:class:`rfxcom.exceptions.TransmitFailed` if the packet wasn't
+            acknowledged.
+        :rtype: asyncio.Future
+        """
+
+        if timeout is None:
+            timeout = self.ack_timeout
+
+        if retries is None:
+            retries = self.ack_retries
+
+        return asyncio.async(self._transmit(data, timeout, retries),
+                             loop=self.loop)
+
+    @asyncio.coroutine
+    def _transmit(self, data, timeout, retries):
+
+        pkt = bytearray(data)
+        reason = None
+
+        for attempt in range(retries + 1):
+
+            sequence_number = pkt[3] = self._next_sequence_number()
+            waiter = asyncio.Future(loop=self.loop)
+            self._ack_waiters[sequence_number] = waiter
+
+            try:
+                yield from self.write(bytes(pkt))
+                response = yield from asyncio.wait_for(waiter, timeout,
+                                                       loop=self.loop)
+            except asyncio.TimeoutError:
+                reason = "no acknowledgement after %ss" % timeout
+                self.log.warning("Packet %s was %s", sequence_number, reason)
+                continue
+            finally:
+                self._ack_waiters.pop(sequence_number, None)
+
+            result = Transmitter.decode(response)
+
+            if result['acknowledged']:
+                return result
+
+            reason = result['message_text'] or result['packet_subtype_name']
+            self.log.warning("Packet %s was not acknowledged: %s",
+                             sequence_number, reason)
+
+            if result['message'] != NAK_NO_LOCK:
+                break
+
+        raise TransmitFailed("The packet wasn't transmitted: %s" % reason)
+
+    def _next_sequence_number(self):
+        """Return the next sequence number which isn't waiting for an
+        acknowledgement, they wrap around after 255.
+        """
+
+        for _ in range(256):
+
+            self._sequence_number = (self._sequence_number + 1) % 256
+
+            if self._sequence_number not in self._ack_waiters:
+                return self._sequence_number
+
+        raise TransmitFailed("All 256 sequence numbers are waiting for an "
+                             "acknowledgement")
+
+    def write_drained(self, callback):
+        """Check if everything written has reached the device. If it hasn't
+        ``callback`` is called with None once it has, or with the exception
+        if it never will. The device is written to directly, so it always
+        has.
+
+        :param callback: Called once the writes are drained
+        :type callback: callable
+
+        :return: True if everything written has reached the device
+        :rtype: boolean
+        """
+        return True
+
+    def _write_next(self):
+        """Write the packets in the queue until it is empty, or until one has
+        been written and the next must wait for it to reach the device or
+        for ``write_gap``.
+        """
+
+        self._write_waiting = False
+
+        while self._write_queue:
+
+            pkt, future = self._write_queue.popleft()
+
+            if future.cancelled():
+                continue
+
+            try:
+                self._write(pkt)
+            except Exception as exc:
+                future.set_exception(exc)
+                continue
+
+            if not self.write_drained(partial(self._write_drained, future)):
+                self._write_waiting = True
+                return
+
+            if not self._written(future, None):
+                return
+
+    def _write_drained(self, future, exc):
+        """The packet of the future reached the device, carry on writing the
+        queue.
+        """
+        if self._written(future, exc):
+            self._write_next()
+
+    def _written(self, future, exc):
+        """Complete the future of a packet that has reached the device, or
+        failed to, and return True if the next packet can be written now
+        rather than after ``write_gap``.
+        """
+
+        if not future.done():
+            if exc is None:
+                future.set_result(None)
+            else:
+                future.set_exception(exc)
+
+        if self.write_gap:
+            self._write_waiting = True
+            self.loop.call_later(self.write_gap, self._write_next)
+            return False
+
+        return True
 
     def do_callback(self, pkt):
         """Add the callback to the event loop, we use call soon because we just
         want it to be called at some point, but don't care when particularly.
         """
+
+        waiter = self._status_waiter
+
+        if (waiter is not None and not waiter.done() and
+                Status.handler().match(pkt) and pkt[2] == 0x00):
+            waiter.set_result(pkt)
+
+        if self._ack_waiters and Transmitter.handler().match(pkt):
+            waiter = self._ack_waiters.pop(pkt[3], None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(pkt)
+
         callback, parser = self.get_callback_parser(pkt)
 
-        if asyncio.iscoroutinefunction(callback):
+        if not self.is_changed(pkt, parser):
+            return
+
+        if isinstance(callback, BlockingCallback):
+            key = parser.device_key(pkt)
+            if key is None:
+                key = pkt[1], pkt[2]
+            self._do_blocking_callback(key, callback, parser)
+        elif asyncio.iscoroutinefunction(callback):
             self.loop.call_soon_threadsafe(self._do_async_callback,
                                            callback, parser)
         else:
             self.loop.call_soon(callback, parser)
 
+    def _do_blocking_callback(self, key, callback, parser):
+        """Call the blocking callback in the thread pool, or once the callback
+        already running for the same sensor has finished. The packet is
+        dropped if ``callback_queue_size`` packets from the sensor are
+        already waiting.
+        """
+
+        pending = self._blocking_pending.get(key)
+
+        if pending is not None:
+
+            if len(pending) >= self.callback_queue_size:
+                self.dropped_callbacks += 1
+                self.log.warning("Dropped packet %s, the blocking callback "
+                                 "is %s packets behind", parser,
+                                 len(pending))
+                return
+
+            pending.append((callback, parser))
+            return
+
+        self._blocking_pending[key] = deque()
+        self._run_blocking_callback(key, callback, parser)
+
+    def _run_blocking_callback(self, key, callback, parser):
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.callback_workers)
+
+        future = self.loop.run_in_executor(self.executor, callback, parser)
+        future.add_done_callback(partial(self._blocking_callback_done, key))
+
+    def _blocking_callback_done(self, key, future):
+
+        exc = None if future.cancelled() else future.exception()
+
+        if exc is not None:
+            self.log.error("Blocking callback failed",
+                           exc_info=(type(exc), exc, exc.__traceback__))
+
+        pending = self._blocking_pending.get(key)
+
+        if pending:
+            self._run_blocking_callback(key, *pending.popleft())
+        else:
+            self._blocking_pending.pop(key, None)
+
+    def shutdown_executor(self, wait=True):
+        """Shut down the thread pool of the blocking callbacks. Callbacks that
+        haven't started yet are not called.
+
+        :param wait: Wait for the running callbacks to finish
+        :type wait: boolean
+        """
+
+        self._blocking_pending.clear()
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+
+    def _flush_recorder(self):
+        """Write the packets buffered by the recorder if they are due, and
+        check again after ``flush_interval``.
+        """
+        self.recorder.flush_due()
+        self._flush_handle = self.loop.call_later(
+            self.recorder.flush_interval, self._flush_recorder)
+
+    def _stop_flushing_recorder(self):
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def close(self):
+        """Stop reading from the RFXtrx, close the device and shut down the
+        thread pool of the blocking callbacks without waiting for them.
+        """
+        self._stop_flushing_recorder()
+        self.loop.remove_reader(self.dev.fd)
+        self.dev.close()
+        self.shutdown_executor(wait=False)
+
     @staticmethod
     def _do_async_callback(callback, parser):
         """ Call a the callback coroutine function in the event loop
@@ -91,24 +569,21 @@ class AsyncioTransport(BaseTransport):
         asyncio.async(callback(parser))
 
     def read(self):
-        """We have been called to read! As a consumer, continue to read for
-        the length of the packet and then pass to the callback.
+        """We have been called to read! The device is ready, so read all of
+        the bytes waiting without blocking and pass each complete packet to
+        the callback. Anything left over is kept for the next call.
         """
 
-        data = self.dev.read()
+        data = self.dev.read(self.dev.in_waiting)
 
         if len(data) == 0:
             self.log.warning("READ : Nothing received")
-            return
+            return []
 
-        if data == b'\x00':
-            self.log.warning("READ : Empty packet (Got \\x00)")
-            return
+        packets = self.framer.feed(data)
 
-        pkt = bytearray(data)
-        data = self.dev.read(pkt[0])
-        pkt.extend(bytearray(data))
+        if self.framer.padding:
+            self.log.warning("READ : Empty packet (Got \\x00)")
 
-        self.log.info("READ : %s" % self.format_packet(pkt))
-        self.do_callback(pkt)
-        return pkt
+        self.handle_packets(packets)
+        return packets
@@ -3,21 +3,33 @@ rfxcom.transport.base
 =====================
 
 """
-from logging import getLogger
+from logging import INFO, getLogger
 
 from serial import Serial
 
 from rfxcom.exceptions import PacketHandlerNotFound, RFXComException
-from rfxcom.protocol import HANDLERS
+from rfxcom.protocol import DEFAULT_HANDLER, DISPATCH_TABLE
+from rfxcom.protocol.dispatch import build_dispatch_table, packet_key
+from rfxcom.transport.cache import LastValueCache
+from rfxcom.transport.dedup import DuplicateFilter
+from rfxcom.transport.framer import PacketFramer
+
+#: The formatted hex of every byte value, used by ``format_packet``.
+_BYTE_HEX = tuple("0x{0:02x}".format(x) for x in range(256))
 
 
 class BaseTransport:
 
     def __init__(self, device, callback=None, callbacks=None,
-                 SerialClass=None):
+                 SerialClass=None, lazy=False, dedup_window=None,
+                 changes_only=None, registry=None, recorder=None):
 
         self.log = getLogger('rfxcom.transport.%s' % self.__class__.__name__)
 
+        #: When True the data given to the callbacks is a lazy mapping which
+        #: only decodes the fields that are used.
+        self.lazy = lazy
+
         if SerialClass is None:
             SerialClass = Serial
 
@@ -26,10 +38,35 @@ class BaseTransport:
         else:
             self.dev = device
 
+        self.framer = PacketFramer()
+
+        #: Drops the repeated copies of packets sent by sensors when a
+        #: ``dedup_window`` in seconds is given, otherwise None.
+        self.dedup = None
+
+        if dedup_window:
+            self.dedup = DuplicateFilter(dedup_window)
+
+        #: The last reading of each sensor when ``changes_only`` is given,
+        #: otherwise None. Callbacks are then only called when one of the
+        #: fields named by ``changes_only`` has changed.
+        self.last_values = None
+
+        if changes_only:
+            self.last_values = LastValueCache(changes_only)
+
+        #: The :py:class:`rfxcom.transport.registry.SensorRegistry` updated
+        #: with every packet, or None.
+        self.registry = registry
+
+        #: The :py:class:`rfxcom.transport.capture.CaptureRecorder` every
+        #: packet read is recorded to, or None.
+        self.recorder = recorder
+
         self._setup_callbacks(callback, callbacks)
 
     def format_packet(self, pkt):
-        return " ".join("0x{0:02x}".format(x) for x in pkt)
+        return " ".join(map(_BYTE_HEX.__getitem__, pkt))
 
     def _setup_callbacks(self, callback, callbacks):
 
@@ -58,63 +95,153 @@ class BaseTransport:
             else:
                 self.log.warning("No default callback provided.")
 
+        # Map each (packet_type, packet_subtype) to the packet handler and
+        # callback to use, in the order the callbacks were given.
+        self._dispatch, self._dispatch_fallback = build_dispatch_table(
+            (PacketParser, (PacketParser, callback))
+            for PacketParser, callback in self.callbacks.items())
+
     def get_callback_parser(self, pkt):
 
-        for PacketParser, callback in self.callbacks.items():
+        key = packet_key(pkt)
+        entry = self._dispatch.get(key, self._dispatch_fallback)
+
+        if entry is None:
+
+            if not self.default_callback:
+                raise PacketHandlerNotFound("No packet handler found for %s" %
+                                            self.format_packet(pkt))
+
+            PacketParser = DISPATCH_TABLE.get(key, DEFAULT_HANDLER)
+            entry = PacketParser, self.default_callback
+
+        PacketParser, callback = entry
+
+        parser = PacketParser()
+        parser.load(pkt, lazy=self.lazy)
+
+        return callback, parser
+
+    def is_changed(self, pkt, parser):
+        """Check if the packet should be given to the callback, which is
+        always the case unless ``changes_only`` was given. The ``registry``
+        is updated with every packet first.
 
-            parser = PacketParser()
+        :param pkt: The packet
+        :type pkt: bytearray
 
-            if parser.can_handle(pkt):
-                parser.load(pkt)
-                return callback, parser
+        :param parser: The packet handler that loaded the packet
+        :type parser: rfxcom.protocol.base.BasePacketHandler
 
-        if not self.default_callback:
-            raise PacketHandlerNotFound("No packet handler found for %s" %
-                                        self.format_packet(pkt))
+        :rtype: boolean
+        """
 
-        for PacketParser in HANDLERS:
+        if self.registry is not None:
+            self.registry.update(pkt, parser)
 
-            parser = PacketParser()
-            if parser.can_handle(pkt):
-                parser.load(pkt)
-                break
+        last_values = self.last_values
 
-        return self.default_callback, parser
+        if last_values is None:
+            return True
+
+        return last_values.update(last_values.key(pkt, parser), parser.data)
 
     def write(self, data):
 
         assert type(data) == bytes
 
-        pkt = bytearray(data)
-        self.log.info("WRITE: %s" % self.format_packet(pkt))
+        self._write(bytearray(data))
+
+    def _write(self, pkt):
+
+        if self.log.isEnabledFor(INFO):
+            self.log.info("WRITE: %s", self.format_packet(pkt))
+
+        self.write_packet(pkt)
+
+    def write_packet(self, pkt):
+        """Write the packet to the device. Transports that don't write to the
+        device directly override this.
+
+        :param pkt: The packet to be written
+        :type pkt: bytearray
+        """
         self.dev.write(pkt)
 
     def read(self):
+        """Read everything waiting on the device in one call and handle each
+        complete packet it contains. When nothing is waiting this blocks for
+        the first byte, up to the timeout of the device. Partial packets are
+        kept by the framer until the rest arrives.
+
+        :return: A list of the complete packets read.
+        :rtype: list
+        """
 
         self.log.debug("READ : STARTING")
-        data = self.dev.read()
+        data = self.dev.read(self.dev.in_waiting or 1)
+
+        if self.recorder is not None:
+            # The read returns at least once per timeout of the device, so
+            # this writes the packets recorded before a quiet period.
+            self.recorder.flush_due()
+
+        if len(data) == 0:
+            self.log.debug("READ : Nothing received")
+            return []
+
+        packets = self.framer.feed(data)
+
+        if self.framer.padding:
+            self.log.debug("READ : Empty packet (Got \\x00)")
+
+        self.handle_packets(packets)
+        return packets
+
+    def handle_packets(self, packets):
+        """Give each packet read to its callback. A packet that can't be
+        handled doesn't stop the rest of the burst being handled, the first
+        exception raised is raised again once every packet has been given to
+        its callback and any later ones are logged.
+
+        :param packets: The complete packets read
+        :type packets: list
+        """
+
+        # Formatting the packets is only worth doing if they will be logged,
+        # so check the level once for the whole read.
+        log_packets = self.log.isEnabledFor(INFO)
+        dedup = self.dedup
+        recorder = self.recorder
+        error = None
+
+        for pkt in packets:
 
-        while True:
+            if recorder is not None:
+                recorder.record(pkt)
 
-            if len(data) == 0:
-                self.log.debug("READ : Nothing received")
-                return
+            if log_packets:
+                self.log.info("READ : %s", self.format_packet(pkt))
 
-            if data == b'\x00':
-                self.log.debug("READ : Empty packet (Got \x00)")
-                return
+            if dedup is not None and dedup.is_duplicate(pkt):
+                self.log.debug("READ : Dropped duplicate packet")
+                continue
 
-            pkt = bytearray(data)
-            data = self.dev.read(pkt[0])
-            pkt.extend(bytearray(data))
-            break
+            try:
+                self.do_callback(pkt)
+            except Exception as e:
+                if error is not None:
+                    self.log.exception("READ : Failed to handle %s",
+                                       self.format_packet(pkt))
+                else:
+                    error = e
 
-        self.log.info("READ : %s" % self.format_packet(pkt))
-        self.do_callback(pkt)
-        return pkt
+        if error is not None:
+            raise error
 
     def do_callback(self, pkt):
 
         callback, parser = self.get_callback_parser(pkt)
 
-        callback(parser)
+        if self.is_changed(pkt, parser):
+            callback(parser)
@@ -0,0 +1,100 @@
+"""
+rfxcom.transport.cache
+======================
+
+"""
+
+from collections import OrderedDict
+
+#: The fields compared by default, the readings of the temperature,
+#: humidity, UV and rain sensors and the commands of the lighting devices.
+DEFAULT_FIELDS = ('temperature', 'humidity', 'uv', 'rain_rate', 'rain_total',
+                  'command')
+
+
+class LastValueCache:
+    """The most recent reading decoded from each sensor, kept by the
+    ``device_key`` of its packets. Only the ``size`` sensors heard
+    from most recently are kept, so sensors that go out of range are
+    eventually forgotten.
+
+    :param fields: The names of the fields compared by :py:meth:`update`
+    :type fields: tuple
+
+    :param size: The maximum number of sensors kept
+    :type size: int
+    """
+
+    def __init__(self, fields=DEFAULT_FIELDS, size=1024):
+
+        self.fields = tuple(fields)
+        self.size = size
+
+        self._readings = OrderedDict()
+
+    @staticmethod
+    def key(pkt, parser):
+        """Return the key of the sensor that sent the packet, its
+        ``device_key``. This is the full address of lighting devices, as
+        several of them can share an ID, and None if the packet doesn't
+        identify its sensor.
+        """
+        return parser.device_key(pkt)
+
+    def get(self, key, default=None):
+        """Return the last reading of the sensor, as returned by ``parse``."""
+        return self._readings.get(key, default)
+
+    def update(self, key, data):
+        """Store the reading of the sensor and check if any of ``fields``
+        changed since its last reading. It is always changed for the first
+        reading of a sensor and for packets that have none of the fields.
+        Packets without a key are always changed and aren't stored.
+
+        :param key: The key of the sensor, see :py:meth:`key`
+        :type key: tuple
+
+        :param data: The fields of the packet, as returned by ``parse``
+        :type data: dict
+
+        :return: True if the reading changed
+        :rtype: boolean
+        """
+
+        if key is None:
+            return True
+
+        readings = self._readings
+        last = readings.pop(key, None)
+        readings[key] = data
+
+        if last is None:
+
+            if len(readings) > self.size:
+                readings.popitem(last=False)
+
+            return True
+
+        compared = False
+
+        for name in self.fields:
+
+            if name not in data:
+                continue
+
+            if last.get(name) != data[name]:
+                return True
+
+            compared = True
+
+        return not compared
+
+    def clear(self):
+        """Forget all of the readings."""
+        self._readings.clear()
+
+    def __len__(self):
+        return len(self._readings)
+
+    def __contains__(self, key):
+        return key in self._readings
@@ -0,0 +1,438 @@
+"""
+rfxcom.transport.capture
+========================
+
+Record the packets read from the RFXtrx to compact binary files, so the
+traffic can be stored and replayed later.
+
+A :py:class:`CaptureReader` memory maps a capture file and finds the packets
+in a range of time with a sparse index of the file, which is saved next to it
+so it only needs to be built once.
+
+A capture file starts with a 16 byte header, the magic bytes ``RFXCAP``, the
+format version, a padding byte and the wall clock time the file was started
+as a big endian double. Each packet follows as an 8 byte big endian count
+of microseconds since the file was started, measured with a monotonic clock,
+and then the raw bytes of the packet. The packet starts with its own length
+byte, so no other framing is needed.
+
+"""
+
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from struct import Struct
+from time import monotonic, time
+
+from rfxcom.exceptions import InvalidCapture
+from rfxcom.protocol import decode_packet
+
+#: The magic bytes at the start of every capture file.
+MAGIC = b'RFXCAP'
+
+#: The version of the capture format.
+VERSION = 1
+
+#: The header at the start of every capture file: magic, version, padding and
+#: the wall clock time the file was started.
+FILE_HEADER = Struct('>6sBxd')
+
+#: The header before every packet: microseconds since the file was started.
+RECORD_HEADER = Struct('>Q')
+
+#: The magic bytes at the start of every index file.
+INDEX_MAGIC = b'RFXIDX'
+
+#: The header at the start of every index file: magic, version, padding, the
+#: start time of the capture, the interval of the index in bytes and the size
+#: of the capture indexed. It is followed by the timestamp and offset of each
+#: entry, as 64 bit integers.
+INDEX_HEADER = Struct('>6sBxdQQ')
+
+
+class CaptureRecorder:
+    """Append the packets read from the RFXtrx to a capture file. Packets are
+    buffered in memory and written in blocks of ``buffer_size`` bytes, or
+    once the oldest has been buffered for ``flush_interval`` seconds, so a
+    quiet site doesn't keep packets in memory for long. That is checked
+    when a packet is recorded and by :py:meth:`flush_due`, which the
+    transports call regularly even when nothing is read. When
+    the file grows past ``max_size`` bytes it is rotated in the same way as
+    :py:class:`logging.handlers.RotatingFileHandler`, the file is renamed
+    with the suffix ``.1``, older files move up to ``.2`` and so on, and at
+    most ``backup_count`` old files are kept.
+
+    A file left by an earlier recorder is rotated when the recorder is
+    created, so the timestamps in each file have the same start.
+
+    Pass a recorder to a transport with the ``recorder`` argument to have
+    every packet read recorded. The recorder must be closed with
+    :py:meth:`close` when it is no longer used, otherwise the packets still
+    buffered are lost.
+
+    :param path: The path of the capture file
+    :type path: str
+
+    :param max_size: The size in bytes the file is rotated at, or 0 to
+        never rotate it
+    :type max_size: int
+
+    :param backup_count: The number of old files kept
+    :type backup_count: int
+
+    :param buffer_size: The number of bytes buffered before they are written
+    :type buffer_size: int
+
+    :param flush_interval: The number of seconds packets are buffered for
+        before they are written, or None to only write them when the buffer
+        is full
+    :type flush_interval: float
+    """
+
+    def __init__(self, path, max_size=10 * 1024 * 1024, backup_count=5,
+                 buffer_size=64 * 1024, flush_interval=5, clock=monotonic):
+
+        self.path = path
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+
+        self._buffer = bytearray()
+        self._file = None
+        self._start = None
+
+        # The time the oldest packet in the buffer was recorded.
+        self._buffered_since = None
+
+        if os.path.exists(path) and os.path.getsize(path):
+            self._rotate()
+
+        self._open()
+
+    def _open(self):
+
+        self._file = open(self.path, 'ab')
+        self._start = self.clock()
+
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, time()))
+        self._file.flush()
+
+    def _rotate(self):
+
+        if self.backup_count:
+
+            for index in range(self.backup_count - 1, 0, -1):
+
+                source = "%s.%s" % (self.path, index)
+
+                if os.path.exists(source):
+                    os.replace(source, "%s.%s" % (self.path, index + 1))
+
+            os.replace(self.path, self.path + ".1")
+
+        else:
+            os.remove(self.path)
+
+    def record(self, pkt):
+        """Add the packet to the capture.
+
+        :param pkt: The packet
+        :type pkt: bytearray
+        """
+
+        now = self.clock()
+        microseconds = int((now - self._start) * 1000000)
+
+        buffer = self._buffer
+
+        if not buffer:
+            self._buffered_since = now
+
+        buffer += RECORD_HEADER.pack(microseconds)
+        buffer += pkt
+
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+        else:
+            self.flush_due(now)
+
+    def flush_due(self, now=None):
+        """Write the buffered packets if the oldest has been buffered for
+        ``flush_interval`` seconds. Call this regularly so the packets
+        recorded before a quiet period are written without waiting for the
+        next packet.
+
+        :param now: The time from ``clock``, it is read if it isn't given
+        :type now: float
+        """
+
+        if not self._buffer or self.flush_interval is None:
+            return
+
+        if now is None:
+            now = self.clock()
+
+        if now - self._buffered_since >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered packets to the file, and rotate it if it is now
+        larger than ``max_size``.
+        """
+
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+        self._file.flush()
+
+        if self.max_size and self._file.tell() >= self.max_size:
+            self._file.close()
+            self._rotate()
+            self._open()
+
+    def close(self):
+        """Write the buffered packets and close the file."""
+
+        if self._file is None:
+            return
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+class CaptureReader:
+    """Read the packets in a capture file without copying them. The file is
+    memory mapped and each packet is returned as a :py:class:`memoryview`
+    of the map. The memoryviews must be released before the reader is
+    closed.
+
+    To find the packets in a range of time the reader keeps a sparse index
+    with the timestamp and offset of the first packet in every
+    ``index_interval`` bytes of the file. A query then starts from the entry
+    before the range and at most ``index_interval`` bytes are read before
+    the first packet returned. The index is saved in a file next to the
+    capture, with the suffix ``.idx``, and is loaded rather than built the
+    next time the capture is read. If the capture has grown since, the index
+    is extended from where it stopped.
+
+    :param path: The path of the capture file
+    :type path: str
+
+    :param index_interval: The number of bytes between the entries of the
+        index
+    :type index_interval: int
+
+    :param save_index: Save the index next to the capture
+    :type save_index: boolean
+
+    :raises: :py:class:`rfxcom.exceptions.InvalidCapture`: If the file isn't
+        a capture
+    """
+
+    def __init__(self, path, index_interval=64 * 1024, save_index=True):
+
+        self.path = path
+        self.index_path = path + '.idx'
+        self.index_interval = index_interval
+
+        if os.path.getsize(path) < FILE_HEADER.size:
+            raise InvalidCapture("%s is too short to be a capture" % path)
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, started = FILE_HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise InvalidCapture("%s isn't a version %s capture" % (
+                path, VERSION))
+
+        #: The wall clock time the capture was started.
+        self.started = started
+
+        # The timestamps in microseconds and the offsets of the index
+        # entries, and the offset of the end of the last complete packet.
+        self._index_times = array('Q')
+        self._index_offsets = array('Q')
+        self._end = FILE_HEADER.size
+
+        loaded = self._load_index()
+
+        if (self._build_index() or not loaded) and save_index:
+            self._save_index()
+
+    def _records(self, offset, end=None):
+        """Yield the offset, timestamp and end of each complete packet from
+        the offset.
+        """
+
+        data = self._mmap
+        size = len(data) if end is None else end
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+
+        while offset + header_size < size:
+
+            start = offset + header_size
+            stop = start + data[start] + 1
+
+            if stop > size:
+                break
+
+            microseconds, = unpack_from(data, offset)
+            yield offset, microseconds, stop
+
+            offset = stop
+
+    def _build_index(self):
+        """Index the packets after the end of the index, returning True if
+        any were added.
+        """
+
+        times = self._index_times
+        offsets = self._index_offsets
+        interval = self.index_interval
+        last = offsets[-1] if offsets else None
+        end = self._end
+
+        for offset, microseconds, stop in self._records(self._end):
+
+            if last is None or offset - last >= interval:
+                times.append(microseconds)
+                offsets.append(offset)
+                last = offset
+
+            end = stop
+
+        added = end != self._end
+        self._end = end
+        return added
+
+    def _load_index(self):
+
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                entries = f.read()
+        except OSError:
+            return False
+
+        if len(header) < INDEX_HEADER.size:
+            return False
+
+        magic, version, started, interval, end = INDEX_HEADER.unpack(header)
+
+        if (magic != INDEX_MAGIC or version != VERSION or
+                started != self.started or interval != self.index_interval or
+                end > len(self._mmap) or len(entries) % 16):
+            return False
+
+        values = array('Q')
+        values.frombytes(entries)
+
+        # The entries are saved big endian, like the rest of the format.
+        if sys.byteorder == 'little':
+            values.byteswap()
+
+        self._index_times = values[0::2]
+        self._index_offsets = values[1::2]
+        self._end = end
+        return True
+
+    def _save_index(self):
+
+        values = array('Q')
+
+        for entry in zip(self._index_times, self._index_offsets):
+            values.extend(entry)
+
+        if sys.byteorder == 'little':
+            values.byteswap()
+
+        try:
+            with open(self.index_path, 'wb') as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION, self.started,
+                                          self.index_interval, self._end))
+                f.write(values.tobytes())
+        except OSError:
+            # The capture can still be read, it is just indexed again.
+            pass
+
+    def frames(self, start=None, stop=None):
+        """Yield the packets received from ``start`` up to, but not including,
+        ``stop``.
+
+        :param start: The wall clock time of the first packet, or None to
+            start at the beginning of the capture
+        :type start: float
+
+        :param stop: The wall clock time to stop at, or None to stop at the
+            end of the capture
+        :type stop: float
+
+        :return: An iterator of ``(timestamp, packet)`` where the timestamp
+            is the wall clock time the packet was received and the packet is
+            a memoryview.
+        """
+
+        offset = FILE_HEADER.size
+        start_us = stop_us = None
+
+        if start is not None:
+
+            start_us = max(int(round((start - self.started) * 1000000)), 0)
+            # Packets received at the same time can span index entries, so
+            # start from the entry before the first one at start_us.
+            position = bisect_left(self._index_times, start_us) - 1
+
+            if position >= 0:
+                offset = self._index_offsets[position]
+
+        if stop is not None:
+            stop_us = int(round((stop - self.started) * 1000000))
+
+        view = memoryview(self._mmap)
+        started = self.started
+
+        try:
+            for offset, microseconds, end in self._records(offset, self._end):
+
+                if start_us is not None and microseconds < start_us:
+                    continue
+
+                if stop_us is not None and microseconds >= stop_us:
+                    break
+
+                yield (started + microseconds / 1000000,
+                       view[offset + RECORD_HEADER.size:end])
+        finally:
+            view.release()
+
+    def parse(self, start=None, stop=None):
+        """Decode the packets received from ``start`` up to, but not
+        including, ``stop`` with the packet handlers in
+        :py:mod:`rfxcom.protocol`, see
+        :py:func:`rfxcom.protocol.decode_packet`.
+
+        :return: An iterator of ``(timestamp, fields)``
+        """
+
+        for timestamp, frame in self.frames(start, stop):
+            yield timestamp, decode_packet(frame)
+
+    def close(self):
+        """Close the memory map of the capture."""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,83 @@
+"""
+rfxcom.transport.dedup
+======================
+
+"""
+
+from collections import Counter, OrderedDict
+from time import monotonic
+
+
+class DuplicateFilter:
+    """Drop the repeated copies of a packet that most 433MHz sensors send
+    for every reading.
+
+    Packets are compared without their sequence number (byte 3), which the
+    RFXtrx increments for every packet it receives. A packet is a duplicate
+    when the same bytes were received less than ``window`` seconds before.
+    The packets seen most recently are kept in a least recently used cache
+    of at most ``size`` packets.
+
+    :param window: The number of seconds a packet is remembered for
+    :type window: float
+
+    :param size: The maximum number of packets remembered
+    :type size: int
+
+    :param clock: The function returning the time in seconds
+    :type clock: callable
+    """
+
+    #: Packet types that are never dropped. The interface and transmitter
+    #: responses only differ by their sequence number, which is how they are
+    #: matched to the packets they answer.
+    IGNORE_TYPES = frozenset((0x01, 0x02))
+
+    def __init__(self, window=1, size=256, clock=monotonic):
+
+        self.window = window
+        self.size = size
+        self.clock = clock
+
+        self._seen = OrderedDict()
+
+        #: The number of packets dropped.
+        self.suppressed = 0
+
+        #: The number of packets dropped for each ``(packet_type,
+        #: packet_subtype)``.
+        self.suppressed_by_type = Counter()
+
+    def is_duplicate(self, pkt):
+        """Check if the packet is a copy of one received within ``window``
+        seconds and remember it.
+
+        :param pkt: The packet
+        :type pkt: bytearray
+
+        :rtype: boolean
+        """
+
+        if len(pkt) < 4 or pkt[1] in self.IGNORE_TYPES:
+            return False
+
+        key = bytes(pkt[:3] + pkt[4:])
+        now = self.clock()
+        seen = self._seen
+
+        last = seen.pop(key, None)
+        seen[key] = now
+
+        if last is not None and now - last < self.window:
+            self.suppressed += 1
+            self.suppressed_by_type[pkt[1], pkt[2]] += 1
+            return True
+
+        if len(seen) > self.size:
+            seen.popitem(last=False)
+
+        return False
+
+    def clear(self):
+        """Forget all of the packets seen."""
+        self._seen.clear()
@@ -0,0 +1,71 @@
+"""
+rfxcom.transport.framer
+=======================
+
+"""
+
+
+class PacketFramer:
+    """Split a stream of bytes read from the RFXtrx into packets.
+
+    Every packet starts with a length byte which gives the number of bytes
+    that follow it. Bytes are fed in as they are read from the device, in
+    chunks of any size, and each call returns the packets completed so far.
+    A partial packet at the end of a chunk is kept in the buffer until the
+    rest of it arrives. Zero bytes between packets are padding and are
+    skipped.
+    """
+
+    def __init__(self):
+
+        self.buffer = bytearray()
+
+        #: The number of padding bytes skipped by the last call to ``feed``.
+        self.padding = 0
+
+    def feed(self, data):
+        """Add the bytes to the buffer and return all of the complete packets
+        it now contains.
+
+        :param data: The bytes read from the device
+        :type data: bytes
+
+        :return: A list of bytearrays, one for each complete packet.
+        :rtype: list
+        """
+
+        buffer = self.buffer
+        buffer.extend(data)
+
+        packets = []
+        padding = 0
+        start = 0
+        end = len(buffer)
+
+        while start < end:
+
+            length = buffer[start]
+
+            if length == 0:
+                padding += 1
+                start += 1
+                continue
+
+            stop = start + length + 1
+
+            if stop > end:
+                break
+
+            packets.append(buffer[start:stop])
+            start = stop
+
+        # Drop everything consumed in one go, leaving any partial packet at
+        # the start of the buffer.
+        del buffer[:start]
+
+        self.padding = padding
+        return packets
+
+    def clear(self):
+        """Discard any partial packet held in the buffer."""
+        del self.buffer[:]
@@ -0,0 +1,297 @@
+"""
+rfxcom.transport.nonblocking
+============================
+
+An asyncio transport that never blocks the event loop on the RFXtrx. The
+serial device is opened in non-blocking mode, data is read with the loop's
+reader callbacks and delivered to an :py:class:`asyncio.Protocol` through
+``data_received`` and writes that the device can't take straight away are
+buffered and sent when the loop reports it is writable.
+
+"""
+
+import asyncio
+import os
+
+from serial import Serial
+
+from rfxcom.transport.asyncio import AsyncioTransport
+
+
+class SerialTransport(asyncio.Transport):
+    """An :py:class:`asyncio.Transport` for a serial device opened in
+    non-blocking mode. It reads and writes the file descriptor of the device
+    directly and only when the event loop says it is ready.
+
+    :param loop: The event loop to attach to
+    :type loop: asyncio.AbstractEventLoop
+
+    :param serial: The open serial device, it must have an ``fd`` attribute
+        and a ``close`` method.
+    :type serial: serial.Serial
+
+    :param protocol: The protocol that will receive the data read
+    :type protocol: asyncio.Protocol
+    """
+
+    #: The maximum number of bytes read from the device in a single call.
+    max_size = 4096
+
+    def __init__(self, loop, serial, protocol):
+
+        super().__init__(extra={'serial': serial})
+
+        self._loop = loop
+        self._serial = serial
+        self._fd = serial.fd
+        self._protocol = protocol
+        self._buffer = bytearray()
+        self._drain_callbacks = []
+        self._closing = False
+        self._paused = False
+
+        self._loop.call_soon(self._protocol.connection_made, self)
+        self._loop.call_soon(self._loop.add_reader, self._fd, self._read_ready)
+
+    def _read_ready(self):
+
+        try:
+            data = os.read(self._fd, self.max_size)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            self._fatal_error(exc)
+            return
+
+        if data:
+            self._protocol.data_received(data)
+        else:
+            # A tty that is readable but returns nothing has been hung up,
+            # for example when the RFXtrx is unplugged.
+            self._fatal_error(ConnectionResetError("Serial device hung up"))
+
+    def write(self, data):
+        """Write the data to the device. If the device can't take all of it
+        without blocking the remainder is buffered and written when the
+        device is writable again. This never blocks.
+
+        :param data: The bytes to be written
+        :type data: bytes
+        """
+
+        if not data or self._closing:
+            return
+
+        if not self._buffer:
+
+            try:
+                written = os.write(self._fd, data)
+            except (BlockingIOError, InterruptedError):
+                written = 0
+            except OSError as exc:
+                self._fatal_error(exc)
+                return
+
+            if written == len(data):
+                return
+
+            data = data[written:]
+            self._loop.add_writer(self._fd, self._write_ready)
+
+        self._buffer.extend(data)
+
+    def _write_ready(self):
+
+        try:
+            written = os.write(self._fd, self._buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            self._fatal_error(exc)
+            return
+
+        del self._buffer[:written]
+
+        if not self._buffer:
+            self._loop.remove_writer(self._fd)
+            self._call_drain_callbacks(None)
+
+            if self._closing:
+                self._call_connection_lost(None)
+
+    def call_when_drained(self, callback):
+        """Check if everything written has reached the device. If some of it
+        is still buffered ``callback`` is called with None once the buffer
+        has been written, or with the exception if the transport is closed
+        first.
+
+        :param callback: Called once the buffer is written
+        :type callback: callable
+
+        :return: True if nothing is buffered
+        :rtype: boolean
+        """
+
+        if not self._buffer:
+            return True
+
+        self._drain_callbacks.append(callback)
+        return False
+
+    def _call_drain_callbacks(self, exc):
+
+        callbacks, self._drain_callbacks = self._drain_callbacks, []
+
+        for callback in callbacks:
+            callback(exc)
+
+    def get_write_buffer_size(self):
+        return len(self._buffer)
+
+    def can_write_eof(self):
+        return False
+
+    def is_closing(self):
+        return self._closing
+
+    def pause_reading(self):
+
+        if self._closing or self._paused:
+            return
+
+        self._paused = True
+        self._loop.remove_reader(self._fd)
+
+    def resume_reading(self):
+
+        if self._closing or not self._paused:
+            return
+
+        self._paused = False
+        self._loop.add_reader(self._fd, self._read_ready)
+
+    def close(self):
+        """Stop reading and close the device once everything buffered has
+        been written.
+        """
+
+        if self._closing:
+            return
+
+        self._closing = True
+        self._loop.remove_reader(self._fd)
+
+        if not self._buffer:
+            self._loop.call_soon(self._call_connection_lost, None)
+
+    def abort(self):
+        self._force_close(None)
+
+    def _fatal_error(self, exc):
+        self._force_close(exc)
+
+    def _force_close(self, exc):
+
+        if self._buffer:
+            self._buffer.clear()
+            self._loop.remove_writer(self._fd)
+            self._call_drain_callbacks(exc or ConnectionAbortedError(
+                "Serial transport closed before the data was written"))
+
+        if not self._closing:
+            self._closing = True
+            self._loop.remove_reader(self._fd)
+
+        self._loop.call_soon(self._call_connection_lost, exc)
+
+    def _call_connection_lost(self, exc):
+
+        try:
+            self._protocol.connection_lost(exc)
+        finally:
+            self._serial.close()
+            self._serial = None
+            self._protocol = None
+
+
+class RFXtrxProtocol(asyncio.Protocol):
+    """The protocol that receives the data read by a
+    :py:class:`SerialTransport` and passes it to the rfxcom transport to be
+    framed into packets and handled.
+
+    :param rfxcom: The rfxcom transport to pass the packets to
+    :type rfxcom: rfxcom.transport.base.BaseTransport
+    """
+
+    def __init__(self, rfxcom):
+        self.rfxcom = rfxcom
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+
+        packets = self.rfxcom.framer.feed(data)
+
+        if self.rfxcom.framer.padding:
+            self.rfxcom.log.warning("READ : Empty packet (Got \\x00)")
+
+        self.rfxcom.handle_packets(packets)
+
+    def connection_lost(self, exc):
+
+        self.transport = None
+
+        if exc is not None:
+            self.rfxcom.log.error("Lost connection to the RFXtrx: %s", exc)
+
+
+class AsyncioProtocolTransport(AsyncioTransport):
+    """An asyncio transport for the RFXtrx which never blocks the event loop.
+
+    It is used in the same way as
+    :py:class:`rfxcom.transport.AsyncioTransport`, but the serial device is
+    opened in non-blocking mode and read through an :py:class:`RFXtrxProtocol`
+    while writes are queued on a :py:class:`SerialTransport`.
+    """
+
+    def __init__(self, device, loop, callback=None, callbacks=None,
+                 SerialClass=None, **kwargs):
+
+        if isinstance(device, str):
+
+            if SerialClass is None:
+                SerialClass = Serial
+
+            # A timeout of 0 opens the device in non-blocking mode.
+            device = SerialClass(device, 38400, timeout=0)
+
+        super().__init__(device, loop, callback=callback, callbacks=callbacks,
+                         **kwargs)
+
+        self.serial_transport = SerialTransport(loop, self.dev,
+                                                RFXtrxProtocol(self))
+
+    def start_reading(self):
+        """The serial transport is attached to the loop when it is created,
+        this only needs to make sure it hasn't been paused.
+        """
+        self.serial_transport.resume_reading()
+
+    def write_packet(self, pkt):
+        self.serial_transport.write(pkt)
+
+    def write_drained(self, callback):
+        """Packets the device can't take straight away are buffered by the
+        serial transport, so a write is only done once its buffer is empty.
+        """
+        return self.serial_transport.call_when_drained(callback)
+
+    def close(self):
+        """Close the serial transport and the device, and shut down the thread
+        pool of the blocking callbacks without waiting for them.
+        """
+        self._stop_flushing_recorder()
+        self.serial_transport.close()
+        self.shutdown_executor(wait=False)
@@ -0,0 +1,251 @@
+"""
+rfxcom.transport.registry
+=========================
+
+"""
+
+from collections import OrderedDict
+from time import time
+
+
+class Sensor:
+    """The state of a sensor in a :py:class:`SensorRegistry`, from the last
+    packet received from it.
+    """
+
+    __slots__ = ('key', 'id', 'packet_type', 'packet_subtype',
+                 'battery_level', 'signal_level', 'last_seen', 'data')
+
+    def __init__(self, key):
+
+        #: The ``device_key`` of the packets from the sensor, which starts
+        #: with the packet type and subtype.
+        self.key = key
+        self.packet_type, self.packet_subtype = key[:2]
+
+        #: The ID of the sensor as returned by ``parse``, for example
+        #: ``"0x2EB2"``.
+        self.id = None
+
+        #: The battery level, or None if the sensor doesn't report it.
+        self.battery_level = None
+
+        #: The signal level, or None if the sensor doesn't report it.
+        self.signal_level = None
+
+        #: The time the last packet was received.
+        self.last_seen = None
+
+        #: The fields of the last packet, as returned by ``parse``.
+        self.data = None
+
+    def __repr__(self):
+        return "<Sensor %s type:0x%02x subtype:0x%02x>" % (
+            self.id, self.packet_type, self.packet_subtype)
+
+
+def _index_add(index, value, key):
+    if value is not None:
+        index.setdefault(value, set()).add(key)
+
+
+def _index_discard(index, value, key):
+
+    keys = index.get(value)
+
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
+
+class SensorRegistry:
+    """Every sensor heard from, updated with each packet decoded. Sensors are
+    indexed by their ID, type, subtype, battery level, signal level and the
+    time they were last seen, so the queries only look at the sensors they
+    return rather than scanning all of them.
+
+    Pass a registry to a transport with the ``registry`` argument to have it
+    updated with every packet read.
+
+    :param clock: The function returning the current time, used for
+        ``last_seen``.
+    :type clock: callable
+    """
+
+    def __init__(self, clock=time):
+
+        self.clock = clock
+
+        # Sensors by key, ordered from the least to the most recently seen.
+        self._sensors = OrderedDict()
+
+        self._by_id = {}
+        self._by_type = {}
+        self._by_subtype = {}
+        self._by_battery = {}
+        self._by_signal = {}
+
+    def update(self, pkt, parser):
+        """Update the sensor that sent the packet. Packets that don't
+        identify the sensor, such as the status and transmitter responses of
+        the RFXtrx itself, are ignored.
+
+        :param pkt: The packet
+        :type pkt: bytearray
+
+        :param parser: The packet handler that loaded the packet
+        :type parser: rfxcom.protocol.base.BasePacketHandler
+
+        :return: The updated sensor, or None if the packet was ignored
+        :rtype: Sensor
+        """
+
+        key = parser.device_key(pkt)
+
+        if key is None:
+            return None
+
+        data = parser.data
+
+        sensor = self._sensors.pop(key, None)
+
+        if sensor is None:
+            sensor = Sensor(key)
+            _index_add(self._by_type, key[0], key)
+            _index_add(self._by_subtype, key[:2], key)
+
+        id_ = data.get('id')
+        battery_level = data.get('battery_level')
+        signal_level = data.get('signal_level')
+
+        if id_ != sensor.id:
+            _index_discard(self._by_id, sensor.id, key)
+            _index_add(self._by_id, id_, key)
+            sensor.id = id_
+
+        if battery_level != sensor.battery_level:
+            _index_discard(self._by_battery, sensor.battery_level, key)
+            _index_add(self._by_battery, battery_level, key)
+            sensor.battery_level = battery_level
+
+        if signal_level != sensor.signal_level:
+            _index_discard(self._by_signal, sensor.signal_level, key)
+            _index_add(self._by_signal, signal_level, key)
+            sensor.signal_level = signal_level
+
+        sensor.last_seen = self.clock()
+        sensor.data = data
+
+        self._sensors[key] = sensor
+        return sensor
+
+    def remove(self, key):
+        """Forget a sensor.
+
+        :param key: The key of the sensor, see :py:attr:`Sensor.key`
+        :type key: tuple
+        """
+
+        sensor = self._sensors.pop(key)
+
+        _index_discard(self._by_id, sensor.id, key)
+        _index_discard(self._by_type, key[0], key)
+        _index_discard(self._by_subtype, key[:2], key)
+        _index_discard(self._by_battery, sensor.battery_level, key)
+        _index_discard(self._by_signal, sensor.signal_level, key)
+
+    def get(self, key, default=None):
+        """Return the sensor with the key, see :py:attr:`Sensor.key`."""
+        return self._sensors.get(key, default)
+
+    def _lookup(self, keys):
+        sensors = self._sensors
+        return [sensors[key] for key in keys]
+
+    def by_id(self, id_):
+        """Return the sensors with the ID, as returned by ``parse``. Sensors
+        of different types can have the same ID.
+
+        :rtype: list
+        """
+        return self._lookup(self._by_id.get(id_, ()))
+
+    def by_type(self, packet_type, packet_subtype=None):
+        """Return the sensors of the packet type, and subtype if it is given.
+
+        :rtype: list
+        """
+
+        if packet_subtype is None:
+            keys = self._by_type.get(packet_type, ())
+        else:
+            keys = self._by_subtype.get((packet_type, packet_subtype), ())
+
+        return self._lookup(keys)
+
+    def low_battery(self, level):
+        """Return the sensors with a battery level at or below ``level``.
+
+        :rtype: list
+        """
+        return self._lookup(key for battery_level, keys in
+                            self._by_battery.items()
+                            if battery_level <= level for key in keys)
+
+    def weak_signal(self, level):
+        """Return the sensors with a signal level at or below ``level``.
+
+        :rtype: list
+        """
+        return self._lookup(key for signal_level, keys in
+                            self._by_signal.items()
+                            if signal_level <= level for key in keys)
+
+    def seen_since(self, timestamp):
+        """Return the sensors seen at or after the time, the most recently
+        seen first.
+
+        :rtype: list
+        """
+
+        sensors = []
+
+        for key in reversed(self._sensors):
+
+            sensor = self._sensors[key]
+
+            if sensor.last_seen < timestamp:
+                break
+
+            sensors.append(sensor)
+
+        return sensors
+
+    def not_seen_since(self, timestamp):
+        """Return the sensors last seen before the time, for example those
+        that are out of range or have a flat battery. The least recently seen
+        are first.
+
+        :rtype: list
+        """
+
+        sensors = []
+
+        for sensor in self._sensors.values():
+
+            if sensor.last_seen >= timestamp:
+                break
+
+            sensors.append(sensor)
+
+        return sensors
+
+    def __len__(self):
+        return len(self._sensors)
+
+    def __iter__(self):
+        return iter(self._sensors.values())
+
+    def __contains__(self, key):
+        return key in self._sensors
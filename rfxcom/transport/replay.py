@@ -0,0 +1,152 @@
+"""
+rfxcom.transport.replay
+=======================
+
+"""
+
+from time import monotonic, sleep
+
+from rfxcom.transport.base import BaseTransport
+from rfxcom.transport.capture import CaptureReader
+
+
+class ReplayTransport(BaseTransport):
+    """A transport that reads the packets from a capture file, recorded with
+    :py:class:`rfxcom.transport.capture.CaptureRecorder`, rather than from an
+    RFXtrx. The packets go through the same callbacks as they would when
+    read from the device, so it can be used to test and measure the code
+    handling them without hardware.
+
+    Packets are given to the callbacks with their original timing, divided
+    by ``speed``, or as fast as possible when ``speed`` is None. Packets
+    written are dropped.
+
+    :param path: The path of the capture file
+    :type path: str
+
+    :param speed: How many times faster than it was recorded the capture is
+        replayed, or None to replay it as fast as possible
+    :type speed: float
+
+    :param start: The wall clock time to start the replay at, or None to
+        start at the beginning of the capture
+    :type start: float
+
+    :param stop: The wall clock time to stop the replay at, or None to stop
+        at the end of the capture
+    :type stop: float
+    """
+
+    def __init__(self, path, callback=None, callbacks=None, speed=1,
+                 start=None, stop=None, clock=monotonic, sleep=sleep,
+                 **kwargs):
+
+        super().__init__(None, callback=callback, callbacks=callbacks,
+                         **kwargs)
+
+        self.speed = speed
+        self.clock = clock
+        self.sleep = sleep
+
+        self.reader = CaptureReader(path)
+        self._frames = self.reader.frames(start, stop)
+
+        #: True once every packet has been replayed.
+        self.finished = False
+
+        #: The number of packets replayed.
+        self.count = 0
+
+        # The time the first packet was received and was replayed.
+        self._first_timestamp = None
+        self._first_replayed = None
+
+        # The time the last packet was replayed.
+        self._last_replayed = None
+
+    def read(self):
+        """Wait until it is time to replay the next packet and handle it.
+
+        :return: A list containing the packet, which is empty once every
+            packet has been replayed.
+        :rtype: list
+        """
+
+        try:
+            timestamp, frame = next(self._frames)
+        except StopIteration:
+            self.finished = True
+            return []
+
+        # Callbacks are given a copy, like the packets read from a device,
+        # so the capture can be closed while they keep it.
+        pkt = bytearray(frame)
+        frame.release()
+
+        now = self.clock()
+
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+            self._first_replayed = now
+
+        elif self.speed:
+            delay = ((timestamp - self._first_timestamp) / self.speed -
+                     (now - self._first_replayed))
+
+            if delay > 0:
+                self.sleep(delay)
+
+        packets = [pkt]
+        self.handle_packets(packets)
+
+        self.count += 1
+        self._last_replayed = self.clock()
+
+        return packets
+
+    def run(self):
+        """Replay every packet in the capture.
+
+        :return: The number of packets replayed per second
+        :rtype: float
+        """
+
+        while not self.finished:
+            self.read()
+
+        self.log.info("Replayed %s packets, %.1f per second", self.count,
+                      self.fps)
+
+        return self.fps
+
+    @property
+    def elapsed(self):
+        """The number of seconds between replaying the first packet and the
+        last.
+        """
+
+        if self._first_replayed is None:
+            return 0
+
+        return self._last_replayed - self._first_replayed
+
+    @property
+    def fps(self):
+        """The number of packets replayed per second, from the first packet
+        to the last.
+        """
+
+        elapsed = self.elapsed
+
+        if not elapsed:
+            return 0
+
+        return self.count / elapsed
+
+    def write_packet(self, pkt):
+        """Packets written are dropped, there is no device."""
+
+    def close(self):
+        """Close the capture."""
+        self._frames.close()
+        self.reader.close()
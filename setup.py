@@ -27,7 +27,7 @@ def find_version(*parts):
     return finder.version
 
 install_requires = [
-    'pyserial>=2.7'
+    'pyserial>=3.0'
 ]
 
 # We only want to install asyncio on Python 3.3 - it comes with 3.4 and wont
@@ -46,6 +46,9 @@ setup(
     author_email='dougal@dougalmatthews.com',
     packages=find_packages(exclude=["tests*"]),
     install_requires=install_requires,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     include_package_data=True,
     platforms='any',
     classifiers=[
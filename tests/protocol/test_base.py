@@ -1,8 +1,14 @@
 from unittest import TestCase
 
-from rfxcom.protocol.base import BasePacketHandler
+from rfxcom.protocol.base import BasePacketHandler, Packet
+from rfxcom.protocol.elec import Elec
+from rfxcom.protocol.lighting1 import Lighting1
+from rfxcom.protocol.lighting3 import Lighting3
+from rfxcom.protocol.lighting4 import Lighting4
+from rfxcom.protocol.status import Status
+from rfxcom.protocol.wind import Wind
 from rfxcom.exceptions import InvalidPacketLength
-from rfxcom.exceptions import MalformedPacket
+from rfxcom.exceptions import MalformedPacket, RFXComException
 
 
 class BaseTestCase(TestCase):
@@ -44,3 +50,80 @@ class BaseTestCase(TestCase):
 
         self.assertEquals(self.parser.log.name,
                           'rfxcom.protocol.BasePacketHandler')
+
+    def test_handler_shared(self):
+
+        self.assertIs(Elec.handler(), Elec.handler())
+        self.assertIsInstance(Elec.handler(), Elec)
+        self.assertIsInstance(Wind.handler(), Wind)
+
+    def test_decode(self):
+
+        result = Elec.decode(self.data)
+
+        self.assertEquals(result, Elec().load(self.data))
+        self.assertFalse(hasattr(Elec.handler(), 'data'))
+
+    def test_dump_hex(self):
+
+        self.assertEquals(self.parser.dump_hex(self.data[4:6]), "0x2EB2")
+        self.assertEquals(self.parser.dump_hex(b''), "0x")
+
+    def test_sensor_id(self):
+
+        lighting1 = bytearray(b'\x07\x10\x00\x01\x41\x0A\x01\x40')
+        lighting3 = bytearray(b'\x08\x12\x00\x05\x02\x00\x09\x11\x40')
+
+        self.assertEquals(Elec.sensor_id(self.data), 0x2EB2)
+        self.assertEquals(Lighting1.sensor_id(lighting1), 0x410A)
+        self.assertEquals(Lighting3.sensor_id(lighting3), None)
+
+    def test_device_key(self):
+
+        lighting1 = bytearray(b'\x07\x10\x00\x01\x41\x0A\x01\x40')
+        lighting3 = bytearray(b'\x08\x12\x00\x05\x02\x00\x09\x11\x40')
+        lighting4 = bytearray(b'\x09\x13\x00\x05\x01\x02\x03\x01\x02\x40')
+        status = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                           b'\x2F\x01\x01\x00\x00')
+
+        self.assertEquals(Elec.device_key(self.data), (0x5A, 0x01, 0x2EB2))
+        self.assertEquals(Lighting1.device_key(lighting1),
+                          (0x10, 0x00, 0x41, 0x0A))
+        self.assertEquals(Lighting3.device_key(lighting3),
+                          (0x12, 0x00, 0x02, 0x09))
+        self.assertIsNone(Lighting4.device_key(lighting4))
+        self.assertIsNone(Status.device_key(status))
+        self.assertIsNone(Packet.device_key(status))
+
+    def test_match(self):
+
+        elec = Elec()
+
+        self.assertTrue(elec.match(self.data))
+        self.assertFalse(elec.match(self.data[:-1]))
+        self.assertFalse(elec.match(bytearray(b'\x02\x5A\x01')))
+        self.assertFalse(elec.match(bytearray()))
+
+        self.data[1] = 0xFF
+        self.assertFalse(elec.match(self.data))
+
+        self.data[1] = 0x5A
+        self.data[2] = 0xFF
+        self.assertFalse(elec.match(self.data))
+
+    def test_match_same_as_validate(self):
+
+        samples = [bytearray([3, packet_type, sub_type, 0])
+                   for packet_type in range(256) for sub_type in range(4)]
+        samples += [self.data, self.data[:-1], self.data[:3]]
+
+        for Handler in (BasePacketHandler, Elec, Wind, Lighting1):
+            handler = Handler()
+            for data in samples:
+
+                try:
+                    valid = handler.validate_packet(data)
+                except RFXComException:
+                    valid = False
+
+                self.assertEquals(handler.match(data), valid)
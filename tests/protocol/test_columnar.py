@@ -0,0 +1,77 @@
+from unittest import TestCase, mock, skipIf
+
+from rfxcom.protocol import Elec, TempHumidity
+from rfxcom.protocol.columnar import decode_columns, numpy
+from tests.protocol.test_lazy import PACKETS
+
+
+@skipIf(numpy is None, "NumPy isn't installed")
+class ColumnarTestCase(TestCase):
+
+    def setUp(self):
+
+        self.buffer = b''.join(data for _, data in PACKETS)
+
+    def assertSameAsParse(self, columns, Handler, data, skip=()):
+
+        result = Handler().parse(bytearray(data))
+
+        for name, values in columns.items():
+
+            if name in skip:
+                continue
+
+            self.assertEquals(values.tolist(), [result[name]] * len(values))
+
+    def test_elec(self):
+
+        data = PACKETS[0][1]
+        columns = decode_columns(self.buffer * 3)[(0x5A, 0x01)]
+
+        self.assertSameAsParse(columns, Elec, data, skip=('id',))
+        self.assertEquals(columns['id'].tolist(), [0x2EB2] * 3)
+
+    def test_temphumidity(self):
+
+        data = PACKETS[12][1]
+        columns = decode_columns(self.buffer * 2)[(0x52, 0x02)]
+
+        self.assertSameAsParse(columns, TempHumidity, data,
+                               skip=('id', 'humidity_status'))
+        self.assertEquals(columns['id'].tolist(), [0x7002] * 2)
+        self.assertEquals(columns['humidity_status'].tolist(), [3] * 2)
+
+    def test_temperature_sign(self):
+
+        data = bytearray(PACKETS[12][1])
+        positive = bytearray(data)
+        positive[6] = 0x00
+
+        columns = decode_columns(bytes(data + positive))[(0x52, 0x02)]
+
+        self.assertEquals(columns['temperature'].tolist(), [
+            TempHumidity().parse(data)['temperature'],
+            TempHumidity().parse(positive)['temperature'],
+        ])
+        self.assertEquals(columns['temperature'].tolist(), [-16.7, 16.7])
+
+    def test_unsupported_skipped(self):
+
+        groups = decode_columns(self.buffer)
+
+        self.assertEquals(sorted(groups), [(0x52, 0x02), (0x5A, 0x01)])
+
+    def test_wrong_length_skipped(self):
+
+        data = b'\x05\x52\x02\x00\x00\x00'
+
+        self.assertEquals(decode_columns(data), {})
+
+
+class ColumnarWithoutNumpyTestCase(TestCase):
+
+    def test_numpy_required(self):
+
+        with mock.patch('rfxcom.protocol.columnar.numpy', None):
+            with self.assertRaises(ImportError):
+                decode_columns(PACKETS[0][1])
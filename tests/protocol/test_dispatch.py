@@ -0,0 +1,146 @@
+from unittest import TestCase
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.protocol import (DEFAULT_HANDLER, DISPATCH_TABLE, HANDLERS, Elec,
+                             Packet, Status, Temperature, Wind, decode_packet,
+                             parse_many)
+from rfxcom.protocol.dispatch import (build_dispatch_table, iter_frames,
+                                      packet_key)
+from tests.protocol.test_lazy import PACKETS
+
+
+class DispatchTestCase(TestCase):
+
+    def setUp(self):
+
+        self.data = bytearray(b'\x10\x56\x01\x05\x1C\x00\x00\xA2\x00'
+                              b'\x02\x01\xB2\x00\x0C\x46\xA8\x98')
+
+    def test_packet_key(self):
+
+        self.assertEquals(packet_key(self.data), (0x56, 0x01))
+
+    def test_packet_key_bad_length(self):
+
+        self.assertEquals(packet_key(self.data[:-1]), None)
+        self.assertEquals(packet_key(self.data[:1]), None)
+        self.assertEquals(packet_key(bytearray(b'\x02\x01\x01')), None)
+
+    def test_lookup(self):
+
+        self.assertEquals(DISPATCH_TABLE[packet_key(self.data)], Wind)
+        self.assertEquals(DISPATCH_TABLE[(0x01, 0xFF)], Status)
+        self.assertEquals(DEFAULT_HANDLER, Packet)
+
+    def test_same_as_scan(self):
+
+        subtypes = list(range(0x10)) + [0xFF]
+
+        for packet_type in range(256):
+            for sub_type in subtypes:
+
+                # Long enough for the layout of every handler.
+                data = bytearray([31, packet_type, sub_type, 0] + [0] * 28)
+
+                for Handler in HANDLERS:
+                    if Handler().can_handle(data):
+                        break
+
+                found = DISPATCH_TABLE.get(packet_key(data), DEFAULT_HANDLER)
+                self.assertEquals(found, Handler)
+
+    def test_first_handler_wins(self):
+
+        table, fallback = build_dispatch_table([
+            (Elec, 'first'),
+            (Elec, 'second'),
+        ])
+
+        self.assertEquals(table[(0x5A, 0x01)], 'first')
+        self.assertEquals(fallback, None)
+
+    def test_catch_all_ends_table(self):
+
+        table, fallback = build_dispatch_table([
+            (Elec, 'elec'),
+            (Packet, 'packet'),
+            (Wind, 'wind'),
+        ])
+
+        self.assertEquals(table[(0x5A, 0x01)], 'elec')
+        self.assertNotIn((0x56, 0x01), table)
+        self.assertEquals(fallback, 'packet')
+
+
+class ParseManyTestCase(TestCase):
+
+    def setUp(self):
+
+        self.buffer = b''.join(data for _, data in PACKETS)
+
+    def test_iter_frames(self):
+
+        frames = list(iter_frames(self.buffer))
+
+        self.assertEquals([bytes(frame) for frame in frames],
+                          [data for _, data in PACKETS])
+
+        for frame in frames:
+            self.assertIsInstance(frame, memoryview)
+            self.assertIs(frame.obj, self.buffer)
+
+    def test_iter_frames_padding_and_partial(self):
+
+        buffer = b'\x00\x00' + PACKETS[0][1] + b'\x00' + PACKETS[1][1][:-1]
+
+        self.assertEquals([bytes(frame) for frame in iter_frames(buffer)],
+                          [PACKETS[0][1]])
+
+    def test_parse_many(self):
+
+        results = list(parse_many(self.buffer))
+
+        self.assertEquals(results, [
+            Handler().parse(bytearray(data)) for Handler, data in PACKETS])
+
+    def test_parse_many_memoryview(self):
+
+        buffer = bytearray(self.buffer)
+
+        self.assertEquals(list(parse_many(memoryview(buffer))),
+                          list(parse_many(self.buffer)))
+
+    def test_parse_many_unknown(self):
+
+        result, = parse_many(b'\x04\xFF\x01\x00\x02')
+
+        self.assertEquals(result['packet_type'], 0xFF)
+        self.assertEquals(bytes(result['packet']), b'\x04\xFF\x01\x00\x02')
+
+    def test_parse_many_short_packet(self):
+
+        short = b'\x05\x50\x06\x02\xAE\x01'
+        buffer = PACKETS[0][1] + short + b''.join(
+            data for _, data in PACKETS[1:4])
+
+        results = list(parse_many(buffer))
+
+        self.assertEquals(len(results), 5)
+        self.assertEquals(bytes(results[1]['packet']), short)
+        self.assertEquals(results[2:], [Handler().parse(bytearray(data))
+                                        for Handler, data in PACKETS[1:4]])
+
+    def test_decode_packet(self):
+
+        data = bytearray(PACKETS[0][1])
+
+        self.assertEquals(decode_packet(data), PACKETS[0][0]().parse(data))
+
+    def test_short_packet_rejected(self):
+
+        short = bytearray(b'\x05\x50\x06\x02\xAE\x01')
+
+        self.assertFalse(Temperature().match(short))
+
+        with self.assertRaises(InvalidPacketLength):
+            Temperature().validate_packet(short)
@@ -30,7 +30,7 @@ class ElecTestCase(TestCase):
             'sequence_number': 0,
             'packet_subtype': 1,
             'packet_subtype_name': "CM119/160",
-            'total_watts': 920825.1947099693,
+            'total_watts': 920824.5195961836,
             'battery_level': 9,
             'signal_level': 6
         })
@@ -62,18 +62,6 @@ class ElecTestCase(TestCase):
         with self.assertRaises(UnknownPacketSubtype):
             self.parser.validate_packet(self.data)
 
-    def test_bytes_to_uint_32(self):
-
-        data = self.data[7:11]
-
-        self.assertEqual(self.parser._bytes_to_uint_32(data), 692)
-
-    def test_bytes_to_uint_48(self):
-
-        data = self.data[11:16]
-
-        self.assertEquals(self.parser._bytes_to_uint_48(data), 205957288)
-
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Elec')
@@ -0,0 +1,110 @@
+from unittest import TestCase, mock
+
+from rfxcom.protocol.fields import Layout, reverse, uint
+from tests.protocol.test_lazy import PACKETS
+
+
+class LayoutTestCase(TestCase):
+
+    def setUp(self):
+
+        self.layout = Layout(
+            ('id', '2s'),
+            ('temperature', 'H'),
+            ('rssi', 'B'),
+        )
+        self.data = bytearray(b'\x08\x50\x06\x02\xAE\x01\x80\x55\x59')
+
+    def test_size(self):
+
+        self.assertEquals(self.layout.size, 9)
+
+    def test_handler_layouts_match_packets(self):
+
+        for Handler, data in PACKETS:
+            self.assertEquals(Handler.LAYOUT.size, len(data))
+
+    def test_unpack(self):
+
+        self.assertEquals(self.layout.unpack_from(self.data),
+                          (8, 0x50, 6, 2, b'\xAE\x01', 0x8055, 0x59))
+
+    def test_index(self):
+
+        self.assertEquals(self.layout.index('sequence_number'), 3)
+        self.assertEquals(self.layout.index('rssi'), 6)
+
+    def test_pack(self):
+
+        self.assertEquals(self.layout.pack(packet_length=8, id="0xAE01",
+                                           temperature=0x8055),
+                          b'\x08\x00\x00\x00\xAE\x01\x80\x55\x00')
+        self.assertEquals(self.layout.pack(id=0xAE01),
+                          self.layout.pack(id=b'\xAE\x01'))
+
+    def test_header(self):
+
+        values = self.layout.unpack_from(self.data)
+        header = dict(
+            (name, decode(values)) for name, decode in
+            self.layout.header({0x50: 'Temperature'}, {0x06: 'TH6'}))
+
+        self.assertEquals(header, {
+            'packet_length': 8,
+            'packet_type': 0x50,
+            'packet_type_name': 'Temperature',
+            'packet_subtype': 6,
+            'packet_subtype_name': 'TH6',
+            'sequence_number': 2,
+        })
+
+    def test_decoders(self):
+
+        values = self.layout.unpack_from(self.data)
+
+        self.assertEquals(self.layout.hex_id('id')(values), '0xAE01')
+        self.assertEquals(self.layout.int_id('id')(values), 0xAE01)
+        self.assertEquals(self.layout.temperature('temperature')(values),
+                          -8.5)
+        self.assertEquals(self.layout.signal('rssi')(values), 5)
+        self.assertEquals(self.layout.battery('rssi')(values), 9)
+        self.assertEquals(self.layout.scaled('rssi', 2)(values), 0xB2)
+        self.assertEquals(
+            self.layout.combine(lambda a, b: a + b, 'rssi', 'rssi')(values),
+            0xB2)
+
+    def test_hex_id_cached(self):
+
+        decode = self.layout.hex_id('id')
+        values = self.layout.unpack_from(self.data)
+
+        self.assertIs(decode(values), decode(values))
+
+    def test_hex_id_cache_bounded(self):
+
+        decode = self.layout.hex_id('id')
+
+        first = (0, 0, 0, 0, b'\x00\x01')
+        second = (0, 0, 0, 0, b'\x00\x02')
+
+        with mock.patch('rfxcom.protocol.fields.HEX_ID_CACHE_SIZE', 1):
+            self.assertIs(decode(first), decode(first))
+            self.assertEquals(decode(second), '0x0002')
+            self.assertIsNot(decode(second), decode(second))
+
+    def test_positive_temperature(self):
+
+        self.data[6] = 0x00
+
+        values = self.layout.unpack_from(self.data)
+
+        self.assertEquals(self.layout.temperature('temperature')(values), 8.5)
+
+    def test_uint(self):
+
+        self.assertEquals(uint(b'\x01\x02\x03'), 66051)
+
+    def test_reverse(self):
+
+        self.assertEquals(reverse({0x00: "Off", 0x01: "On"}),
+                          {"Off": 0x00, "On": 0x01})
@@ -0,0 +1,107 @@
+from unittest import TestCase, mock
+
+from rfxcom.exceptions import UnknownPacketType
+from rfxcom.protocol import (Elec, Humidity, Lighting1, Lighting2, Lighting3,
+                             Lighting4, Lighting5, Lighting6, Packet, Rain,
+                             Status, Temperature, TempHumidity,
+                             TempHumidityBaro, Transmitter, UltraViolet, Wind)
+from rfxcom.protocol.lazy import LazyPacket
+
+PACKETS = [
+    (Elec, b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00\x02\xB4\x00\x00\x0C\x46'
+           b'\xA8\x11\x69'),
+    (Humidity, b'\x08\x51\x01\x12\x70\x05\x26\x03\x59'),
+    (Lighting1, b'\x07\x10\x00\x01\x41\x0A\x01\x40'),
+    (Lighting2, b'\x0B\x11\x00\x01\x01\x11\xF3\x42\x0A\x01\x0F\x70'),
+    (Lighting3, b'\x08\x12\x00\x05\x02\x00\x09\x11\x40'),
+    (Lighting4, b'\x09\x13\x00\x05\x01\x02\x03\x01\x02\x40'),
+    (Lighting5, b'\x0A\x14\x00\xAD\xF3\x94\xAB\x01\x01\x00\x60'),
+    (Lighting6, b'\x0B\x15\x00\x05\x01\x02\x03\x01\x02\x05\x06\x40'),
+    (Rain, b'\x0B\x55\x01\x11\x70\x02\x00\xA7\x00\x00\x05\x69'),
+    (Rain, b'\x0B\x55\x02\x05\x70\x03\x00\x67\x00\x01\x05\x69'),
+    (Rain, b'\x0B\x55\x06\x05\x70\x03\x00\x67\x00\x01\x05\x69'),
+    (Temperature, b'\x08\x50\x06\x02\xAE\x01\x80\x55\x59'),
+    (TempHumidity, b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03\x89'),
+    (TempHumidityBaro, b'\x0D\x54\x01\x11\x70\x02\x80\x25\x2D\x03\x03\xF3'
+                       b'\x02\x89'),
+    (Transmitter, b'\x04\x02\x01\x07\x00'),
+    (UltraViolet, b'\x09\x57\x01\x00\x2E\xB2\x03\x05\x00\x69'),
+    (UltraViolet, b'\x09\x57\x03\x00\x2E\xB2\x03\x00\x16\x69'),
+    (Wind, b'\x10\x56\x01\x05\x1C\x00\x00\xA2\x00\x02\x01\xB2\x00\x0C\x46'
+           b'\xA8\x98'),
+    (Wind, b'\x10\x56\x04\x02\xB2\x06\x00\x0F\x00\x09\x01\x0E\x80\x0F\x02'
+           b'\x09\x56'),
+    (Wind, b'\x10\x56\x05\x09\x5D\x01\x01\x00\x00\x02\x01\x18\x00\x0C\x46'
+           b'\xA8\x64'),
+]
+
+
+class LazyPacketTestCase(TestCase):
+
+    def test_same_as_parse(self):
+
+        for Handler, data in PACKETS:
+
+            view = Handler.view(bytearray(data))
+            result = Handler().parse(bytearray(data))
+
+            self.assertIsInstance(view, LazyPacket)
+            self.assertEquals(view, result)
+            self.assertEquals(dict(view), result)
+            self.assertEquals(len(view), len(result))
+            self.assertEquals(set(view), set(result))
+
+    def test_decode_on_access(self):
+
+        layout = mock.Mock()
+        layout.unpack_from.return_value = (1, 2)
+        decoder = mock.Mock(return_value=42)
+        view = LazyPacket(layout, b'', {'value': decoder, 'other': decoder})
+
+        self.assertFalse(decoder.called)
+        self.assertIn('value', view)
+        self.assertFalse(decoder.called)
+        self.assertFalse(layout.unpack_from.called)
+
+        self.assertEquals(view['value'], 42)
+        self.assertEquals(view['value'], 42)
+        decoder.assert_called_once_with((1, 2))
+
+        self.assertEquals(view['other'], 42)
+        layout.unpack_from.assert_called_once_with(b'')
+
+    def test_missing_field(self):
+
+        view = Wind.view(bytearray(PACKETS[-1][1]))
+
+        self.assertNotIn('temperature', view)
+        self.assertEquals(view.get('temperature'), None)
+
+        with self.assertRaises(KeyError):
+            view['temperature']
+
+    def test_validate(self):
+
+        data = bytearray(PACKETS[0][1])
+        data[1] = 0xFF
+
+        with self.assertRaises(UnknownPacketType):
+            Elec.view(data)
+
+    def test_load_lazy(self):
+
+        parser = Elec()
+        data = bytearray(PACKETS[0][1])
+        result = parser.load(data, lazy=True)
+
+        self.assertIsInstance(result, LazyPacket)
+        self.assertEquals(parser.data['current_watts'], 692)
+        self.assertEquals(str(parser), "<Elec ID:0x2EB2>")
+
+    def test_without_fields(self):
+
+        data = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                         b'\x2F\x01\x01\x00\x00')
+
+        self.assertIsInstance(Status.view(data), dict)
+        self.assertIsInstance(Packet.view(data), dict)
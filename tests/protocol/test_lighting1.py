@@ -91,3 +91,17 @@ class Lighting1TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting1')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, 'A', 10, 'On')
+
+        self.assertEquals(data, b'\x07\x10\x00\x00\x41\x0A\x01\x00')
+        self.assertEquals(self.parser.load(bytearray(data))['command_text'],
+                          "On")
+
+    def test_encode_codes(self):
+
+        data = self.parser.encode(0x01, 0x42, 3, 0x00)
+
+        self.assertEquals(data, b'\x07\x10\x01\x00\x42\x03\x00\x00')
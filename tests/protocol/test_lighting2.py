@@ -2,8 +2,8 @@ from unittest import TestCase
 
 from rfxcom.protocol.lighting2 import Lighting2
 
-from rfxcom.exceptions import (InvalidPacketLength, UnknownPacketSubtype,
-                               UnknownPacketType)
+from rfxcom.exceptions import (InvalidPacketLength, UnknownCommand,
+                               UnknownPacketSubtype, UnknownPacketType)
 
 
 class Lighting2TestCase(TestCase):
@@ -94,3 +94,45 @@ class Lighting2TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting2')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, "0x0111F342", 10, "Set level", 15)
+
+        self.assertEquals(data, b'\x0B\x11\x00\x00\x01\x11\xF3\x42'
+                                b'\x0A\x02\x0F\x00')
+
+        result = self.parser.load(bytearray(data))
+        self.assertEquals(result['id'], "0x0111F342")
+        self.assertEquals(result['command_text'], "Set level")
+        self.assertEquals(result['dim_level'], 100)
+
+    def test_encode_reuses_template(self):
+
+        on = self.parser.encode(0x00, 0x0111F342, 10, "On")
+        off = self.parser.encode(0x00, 0x0111F342, 10, "Off")
+
+        self.assertEquals(on[9], 0x01)
+        self.assertEquals(off[9], 0x00)
+        self.assertEquals(on[:9], off[:9])
+        self.assertIs(self.parser.template(0x00, 0x0111F342, 10),
+                      self.parser.template(0x00, 0x0111F342, 10))
+
+    def test_encode_leaves_template(self):
+
+        template = bytes(self.parser.template(0x00, 0x0111F342, 10))
+
+        self.parser.encode(0x00, 0x0111F342, 10, "Set level", 15)
+
+        self.assertEquals(self.parser.template(0x00, 0x0111F342, 10),
+                          template)
+
+    def test_encode_unknown_command(self):
+
+        with self.assertRaises(UnknownCommand):
+            self.parser.encode(0x01, 0x0111F342, 10, "Set level")
+
+    def test_encode_unknown_sub_type(self):
+
+        with self.assertRaises(UnknownPacketSubtype):
+            self.parser.encode(0xFF, 0x0111F342, 10, "On")
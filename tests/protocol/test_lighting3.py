@@ -63,3 +63,11 @@ class Lighting3TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting3')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, 0x02, 0x0201, 'Off')
+
+        self.assertEquals(data, b'\x08\x12\x00\x00\x02\x02\x01\x1A\x00')
+        self.assertEquals(self.parser.load(bytearray(data))['command_text'],
+                          'Off')
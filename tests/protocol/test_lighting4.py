@@ -27,7 +27,7 @@ class Lighting4TestCase(TestCase):
             'packet_subtype_name': "PT2262",
             'sequence_number': 5,
             'command': 66051,
-            'pulse': 1024,
+            'pulse': 258,
             'signal_level': 4
         })
 
@@ -61,3 +61,19 @@ class Lighting4TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting4')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, 0x010203, 258)
+
+        self.assertEquals(data, b'\x09\x13\x00\x00\x01\x02\x03\x01\x02\x00')
+
+        result = self.parser.load(bytearray(data))
+        self.assertEquals(result['command'], 0x010203)
+        self.assertEquals(result['pulse'], 258)
+
+    def test_encode_default_pulse(self):
+
+        data = self.parser.encode(0x00, 0x010203)
+
+        self.assertEquals(self.parser.load(bytearray(data))['pulse'], 350)
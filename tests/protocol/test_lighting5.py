@@ -65,3 +65,14 @@ class Lighting5TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting5')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, "0xF394AB", 1, "set level", 0x1F)
+
+        self.assertEquals(data, b'\x0A\x14\x00\x00\xF3\x94\xAB'
+                                b'\x01\x10\x1F\x00')
+
+        result = self.parser.load(bytearray(data))
+        self.assertEquals(result['id'], "0xF394AB")
+        self.assertEquals(result['command_text'], "set level")
@@ -66,3 +66,14 @@ class Lighting6TestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Lighting6')
+
+    def test_encode(self):
+
+        data = self.parser.encode(0x00, 0xF394, 0x41, 1, 'Off', 2)
+
+        self.assertEquals(data, b'\x0B\x15\x00\x00\xF3\x94\x41\x01'
+                                b'\x01\x02\x00\x00')
+
+        result = self.parser.load(bytearray(data))
+        self.assertEquals(result['id'], "0xF394")
+        self.assertEquals(result['command_seqnr'], 2)
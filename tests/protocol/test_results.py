@@ -0,0 +1,69 @@
+import pickle
+from unittest import TestCase
+
+from rfxcom.exceptions import UnknownPacketType
+from rfxcom.protocol.elec import Elec, ElecResult
+from rfxcom.protocol.results import PacketResult
+from rfxcom.protocol.status import Status
+from rfxcom.protocol.wind import Wind, WindResult
+
+from tests.protocol.test_lazy import PACKETS
+
+
+class PacketResultTestCase(TestCase):
+
+    def test_same_as_parse(self):
+
+        for Handler, data in PACKETS:
+
+            result = Handler.decode_result(bytearray(data))
+
+            self.assertIsInstance(result, PacketResult)
+            self.assertIs(type(result), Handler.result_class())
+            self.assertEquals(result.to_dict(),
+                              Handler().parse(bytearray(data)))
+
+    def test_attributes(self):
+
+        result = Elec.decode_result(bytearray(PACKETS[0][1]))
+
+        self.assertIsInstance(result, ElecResult)
+        self.assertEquals(result.id, "0x2EB2")
+        self.assertEquals(result.current_watts, 692)
+        self.assertFalse(hasattr(result, '__dict__'))
+
+    def test_missing_field(self):
+
+        result = Wind.decode_result(bytearray(PACKETS[-1][1]))
+
+        self.assertIsInstance(result, WindResult)
+        self.assertFalse(hasattr(result, 'temperature'))
+        self.assertNotIn('temperature', result.to_dict())
+
+    def test_equality(self):
+
+        data = bytearray(PACKETS[0][1])
+
+        self.assertEquals(Elec.decode_result(data), Elec.decode_result(data))
+        self.assertEquals(Elec.decode_result(data), Elec.decode(data))
+
+    def test_no_fields(self):
+
+        data = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                         b'\x2F\x01\x01\x00\x00')
+
+        self.assertEquals(Status.decode_result(data), Status.decode(data))
+
+    def test_pickle(self):
+
+        result = Wind.decode_result(bytearray(PACKETS[-2][1]))
+
+        self.assertEquals(pickle.loads(pickle.dumps(result)), result)
+
+    def test_validate(self):
+
+        data = bytearray(PACKETS[0][1])
+        data[1] = 0xFF
+
+        with self.assertRaises(UnknownPacketType):
+            Elec.decode_result(data)
@@ -1,6 +1,8 @@
-from unittest import TestCase
+from logging import getLogger
+from unittest import TestCase, mock
 
-from rfxcom.protocol.status import Status
+from rfxcom.protocol import MODE_PACKET
+from rfxcom.protocol.status import Status, enabled_protocols
 
 from rfxcom.exceptions import (InvalidPacketLength, UnknownPacketSubtype,
                                UnknownPacketType)
@@ -93,3 +95,30 @@ class StatusTestCase(TestCase):
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Status')
+
+    def test_log_enabled_protocols(self):
+
+        with self.assertLogs('rfxcom.protocol.Status', 'INFO') as logs:
+            self.parser.load(self.data)
+
+        self.assertIn('INFO:rfxcom.protocol.Status:AC                   : '
+                      'Enabled', logs.output)
+
+    def test_log_enabled_protocols_disabled(self):
+
+        log = getLogger('rfxcom.protocol.Status')
+
+        with mock.patch.object(log, 'isEnabledFor', return_value=False), \
+                mock.patch.object(log, 'info') as info:
+            result = self.parser.load(self.data)
+
+        self.assertFalse(info.called)
+        self.assertIn('AC', result['enabled_protocols'])
+
+    def test_enabled_protocols(self):
+
+        self.assertEquals(enabled_protocols(self.data),
+                          self.parser.parse(self.data)['enabled_protocols'])
+        self.assertEquals(enabled_protocols(MODE_PACKET), [
+            'AC', 'AD LightwaveRF', 'ARC', 'Hideki/UPM', 'HomeEasy EU',
+            'La Crosse', 'Oregon Scientific', 'X10'])
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from rfxcom.protocol.transmitter import Transmitter
+
+from rfxcom.exceptions import (InvalidPacketLength, UnknownPacketSubtype,
+                               UnknownPacketType)
+
+
+class TransmitterTestCase(TestCase):
+
+    def setUp(self):
+
+        self.data = bytearray(b'\x04\x02\x01\x07\x00')
+        self.parser = Transmitter()
+
+    def test_parse_ack(self):
+
+        self.assertTrue(self.parser.validate_packet(self.data))
+        self.assertTrue(self.parser.can_handle(self.data))
+        result = self.parser.load(self.data)
+
+        self.assertEquals(result, {
+            'packet_length': 4,
+            'packet_type': 2,
+            'packet_type_name': 'Receiver/Transmitter Message',
+            'sequence_number': 7,
+            'packet_subtype': 1,
+            'packet_subtype_name': 'Transmitter response',
+            'message': 0,
+            'message_text': 'ACK, transmit OK',
+            'acknowledged': True,
+        })
+
+        self.assertEquals(str(self.parser), "<Transmitter ID:None>")
+
+    def test_parse_nak(self):
+
+        self.data[4] = 0x02
+
+        result = self.parser.load(self.data)
+
+        self.assertEquals(result['message_text'],
+                          'NAK, transmitter did not lock on the requested '
+                          'transmit frequency')
+        self.assertFalse(result['acknowledged'])
+
+    def test_parse_receiver_error(self):
+
+        self.data[2] = 0x00
+
+        result = self.parser.load(self.data)
+
+        self.assertEquals(result['packet_subtype_name'],
+                          'Error, receiver did not lock')
+        self.assertEquals(result['message_text'], None)
+        self.assertFalse(result['acknowledged'])
+
+    def test_validate_bytes_short(self):
+
+        data = self.data[:1]
+
+        with self.assertRaises(InvalidPacketLength):
+            self.parser.validate_packet(data)
+
+    def test_validate_unkown_packet_type(self):
+
+        self.data[1] = 0xFF
+
+        self.assertFalse(self.parser.can_handle(self.data))
+
+        with self.assertRaises(UnknownPacketType):
+            self.parser.validate_packet(self.data)
+
+    def test_validate_unknown_sub_type(self):
+
+        self.data[2] = 0xEE
+
+        self.assertFalse(self.parser.can_handle(self.data))
+
+        with self.assertRaises(UnknownPacketSubtype):
+            self.parser.validate_packet(self.data)
+
+    def test_log_namer(self):
+
+        self.assertEquals(self.parser.log.name, 'rfxcom.protocol.Transmitter')
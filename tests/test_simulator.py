@@ -0,0 +1,105 @@
+import os
+import select
+from unittest import TestCase
+
+from rfxcom.protocol import MODE_PACKET, RESET_PACKET, STATUS_PACKET
+from rfxcom.simulator import SAMPLE_PACKETS, Simulator
+from rfxcom.transport.framer import PacketFramer
+
+
+class SimulatorTestCase(TestCase):
+
+    def setUp(self):
+
+        self.simulator = Simulator(rate=1000, burst=2, total=6)
+        self.simulator.start()
+
+        self.fd = os.open(self.simulator.port, os.O_RDWR | os.O_NOCTTY)
+        self.framer = PacketFramer()
+
+    def tearDown(self):
+
+        os.close(self.fd)
+        self.simulator.stop()
+
+    def read(self, count, timeout=2):
+
+        packets = []
+
+        while len(packets) < count:
+
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+
+            if not readable:
+                break
+
+            packets.extend(self.framer.feed(os.read(self.fd, 4096)))
+
+        return packets
+
+    def test_status(self):
+
+        os.write(self.fd, STATUS_PACKET)
+        status = self.read(1)[0]
+
+        self.assertEquals(status[:5], b'\x0D\x01\x00\x01\x02')
+        self.assertEquals(status[7:10], b'\x00\x0C\x2F')
+
+    def test_mode(self):
+
+        os.write(self.fd, MODE_PACKET)
+        status = self.read(1)[0]
+
+        self.assertEquals(status[4], 0x03)
+        self.assertEquals(status[5], MODE_PACKET[5])
+        self.assertEquals(status[7:10], MODE_PACKET[7:10])
+
+    def test_nothing_streamed_before_status(self):
+
+        os.write(self.fd, RESET_PACKET)
+
+        self.assertEquals(self.read(1, timeout=0.2), [])
+
+    def test_stream(self):
+
+        os.write(self.fd, STATUS_PACKET)
+        packets = self.read(7)
+
+        self.assertEquals(len(packets), 7)
+        self.assertEquals([pkt[3] for pkt in packets[1:]], list(range(6)))
+        self.assertEquals(packets[1][4:], SAMPLE_PACKETS[0][4:])
+        self.assertEquals(packets[2][4:], SAMPLE_PACKETS[1][4:])
+        self.assertEquals(self.read(1, timeout=0.2), [])
+
+    def test_acknowledge(self):
+
+        os.write(self.fd, b'\x0B\x11\x00\x07\x01\x11\xF3\x42\x0A\x01\x0F\x00')
+
+        self.assertEquals(self.read(1)[0], b'\x04\x02\x01\x07\x00')
+
+
+class SimulatorStreamTestCase(TestCase):
+
+    def stream(self, count, **kwargs):
+
+        simulator = Simulator(**kwargs)
+        stream = simulator._stream()
+        packets = [next(stream) for _ in range(count)]
+        simulator.stop()
+
+        return packets
+
+    def test_repeats(self):
+
+        packets = self.stream(4, packets=SAMPLE_PACKETS[:2], repeats=2)
+
+        self.assertEquals([pkt[3] for pkt in packets], [0, 1, 2, 3])
+        self.assertEquals(packets[0][4:], packets[1][4:])
+        self.assertNotEquals(packets[1][4:], packets[2][4:])
+
+    def test_sensors(self):
+
+        packets = self.stream(4, packets=SAMPLE_PACKETS[:2], sensors=2)
+
+        self.assertEquals(packets[2][5], (SAMPLE_PACKETS[0][5] + 1) % 256)
+        self.assertEquals(packets[2][6:], SAMPLE_PACKETS[0][6:])
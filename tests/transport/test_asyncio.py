@@ -1,7 +1,14 @@
 """Unit tests for rfxcom.asyncio.AsyncioTransport."""
+import asyncio
+import threading
+import time
 from unittest import TestCase, mock
 
-from rfxcom.transport import AsyncioTransport
+from rfxcom.exceptions import TransmitFailed, WriteQueueFull
+from rfxcom.protocol import (MODE_PACKET, RESET_PACKET, STATUS_PACKET,
+                             Packet, TempHumidity)
+from rfxcom.transport import AsyncioTransport, blocking
+from rfxcom.transport.asyncio import STATE_READY, STATE_WAITING_STATUS
 
 # It's a unittest, let's be flexible
 # pylint: disable=C0111,W0212,R0201
@@ -53,10 +60,12 @@ class AsyncioTransportTestCase(TestCase):
     @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendRESET')
     @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendSTATUS')
     @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendMODE')
+    @mock.patch('asyncio.wait_for')
     @mock.patch('asyncio.sleep')
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
-    def test_transport__setup(self, device, loop, sleep, mode, status, reset):
+    def test_transport__setup(self, device, loop, sleep, wait_for, mode,
+                              status, reset):
         unit = AsyncioTransport(device, loop, callback=mock.Mock())
         # reset mocks which have been 'called' by the constructor
         device.reset_mock()
@@ -108,16 +117,11 @@ class AsyncioTransportTestCase(TestCase):
 
         unit = AsyncioTransport(device, loop, callback=mock.Mock())
 
-        def fake_read(*x):
-            data = {
-                (): b'\x02',
-                (2, ): b'\x01\x01'
-            }
-            return data[x]
-        device.read.side_effect = fake_read
+        device.in_waiting = 3
+        device.read.return_value = b'\x02\x01\x01'
 
         expected_result = b'\x02\x01\x01'
-        self.assertEquals(unit.read(), expected_result)
+        self.assertEquals(unit.read(), [expected_result])
         callback.assert_called_once_with(expected_result)
 
     @mock.patch(
@@ -131,16 +135,11 @@ class AsyncioTransportTestCase(TestCase):
 
         unit = AsyncioTransport(device, loop, callback=mock.Mock())
 
-        def fake_read(*x):
-            data = {
-                (): b'\x02',
-                (2, ): b'\x01\x01'
-            }
-            return data[x]
-        device.read.side_effect = fake_read
+        device.in_waiting = 3
+        device.read.return_value = b'\x02\x01\x01'
 
         expected_result = b'\x02\x01\x01'
-        self.assertEquals(unit.read(), expected_result)
+        self.assertEquals(unit.read(), [expected_result])
         loop.call_soon_threadsafe.assert_called_once_with(
             AsyncioTransport._do_async_callback, cb, "test")
 
@@ -153,3 +152,438 @@ class AsyncioTransportTestCase(TestCase):
         unit.write(payload)
 
         device.write.assert_called_once_with(payload)
+
+
+class AsyncioTransportHandshakeTestCase(TestCase):
+
+    """The handshake made by AsyncioTransport._setup on an event loop."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.device = mock.Mock()
+        self.device.write.side_effect = self.device_write
+        self.status = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0E'
+                                b'\x2F\x00\x00\x00\x00')
+
+        with mock.patch('asyncio.async'):
+            self.unit = AsyncioTransport(self.device, self.loop,
+                                         callback=mock.Mock())
+
+        self.unit.start_reading = mock.Mock()
+        self.unit.status_timeout = 0.05
+
+    def tearDown(self):
+
+        self.loop.close()
+
+    def device_write(self, pkt):
+        """Answer the STATUS packet like the RFXtrx would."""
+
+        if pkt == STATUS_PACKET and self.status is not None:
+            self.assertEquals(self.unit.state, STATE_WAITING_STATUS)
+            self.loop.call_soon(self.unit.handle_packets, [self.status])
+
+    def written(self):
+        return [bytes(args[0]) for args, _ in self.device.write.call_args_list]
+
+    def test_mode_matches(self):
+
+        self.loop.run_until_complete(self.unit._setup())
+
+        self.assertEquals(self.written(), [RESET_PACKET, STATUS_PACKET])
+        self.assertEquals(self.unit.state, STATE_READY)
+
+    def test_mode_different_frequency(self):
+
+        # 433.42MHz rather than the 433.92MHz set by the mode packet.
+        self.status[5] = 0x54
+
+        self.loop.run_until_complete(self.unit._setup())
+
+        self.assertEquals(self.written(),
+                          [RESET_PACKET, STATUS_PACKET, MODE_PACKET])
+        self.assertEquals(self.unit.state, STATE_READY)
+
+    def test_mode_different(self):
+
+        self.status[9] = 0x2E
+
+        self.loop.run_until_complete(self.unit._setup())
+
+        self.assertEquals(self.written(),
+                          [RESET_PACKET, STATUS_PACKET, MODE_PACKET])
+        self.assertEquals(self.unit.state, STATE_READY)
+
+    def test_no_status(self):
+
+        self.status = None
+
+        self.loop.run_until_complete(self.unit._setup())
+
+        self.assertEquals(self.written(),
+                          [RESET_PACKET, STATUS_PACKET, MODE_PACKET])
+        self.assertEquals(self.unit.state, STATE_READY)
+        self.assertIsNone(self.unit._status_waiter)
+
+    def test_status_passed_to_callback(self):
+
+        self.loop.run_until_complete(self.unit._setup())
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+
+        packet = self.unit.default_callback.call_args[0][0]
+        self.assertEquals(packet.raw, self.status)
+
+
+class AsyncioTransportWriteQueueTestCase(TestCase):
+
+    """Writing through the queue of AsyncioTransport on an event loop."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.device = mock.Mock()
+        self.times = []
+        self.device.write.side_effect = lambda pkt: self.times.append(
+            self.loop.time())
+
+        with mock.patch('asyncio.async'):
+            self.unit = AsyncioTransport(self.device, self.loop,
+                                         callback=mock.Mock())
+
+    def tearDown(self):
+
+        self.loop.close()
+
+    def test_write_now(self):
+
+        future = self.unit.write(b'\x01\x01')
+
+        self.device.write.assert_called_once_with(b'\x01\x01')
+        self.assertTrue(future.done())
+
+    def test_write_gap(self):
+
+        self.unit.write_gap = 0.02
+
+        futures = [self.unit.write(bytes([1, n])) for n in range(3)]
+
+        self.assertEquals(self.device.write.call_count, 1)
+        self.assertEquals([f.done() for f in futures], [True, False, False])
+
+        self.loop.run_until_complete(
+            asyncio.wait(futures, loop=self.loop))
+
+        self.assertEquals(
+            [bytes(args[0]) for args, _ in self.device.write.call_args_list],
+            [b'\x01\x00', b'\x01\x01', b'\x01\x02'])
+
+        for earlier, later in zip(self.times, self.times[1:]):
+            self.assertGreaterEqual(later - earlier, 0.015)
+
+    def test_write_queue_full(self):
+
+        self.unit.write_gap = 1
+        self.unit.write_queue_size = 1
+
+        self.unit.write(b'\x01\x00')
+        self.unit.write(b'\x01\x01')
+
+        with self.assertRaises(WriteQueueFull):
+            self.unit.write(b'\x01\x02')
+
+    def test_write_cancelled(self):
+
+        self.unit.write_gap = 0.01
+
+        self.unit.write(b'\x01\x00')
+        self.unit.write(b'\x01\x01').cancel()
+        last = self.unit.write(b'\x01\x02')
+
+        self.loop.run_until_complete(last)
+
+        self.assertEquals(
+            [bytes(args[0]) for args, _ in self.device.write.call_args_list],
+            [b'\x01\x00', b'\x01\x02'])
+
+    def test_write_error(self):
+
+        self.device.write.side_effect = OSError()
+
+        future = self.unit.write(b'\x01\x00')
+
+        self.assertIsInstance(future.exception(), OSError)
+
+
+class AsyncioTransportTransmitTestCase(TestCase):
+
+    """Transmitting packets and waiting for the RFXtrx to acknowledge them."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.device = mock.Mock()
+        self.device.write.side_effect = self.device_write
+
+        # The message to answer each packet written with, None for no answer.
+        self.answers = []
+
+        with mock.patch('asyncio.async'):
+            self.unit = AsyncioTransport(self.device, self.loop,
+                                         callback=mock.Mock())
+
+        self.unit.ack_timeout = 0.05
+        self.packet = b'\x0B\x11\x00\x00\x01\x11\xF3\x42\x0A\x01\x0F\x00'
+
+    def tearDown(self):
+
+        self.loop.close()
+
+    def device_write(self, pkt):
+
+        message = self.answers.pop(0) if self.answers else 0x00
+
+        if message is not None:
+            ack = bytearray([0x04, 0x02, 0x01, pkt[3], message])
+            self.loop.call_soon(self.unit.handle_packets, [ack])
+
+    def written(self):
+        return [args[0] for args, _ in self.device.write.call_args_list]
+
+    def run_transmit(self, *args, **kwargs):
+
+        @asyncio.coroutine
+        def transmit():
+            return (yield from self.unit.transmit(*args, **kwargs))
+
+        return self.loop.run_until_complete(transmit())
+
+    def test_transmit_ack(self):
+
+        result = self.run_transmit(self.packet)
+
+        self.assertTrue(result['acknowledged'])
+        self.assertEquals(result['sequence_number'], 1)
+        self.assertEquals(self.written()[0][3], 1)
+        self.assertEquals(self.written()[0][4:], self.packet[4:])
+
+    def test_sequence_numbers(self):
+
+        @asyncio.coroutine
+        def transmit_all():
+            futures = [self.unit.transmit(self.packet) for _ in range(3)]
+            return (yield from asyncio.gather(*futures, loop=self.loop))
+
+        results = self.loop.run_until_complete(transmit_all())
+
+        self.assertEquals([r['sequence_number'] for r in results], [1, 2, 3])
+        self.assertEquals([pkt[3] for pkt in self.written()], [1, 2, 3])
+        self.assertEquals(self.unit._ack_waiters, {})
+
+    def test_sequence_number_wraps(self):
+
+        self.unit._sequence_number = 255
+        self.unit._ack_waiters[1] = mock.Mock()
+
+        self.assertEquals(self.unit._next_sequence_number(), 0)
+        self.assertEquals(self.unit._next_sequence_number(), 2)
+
+    def test_retry_timeout(self):
+
+        self.answers = [None, 0x00]
+
+        result = self.run_transmit(self.packet)
+
+        self.assertTrue(result['acknowledged'])
+        self.assertEquals([pkt[3] for pkt in self.written()], [1, 2])
+
+    def test_retry_no_lock(self):
+
+        self.answers = [0x02, 0x02]
+
+        with self.assertRaises(TransmitFailed):
+            self.run_transmit(self.packet)
+
+        self.assertEquals(len(self.written()), 2)
+
+    def test_nak_not_retried(self):
+
+        self.answers = [0x03]
+
+        with self.assertRaises(TransmitFailed):
+            self.run_transmit(self.packet, retries=3)
+
+        self.assertEquals(len(self.written()), 1)
+
+    def test_timeout(self):
+
+        self.answers = [None, None, None]
+
+        with self.assertRaises(TransmitFailed):
+            self.run_transmit(self.packet, timeout=0.01, retries=2)
+
+        self.assertEquals(len(self.written()), 3)
+        self.assertEquals(self.unit._ack_waiters, {})
+
+
+class AsyncioTransportRecorderTestCase(TestCase):
+
+    """Writing the packets buffered by the recorder when nothing is read."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.recorder = mock.Mock(flush_interval=0.01)
+
+        with mock.patch('asyncio.async'):
+            self.unit = AsyncioTransport(mock.Mock(), self.loop,
+                                         callback=mock.Mock(),
+                                         recorder=self.recorder)
+
+    def tearDown(self):
+
+        self.loop.close()
+
+    def test_flushed_when_quiet(self):
+
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+
+        self.assertGreater(self.recorder.flush_due.call_count, 2)
+
+    def test_close(self):
+
+        with mock.patch.object(self.loop, 'remove_reader'):
+            self.unit.close()
+
+        calls = self.recorder.flush_due.call_count
+        self.loop.run_until_complete(asyncio.sleep(0.05, loop=self.loop))
+
+        self.assertEquals(self.recorder.flush_due.call_count, calls)
+
+
+class AsyncioTransportBlockingCallbackTestCase(TestCase):
+
+    """Calling blocking callbacks in the thread pool, in order per sensor."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.calls = []
+        self.default = mock.Mock()
+
+        with mock.patch('asyncio.async'):
+            self.unit = AsyncioTransport(mock.Mock(), self.loop, callbacks={
+                TempHumidity: blocking(self.slow_callback),
+                '*': self.default,
+            })
+
+    def tearDown(self):
+
+        self.unit.shutdown_executor()
+        self.loop.close()
+
+    def slow_callback(self, parser):
+        # The first packet of each sensor is slower, so it would finish last
+        # if the packets weren't called in order.
+        time.sleep(0.05 if parser.data['sequence_number'] == 0 else 0)
+        self.calls.append((parser.data['id'], parser.data['sequence_number'],
+                           threading.current_thread()))
+
+    def packet(self, id_, sequence_number):
+        return bytearray([0x0A, 0x52, 0x02, sequence_number, id_, 0x02, 0x80,
+                          0xA7, 0x2D, 0x03, 0x89])
+
+    def run_callbacks(self):
+
+        @asyncio.coroutine
+        def wait():
+            while self.unit._blocking_pending:
+                yield from asyncio.sleep(0.01, loop=self.loop)
+
+        self.loop.run_until_complete(wait())
+
+    def test_called_in_thread_pool(self):
+
+        self.unit.do_callback(self.packet(0x70, 0))
+        self.run_callbacks()
+
+        self.assertEquals(len(self.calls), 1)
+        self.assertIsNot(self.calls[0][2], threading.current_thread())
+
+    def test_ordered_per_sensor(self):
+
+        for sequence_number in range(3):
+            self.unit.do_callback(self.packet(0x70, sequence_number))
+            self.unit.do_callback(self.packet(0x71, sequence_number))
+
+        self.run_callbacks()
+
+        for id_ in ("0x7002", "0x7102"):
+            self.assertEquals(
+                [seq for i, seq, _ in self.calls if i == id_], [0, 1, 2])
+
+        # The other sensor's packets didn't wait for the slow first packet.
+        self.assertEquals(len(self.calls), 6)
+        self.assertEquals(self.unit._blocking_pending, {})
+
+    def test_error_logged(self):
+
+        callback = mock.Mock(side_effect=ValueError)
+        self.unit._dispatch[0x52, 0x02] = TempHumidity, blocking(callback)
+
+        with mock.patch.object(self.unit.log, 'error') as error:
+            self.unit.do_callback(self.packet(0x70, 0))
+            self.unit.do_callback(self.packet(0x70, 1))
+            self.run_callbacks()
+
+        self.assertEquals(callback.call_count, 2)
+        self.assertEquals(error.call_count, 2)
+
+    def test_pending_bounded(self):
+
+        self.unit.callback_queue_size = 2
+
+        with mock.patch.object(self.unit.log, 'warning') as warning:
+            for sequence_number in range(5):
+                self.unit.do_callback(self.packet(0x70, sequence_number))
+
+        self.run_callbacks()
+
+        # One running and two waiting, the rest are dropped.
+        self.assertEquals([seq for _, seq, _ in self.calls], [0, 1, 2])
+        self.assertEquals(self.unit.dropped_callbacks, 2)
+        self.assertEquals(warning.call_count, 2)
+
+    def test_close(self):
+
+        self.unit.do_callback(self.packet(0x70, 0))
+        self.run_callbacks()
+
+        with mock.patch.object(self.loop, 'remove_reader') as remove_reader:
+            self.unit.close()
+
+        remove_reader.assert_called_once_with(self.unit.dev.fd)
+        self.unit.dev.close.assert_called_once_with()
+        self.assertIsNone(self.unit.executor)
+
+    def test_unknown_packet(self):
+
+        callback = mock.Mock()
+        self.unit.default_callback = blocking(callback)
+
+        self.unit.do_callback(bytearray(b'\x05\xEE\x01\x00\x01\x02'))
+        self.run_callbacks()
+
+        self.assertEquals(callback.call_count, 1)
+        self.assertIsInstance(callback.call_args[0][0], Packet)
+
+    def test_other_callbacks_on_loop(self):
+
+        status = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                           b'\x2F\x01\x01\x00\x00')
+
+        self.unit.do_callback(status)
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+
+        self.assertEquals(self.default.call_count, 1)
+        self.assertIsNone(self.unit.executor)
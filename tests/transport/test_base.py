@@ -4,7 +4,9 @@ from unittest.mock import Mock, ANY
 from serial import Serial
 
 from rfxcom.exceptions import PacketHandlerNotFound, RFXComException
-from rfxcom.protocol import Elec
+from rfxcom.protocol import (Elec, Lighting2, Lighting3, Packet, Temperature,
+                             Wind)
+from rfxcom.protocol.lazy import LazyPacket
 from rfxcom.transport.base import BaseTransport
 
 
@@ -84,6 +86,47 @@ class BaseTransportTestCase(TestCase):
             (_callback2, ANY)
         )
 
+    def test_get_callback_parser_default(self):
+
+        # Only a fallback, the parser is still chosen from the known handlers.
+        callback, parser = self.transport.get_callback_parser(
+            bytearray(self.elec_packet))
+
+        self.assertEquals(callback, _callback)
+        self.assertIsInstance(parser, Elec)
+
+        callback, parser = self.transport.get_callback_parser(
+            self.bytes_array)
+
+        self.assertEquals(callback, _callback)
+        self.assertIsInstance(parser, Packet)
+
+    def test_get_callback_parser_catch_all(self):
+
+        # Packet accepts everything, so the callbacks after it are unused.
+        parser = BaseTransport(device=self.device, callbacks={
+            Wind: _callback,
+            Packet: _callback2,
+            Elec: _callback,
+        })
+
+        callback, packet_parser = parser.get_callback_parser(
+            bytearray(self.elec_packet))
+
+        self.assertEquals(callback, _callback2)
+        self.assertIsInstance(packet_parser, Packet)
+
+    def test_get_callback_parser_lazy(self):
+
+        transport = BaseTransport(device=self.device, callback=_callback,
+                                  lazy=True)
+
+        callback, parser = transport.get_callback_parser(
+            bytearray(self.elec_packet))
+
+        self.assertIsInstance(parser.data, LazyPacket)
+        self.assertEquals(parser.data['current_watts'], 692)
+
     def test_no_packet_handler_found(self):
 
         # Setup - handler for Elec and fallback for the rest.
@@ -117,12 +160,153 @@ class BaseTransportTestCase(TestCase):
 
         callback_mock.assert_called_once()
 
+    def test_dedup_disabled(self):
+
+        self.assertIsNone(self.transport.dedup)
+
+    def test_dedup(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callback=callback_mock,
+                                  dedup_window=1)
+        repeat = bytearray(self.elec_packet)
+        repeat[3] = 0x01
+
+        transport.handle_packets([bytearray(self.elec_packet), repeat])
+
+        self.assertEquals(callback_mock.call_count, 1)
+        self.assertEquals(transport.dedup.suppressed, 1)
+
+    def test_handle_packets_unhandled(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callbacks={
+            Temperature: callback_mock,
+        })
+        temperature = bytearray(b'\x08\x50\x06\x02\xAE\x01\x80\x55\x59')
+
+        # The packet without a handler doesn't stop the one after it.
+        with self.assertRaises(PacketHandlerNotFound):
+            transport.handle_packets([
+                temperature,
+                bytearray(b'\x05\xEE\x01\x00\x01\x02'),
+                temperature,
+            ])
+
+        self.assertEquals(callback_mock.call_count, 2)
+
+    def test_changes_only(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callback=callback_mock,
+                                  changes_only=('current_watts', ))
+        changed = bytearray(self.elec_packet)
+        changed[8] = 0x01
+
+        transport.do_callback(bytearray(self.elec_packet))
+        transport.do_callback(bytearray(self.elec_packet))
+        transport.do_callback(changed)
+
+        self.assertEquals(callback_mock.call_count, 2)
+
+    def test_changes_only_unknown_packet(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callback=callback_mock,
+                                  changes_only=('temperature', ))
+        unknown = bytearray(b'\x05\xEE\x01\x00\x01\x02')
+
+        transport.do_callback(unknown)
+        transport.do_callback(unknown)
+
+        self.assertEquals(callback_mock.call_count, 2)
+
+    def test_changes_only_lighting_units(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callback=callback_mock,
+                                  changes_only=('command', ))
+
+        for unit_code in (1, 2, 3):
+            transport.do_callback(bytearray(
+                Lighting2.encode(0x00, 0x0111F342, unit_code, "On")))
+
+        self.assertEquals(callback_mock.call_count, 3)
+
+    def test_changes_only_lighting_systems(self):
+
+        callback_mock = Mock()
+        transport = BaseTransport(device=self.device, callback=callback_mock,
+                                  changes_only=('command', ))
+
+        transport.do_callback(bytearray(Lighting3.encode(0x00, 1, 1, "On")))
+        transport.do_callback(bytearray(Lighting3.encode(0x00, 2, 1, "On")))
+
+        self.assertEquals(callback_mock.call_count, 2)
+
+    def test_registry(self):
+
+        registry = Mock()
+        transport = BaseTransport(device=self.device, callback=_callback,
+                                  registry=registry)
+        packet = bytearray(self.elec_packet)
+
+        transport.do_callback(packet)
+
+        registry.update.assert_called_once_with(packet, ANY)
+
+    def test_recorder(self):
+
+        recorder = Mock()
+        transport = BaseTransport(device=self.device, callback=_callback,
+                                  recorder=recorder)
+        packet = bytearray(self.elec_packet)
+
+        transport.handle_packets([packet])
+
+        recorder.record.assert_called_once_with(packet)
+
+    def test_recorder_flushed_when_quiet(self):
+
+        recorder = Mock()
+        transport = BaseTransport(device=self.device, callback=_callback,
+                                  recorder=recorder)
+        self.device.in_waiting = 0
+        self.device.read.return_value = b''
+
+        transport.read()
+
+        recorder.flush_due.assert_called_once_with()
+
     def test_log(self):
 
         self.transport.log.debug("test")
         self.assertEquals(self.transport.log.name,
                           'rfxcom.transport.BaseTransport')
 
+    def test_packet_logging_disabled(self):
+
+        self.transport.log = Mock()
+        self.transport.log.isEnabledFor.return_value = False
+        self.transport.format_packet = Mock()
+
+        self.transport.write(self.elec_packet)
+        self.transport.handle_packets([bytearray(self.elec_packet)])
+
+        self.assertFalse(self.transport.format_packet.called)
+        self.assertFalse(self.transport.log.info.called)
+
+    def test_packet_logging_enabled(self):
+
+        packet = bytearray(self.elec_packet)
+
+        with self.assertLogs(self.transport.log, 'INFO') as logs:
+            self.transport.handle_packets([packet])
+
+        self.assertEquals(logs.output, [
+            'INFO:rfxcom.transport.BaseTransport:READ : %s' %
+            self.transport.format_packet(packet)])
+
     def test_write(self):
 
         self.transport.write(self.elec_packet)
@@ -131,23 +315,51 @@ class BaseTransportTestCase(TestCase):
 
     def test_reader(self):
 
-        call_map = {
-            (): [self.elec_packet[0], ],
-            (17, ): self.elec_packet[1:]
-        }
+        self.device.in_waiting = len(self.elec_packet)
+        self.device.read.return_value = self.elec_packet
+
+        self.assertEquals(self.transport.read(),
+                          [bytearray(self.elec_packet)])
+        self.device.read.assert_called_once_with(len(self.elec_packet))
+
+    def test_reader_waits_for_data(self):
+
+        self.device.in_waiting = 0
+        self.device.read.return_value = b''
+
+        self.assertEquals(self.transport.read(), [])
+        self.device.read.assert_called_once_with(1)
+
+    def test_reader_partial(self):
+
+        self.device.in_waiting = 5
+        self.device.read.return_value = self.elec_packet[:5]
+
+        self.assertEquals(self.transport.read(), [])
+
+        self.device.read.return_value = self.elec_packet[5:]
+
+        self.assertEquals(self.transport.read(),
+                          [bytearray(self.elec_packet)])
+
+    def test_reader_burst(self):
 
-        self.device.read = lambda *x: call_map[x]
+        data = b'\x00' + self.elec_packet + self.elec_packet + b'\x11\x5A'
+        self.device.in_waiting = len(data)
+        self.device.read.return_value = data
 
-        self.assertEquals(self.transport.read(), bytearray(self.elec_packet))
+        self.assertEquals(self.transport.read(),
+                          [bytearray(self.elec_packet)] * 2)
+        self.assertEquals(self.transport.framer.buffer, b'\x11\x5A')
 
     def test_reader_empty(self):
 
         self.device.read.return_value = ''
 
-        self.assertEquals(self.transport.read(), None)
+        self.assertEquals(self.transport.read(), [])
 
     def test_read_blank(self):
 
         self.device.read.return_value = b'\x00'
 
-        self.assertEquals(self.transport.read(), None)
+        self.assertEquals(self.transport.read(), [])
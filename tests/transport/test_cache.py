@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+from rfxcom.protocol import Lighting2, Packet, Status, TempHumidity
+from rfxcom.transport.cache import LastValueCache
+
+
+class LastValueCacheTestCase(TestCase):
+
+    def setUp(self):
+
+        self.cache = LastValueCache(('temperature', 'humidity'), size=2)
+        self.reading = {'temperature': 16.8, 'humidity': 45,
+                        'signal_level': 8}
+
+    def test_key(self):
+
+        pkt = bytearray(b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03\x89')
+
+        self.assertEquals(self.cache.key(pkt, TempHumidity()),
+                          (0x52, 0x02, 0x7002))
+        self.assertIsNone(self.cache.key(pkt, Status()))
+        self.assertIsNone(self.cache.key(pkt, Packet()))
+
+    def test_key_address(self):
+
+        pkt = bytearray(b'\x0B\x11\x00\x01\x01\x11\xF3\x42\x0A\x01\x0F\x70')
+
+        self.assertEquals(self.cache.key(pkt, Lighting2()),
+                          (0x11, 0x00, b'\x01\x11\xF3\x42', 0x0A))
+
+    def test_no_key(self):
+
+        self.cache.update(None, self.reading)
+
+        self.assertTrue(self.cache.update(None, self.reading))
+        self.assertEquals(len(self.cache), 0)
+
+    def test_first_reading(self):
+
+        self.assertTrue(self.cache.update((0x52, 0x02, 1), self.reading))
+        self.assertEquals(self.cache.get((0x52, 0x02, 1)), self.reading)
+
+    def test_unchanged(self):
+
+        self.cache.update((0x52, 0x02, 1), self.reading)
+        reading = dict(self.reading, signal_level=5)
+
+        self.assertFalse(self.cache.update((0x52, 0x02, 1), reading))
+        self.assertEquals(self.cache.get((0x52, 0x02, 1)), reading)
+
+    def test_changed(self):
+
+        self.cache.update((0x52, 0x02, 1), self.reading)
+
+        self.assertTrue(self.cache.update((0x52, 0x02, 1),
+                                          dict(self.reading, humidity=46)))
+
+    def test_no_fields(self):
+
+        self.cache.update((0x01, 0x00, None), {'firmware_version': 1})
+
+        self.assertTrue(self.cache.update((0x01, 0x00, None),
+                                          {'firmware_version': 1}))
+
+    def test_sensors_separate(self):
+
+        self.cache.update((0x52, 0x02, 1), self.reading)
+
+        self.assertTrue(self.cache.update((0x52, 0x02, 2), self.reading))
+
+    def test_size_bounded(self):
+
+        self.cache.update((0x52, 0x02, 1), self.reading)
+        self.cache.update((0x52, 0x02, 2), self.reading)
+        self.cache.update((0x52, 0x02, 1), self.reading)
+        self.cache.update((0x52, 0x02, 3), self.reading)
+
+        # The sensor heard from least recently is forgotten.
+        self.assertEquals(len(self.cache), 2)
+        self.assertNotIn((0x52, 0x02, 2), self.cache)
+        self.assertIn((0x52, 0x02, 1), self.cache)
+
+    def test_clear(self):
+
+        self.cache.update((0x52, 0x02, 1), self.reading)
+        self.cache.clear()
+
+        self.assertEquals(len(self.cache), 0)
@@ -0,0 +1,329 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from rfxcom.exceptions import InvalidCapture
+from rfxcom.transport.capture import (FILE_HEADER, MAGIC, RECORD_HEADER,
+                                      VERSION, CaptureReader, CaptureRecorder)
+
+
+class CaptureRecorderTestCase(TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'capture.rfx')
+        self.now = 50.0
+        self.packet = b'\x04\x02\x01\x00\x00'
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def recorder(self, **kwargs):
+        return CaptureRecorder(self.path, clock=lambda: self.now, **kwargs)
+
+    def read(self, path=None):
+        with open(path or self.path, 'rb') as f:
+            return f.read()
+
+    def test_header(self):
+
+        self.recorder().close()
+
+        magic, version, started = FILE_HEADER.unpack(self.read())
+
+        self.assertEquals(magic, MAGIC)
+        self.assertEquals(version, VERSION)
+        self.assertGreater(started, 0)
+
+    def test_record(self):
+
+        recorder = self.recorder()
+        self.now += 1.5
+        recorder.record(self.packet)
+        recorder.close()
+
+        data = self.read()[FILE_HEADER.size:]
+
+        self.assertEquals(RECORD_HEADER.unpack_from(data), (1500000, ))
+        self.assertEquals(data[RECORD_HEADER.size:], self.packet)
+
+    def test_buffered(self):
+
+        recorder = self.recorder(buffer_size=30)
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+
+        recorder.record(self.packet)
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size + 3 * 13)
+        recorder.close()
+
+    def test_flush_interval(self):
+
+        recorder = self.recorder(flush_interval=2)
+        recorder.record(self.packet)
+        self.now += 1
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+
+        self.now += 1
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size + 3 * 13)
+
+        self.now += 1
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size + 3 * 13)
+        recorder.close()
+
+    def test_flush_due_after_silence(self):
+
+        recorder = self.recorder(flush_interval=5)
+        self.now = 60
+        recorder.record(self.packet)
+        self.now = 61
+        recorder.record(self.packet)
+
+        self.now = 64
+        recorder.flush_due()
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+
+        # No more packets are recorded, the next check writes them.
+        self.now = 5 * 3600
+        recorder.flush_due()
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size + 2 * 13)
+        recorder.close()
+
+    def test_no_flush_interval(self):
+
+        recorder = self.recorder(flush_interval=None)
+        self.now += 3600
+        recorder.record(self.packet)
+
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+        recorder.close()
+
+    def test_rotate(self):
+
+        recorder = self.recorder(max_size=40, backup_count=2, buffer_size=0)
+
+        for _ in range(6):
+            recorder.record(self.packet)
+
+        recorder.close()
+
+        # Each file holds the header and two packets before it is rotated.
+        self.assertEquals(len(self.read(self.path + '.1')), 42)
+        self.assertEquals(len(self.read(self.path + '.2')), 42)
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+    def test_existing_file_rotated(self):
+
+        recorder = self.recorder()
+        recorder.record(self.packet)
+        recorder.close()
+
+        self.recorder().close()
+
+        self.assertEquals(len(self.read(self.path + '.1')),
+                          FILE_HEADER.size + 13)
+        self.assertEquals(len(self.read()), FILE_HEADER.size)
+
+    def test_close_twice(self):
+
+        recorder = self.recorder()
+        recorder.close()
+        recorder.close()
+
+
+class CaptureReaderTestCase(TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'capture.rfx')
+        self.packet = bytearray(b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03'
+                                b'\x89')
+        self.record(range(100))
+
+        with open(self.path, 'rb') as f:
+            self.started, = FILE_HEADER.unpack(f.read(FILE_HEADER.size))[2:]
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def record(self, seconds):
+        """Record a packet at each of the seconds, the sequence number of
+        the packet is the second.
+        """
+
+        self.now = 0
+        recorder = CaptureRecorder(self.path, clock=lambda: self.now,
+                                   backup_count=0)
+
+        for second in seconds:
+            self.now = second
+            self.packet[3] = second % 256
+            recorder.record(self.packet)
+
+        recorder.close()
+
+    def reader(self, **kwargs):
+        kwargs.setdefault('index_interval', 200)
+        return CaptureReader(self.path, **kwargs)
+
+    def sequence_numbers(self, frames):
+
+        numbers = []
+
+        for _, frame in frames:
+            numbers.append(frame[3])
+            frame.release()
+
+        return numbers
+
+    def test_frames(self):
+
+        with self.reader() as reader:
+
+            frames = list(reader.frames())
+
+            self.assertEquals(len(frames), 100)
+
+            timestamp, frame = frames[10]
+            self.assertAlmostEquals(timestamp, self.started + 10)
+            self.assertIsInstance(frame, memoryview)
+            self.assertEquals(frame[4:], self.packet[4:])
+
+            self.sequence_numbers(frames)
+
+    def test_range(self):
+
+        with self.reader() as reader:
+
+            frames = reader.frames(self.started + 42, self.started + 45)
+
+            self.assertEquals(self.sequence_numbers(frames), [42, 43, 44])
+
+    def test_range_reads_from_index(self):
+
+        with self.reader() as reader:
+
+            # The index has an entry every 200 bytes, about 10 packets.
+            self.assertEquals(len(reader._index_offsets), 10)
+
+            records = []
+            reader._records = mock_records(reader._records, records)
+
+            self.sequence_numbers(reader.frames(self.started + 95))
+
+            self.assertLess(len(records), 20)
+
+    def test_range_repeated_times(self):
+
+        # Ten packets each second, so the packets of a second span index
+        # entries.
+        self.record([1] * 10 + [2] * 10)
+
+        with self.reader(index_interval=40) as reader:
+            frames = reader.frames(reader.started + 1, reader.started + 2)
+            self.assertEquals(self.sequence_numbers(frames), [1] * 10)
+
+            frames = reader.frames(reader.started + 2)
+            self.assertEquals(self.sequence_numbers(frames), [2] * 10)
+
+    def test_range_open_ended(self):
+
+        with self.reader() as reader:
+
+            self.assertEquals(
+                self.sequence_numbers(reader.frames(stop=self.started + 2)),
+                [0, 1])
+            self.assertEquals(
+                self.sequence_numbers(reader.frames(self.started + 98)),
+                [98, 99])
+
+    def test_parse(self):
+
+        with self.reader() as reader:
+
+            (timestamp, result), = reader.parse(self.started + 7,
+                                                self.started + 8)
+
+        self.assertEquals(result['sequence_number'], 7)
+        self.assertEquals(result['id'], "0x7002")
+
+    def test_index_saved_and_loaded(self):
+
+        self.reader().close()
+
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+
+        with self.reader() as reader:
+
+            self.assertTrue(reader._load_index())
+            self.assertEquals(len(reader._index_offsets), 10)
+            self.assertEquals(
+                self.sequence_numbers(reader.frames(self.started + 50,
+                                                    self.started + 51)),
+                [50])
+
+    def test_index_extended(self):
+
+        self.reader().close()
+
+        with open(self.path, 'ab') as f:
+            self.packet[3] = 100
+            f.write(RECORD_HEADER.pack(100000000) + self.packet)
+
+        with self.reader() as reader:
+
+            self.assertEquals(
+                self.sequence_numbers(reader.frames(self.started + 100)),
+                [100])
+
+    def test_partial_record_ignored(self):
+
+        with open(self.path, 'ab') as f:
+            f.write(RECORD_HEADER.pack(100000000) + self.packet[:4])
+
+        with self.reader(save_index=False) as reader:
+            self.assertEquals(len(self.sequence_numbers(reader.frames())),
+                              100)
+
+    def test_invalid_capture(self):
+
+        with open(self.path, 'wb') as f:
+            f.write(b'\x00' * FILE_HEADER.size)
+
+        with self.assertRaises(InvalidCapture):
+            self.reader()
+
+    def test_short_capture(self):
+
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+
+        with self.assertRaises(InvalidCapture):
+            self.reader()
+
+
+def mock_records(records, calls):
+    """Wrap the _records method of a reader to count the records read."""
+
+    def wrapper(*args, **kwargs):
+        for record in records(*args, **kwargs):
+            calls.append(record)
+            yield record
+
+    return wrapper
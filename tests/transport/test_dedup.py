@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from rfxcom.transport.dedup import DuplicateFilter
+
+
+class DuplicateFilterTestCase(TestCase):
+
+    def setUp(self):
+
+        self.now = 100.0
+        self.dedup = DuplicateFilter(window=1, size=2, clock=lambda: self.now)
+        self.packet = bytearray(b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03'
+                                b'\x89')
+
+    def copy(self, sequence_number):
+        packet = bytearray(self.packet)
+        packet[3] = sequence_number
+        return packet
+
+    def test_first_packet(self):
+
+        self.assertFalse(self.dedup.is_duplicate(self.packet))
+        self.assertEquals(self.dedup.suppressed, 0)
+
+    def test_repeat_ignores_sequence_number(self):
+
+        self.dedup.is_duplicate(self.copy(1))
+        self.now += 0.2
+
+        self.assertTrue(self.dedup.is_duplicate(self.copy(2)))
+        self.assertTrue(self.dedup.is_duplicate(self.copy(3)))
+        self.assertEquals(self.dedup.suppressed, 2)
+        self.assertEquals(self.dedup.suppressed_by_type, {(0x52, 0x02): 2})
+
+    def test_different_reading(self):
+
+        self.dedup.is_duplicate(self.packet)
+        other = bytearray(self.packet)
+        other[7] = 0xA8
+
+        self.assertFalse(self.dedup.is_duplicate(other))
+
+    def test_window_passed(self):
+
+        self.dedup.is_duplicate(self.packet)
+        self.now += 1
+
+        self.assertFalse(self.dedup.is_duplicate(self.packet))
+
+    def test_size_bounded(self):
+
+        for id_ in range(3):
+            packet = bytearray(self.packet)
+            packet[4] = id_
+            self.dedup.is_duplicate(packet)
+
+        self.assertEquals(len(self.dedup._seen), 2)
+
+        # The least recently seen packet was forgotten.
+        packet[4] = 0
+        self.assertFalse(self.dedup.is_duplicate(packet))
+
+    def test_transmitter_responses_kept(self):
+
+        ack = bytearray(b'\x04\x02\x01\x01\x00')
+
+        self.assertFalse(self.dedup.is_duplicate(ack))
+        ack[3] = 2
+        self.assertFalse(self.dedup.is_duplicate(ack))
+
+    def test_clear(self):
+
+        self.dedup.is_duplicate(self.packet)
+        self.dedup.clear()
+
+        self.assertFalse(self.dedup.is_duplicate(self.packet))
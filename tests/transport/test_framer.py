@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from rfxcom.transport.framer import PacketFramer
+
+
+class PacketFramerTestCase(TestCase):
+
+    def setUp(self):
+
+        self.framer = PacketFramer()
+        self.packet = b'\x04\x02\x01\x00\x00'
+
+    def test_single_packet(self):
+
+        self.assertEquals(self.framer.feed(self.packet), [self.packet])
+        self.assertEquals(self.framer.buffer, b'')
+
+    def test_many_packets(self):
+
+        packets = self.framer.feed(self.packet * 3)
+
+        self.assertEquals(packets, [self.packet] * 3)
+
+    def test_partial_packet(self):
+
+        self.assertEquals(self.framer.feed(self.packet[:2]), [])
+        self.assertEquals(self.framer.feed(self.packet[2:4]), [])
+        self.assertEquals(self.framer.feed(self.packet[4:] + self.packet[:1]),
+                          [self.packet])
+        self.assertEquals(self.framer.buffer, self.packet[:1])
+
+    def test_padding(self):
+
+        packets = self.framer.feed(b'\x00\x00' + self.packet + b'\x00')
+
+        self.assertEquals(packets, [self.packet])
+        self.assertEquals(self.framer.padding, 3)
+
+        self.framer.feed(self.packet)
+        self.assertEquals(self.framer.padding, 0)
+
+    def test_clear(self):
+
+        self.framer.feed(self.packet[:3])
+        self.framer.clear()
+
+        self.assertEquals(self.framer.feed(self.packet), [self.packet])
@@ -0,0 +1,237 @@
+"""Unit tests for rfxcom.transport.nonblocking."""
+import asyncio
+import fcntl
+import os
+import pty
+import tty
+from unittest import TestCase, mock
+
+from rfxcom.transport.nonblocking import (AsyncioProtocolTransport,
+                                          SerialTransport)
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+def _set_non_blocking(fd):
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+
+class SerialTransportTestCase(TestCase):
+
+    def setUp(self):
+
+        self.loop = mock.Mock()
+        self.serial = mock.Mock(fd=5)
+        self.protocol = mock.Mock()
+        self.transport = SerialTransport(self.loop, self.serial,
+                                         self.protocol)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_read_ready(self, os_):
+
+        os_.read.return_value = b'\x01\x02'
+
+        self.transport._read_ready()
+
+        self.protocol.data_received.assert_called_once_with(b'\x01\x02')
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_read_hang_up(self, os_):
+
+        os_.read.return_value = b''
+
+        self.transport._read_ready()
+
+        self.assertTrue(self.transport.is_closing())
+        self.loop.call_soon.assert_called_with(
+            self.transport._call_connection_lost, mock.ANY)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_write_all(self, os_):
+
+        os_.write.return_value = 4
+
+        self.transport.write(b'\x01\x02\x03\x04')
+
+        self.assertEquals(self.transport.get_write_buffer_size(), 0)
+        self.assertFalse(self.loop.add_writer.called)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_write_buffered(self, os_):
+
+        os_.write.return_value = 1
+
+        self.transport.write(b'\x01\x02\x03\x04')
+
+        self.assertEquals(self.transport.get_write_buffer_size(), 3)
+        self.loop.add_writer.assert_called_once_with(
+            5, self.transport._write_ready)
+
+        # Writes are queued behind the buffer until the device is ready.
+        self.transport.write(b'\x05')
+        self.assertEquals(os_.write.call_count, 1)
+
+        os_.write.return_value = 4
+        self.transport._write_ready()
+
+        self.assertEquals(self.transport.get_write_buffer_size(), 0)
+        self.loop.remove_writer.assert_called_once_with(5)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_write_would_block(self, os_):
+
+        os_.write.side_effect = BlockingIOError
+
+        self.transport.write(b'\x01\x02')
+
+        self.assertEquals(self.transport.get_write_buffer_size(), 2)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_call_when_drained(self, os_):
+
+        callback = mock.Mock()
+        os_.write.return_value = 1
+
+        self.assertTrue(self.transport.call_when_drained(callback))
+
+        self.transport.write(b'\x01\x02')
+
+        self.assertFalse(self.transport.call_when_drained(callback))
+        self.assertFalse(callback.called)
+
+        self.transport._write_ready()
+
+        callback.assert_called_once_with(None)
+
+    @mock.patch('rfxcom.transport.nonblocking.os')
+    def test_drain_callback_on_abort(self, os_):
+
+        callback = mock.Mock()
+        os_.write.return_value = 1
+
+        self.transport.write(b'\x01\x02')
+        self.transport.call_when_drained(callback)
+        self.transport.abort()
+
+        exc, = callback.call_args[0]
+        self.assertIsInstance(exc, ConnectionAbortedError)
+
+    def test_close(self):
+
+        self.transport.close()
+
+        self.assertTrue(self.transport.is_closing())
+        self.loop.remove_reader.assert_called_once_with(5)
+
+        self.transport._call_connection_lost(None)
+
+        self.protocol.connection_lost.assert_called_once_with(None)
+        self.serial.close.assert_called_once_with()
+
+
+class AsyncioProtocolTransportTestCase(TestCase):
+
+    def setUp(self):
+
+        self.elec_packet = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                            b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        _set_non_blocking(self.master)
+
+        self.loop = asyncio.new_event_loop()
+        self.callback = mock.Mock()
+
+        with mock.patch('asyncio.async'), mock.patch(
+                'rfxcom.transport.asyncio.AsyncioTransport._setup'):
+            self.transport = AsyncioProtocolTransport(
+                mock.Mock(fd=self.master), self.loop, callback=self.callback)
+
+    def tearDown(self):
+
+        self.loop.close()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def run_loop(self):
+        self.loop.call_later(0.1, self.loop.stop)
+        self.loop.run_forever()
+
+    def test_read(self):
+
+        os.write(self.slave, self.elec_packet[:7])
+        self.run_loop()
+
+        self.assertFalse(self.callback.called)
+
+        os.write(self.slave, self.elec_packet[7:] + self.elec_packet)
+        self.run_loop()
+
+        self.assertEquals(self.callback.call_count, 2)
+        packet = self.callback.call_args[0][0]
+        self.assertEquals(packet.raw, self.elec_packet)
+        self.assertEquals(packet.data['current_watts'], 692)
+
+    def test_write(self):
+
+        self.run_loop()
+        self.transport.write(self.elec_packet)
+        self.run_loop()
+
+        self.assertEquals(os.read(self.slave, 100), self.elec_packet)
+
+    def test_write_done_once_drained(self):
+
+        serial_transport = self.transport.serial_transport = mock.Mock()
+        serial_transport.call_when_drained.return_value = False
+
+        first = self.transport.write(self.elec_packet)
+        second = self.transport.write(self.elec_packet)
+
+        # The first packet is still buffered, so it isn't done and the
+        # second waits for it.
+        self.assertFalse(first.done())
+        self.assertEquals(serial_transport.write.call_count, 1)
+
+        callback, = serial_transport.call_when_drained.call_args[0]
+        callback(None)
+
+        self.assertTrue(first.done())
+        self.assertFalse(second.done())
+        self.assertEquals(serial_transport.write.call_count, 2)
+
+    def test_write_gap_after_drained(self):
+
+        serial_transport = self.transport.serial_transport = mock.Mock()
+        serial_transport.call_when_drained.return_value = False
+        self.transport.write_gap = 0.05
+
+        self.transport.write(self.elec_packet)
+        self.transport.write(self.elec_packet)
+
+        # The gap doesn't start until the first packet has been written.
+        self.loop.run_until_complete(asyncio.sleep(0.1, loop=self.loop))
+        self.assertEquals(serial_transport.write.call_count, 1)
+
+        callback, = serial_transport.call_when_drained.call_args[0]
+        callback(None)
+
+        self.assertEquals(serial_transport.write.call_count, 1)
+        self.loop.run_until_complete(asyncio.sleep(0.1, loop=self.loop))
+        self.assertEquals(serial_transport.write.call_count, 2)
+
+    def test_write_failed(self):
+
+        serial_transport = self.transport.serial_transport = mock.Mock()
+        serial_transport.call_when_drained.return_value = False
+
+        future = self.transport.write(self.elec_packet)
+
+        callback, = serial_transport.call_when_drained.call_args[0]
+        callback(ConnectionAbortedError())
+
+        with self.assertRaises(ConnectionAbortedError):
+            future.result()
@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+from rfxcom.protocol import (Elec, Lighting2, Lighting6, Packet, Status,
+                             TempHumidity, Transmitter)
+from rfxcom.transport.registry import SensorRegistry
+
+
+class SensorRegistryTestCase(TestCase):
+
+    def setUp(self):
+
+        self.now = 1000
+        self.registry = SensorRegistry(clock=lambda: self.now)
+
+    def temphumidity(self, id_, rssi=0x89):
+        return bytearray([0x0A, 0x52, 0x02, 0x11, id_, 0x02, 0x80, 0xA7,
+                          0x2D, 0x03, rssi])
+
+    def update(self, Handler, pkt):
+
+        parser = Handler()
+        parser.load(pkt)
+
+        return self.registry.update(pkt, parser)
+
+    def test_update(self):
+
+        sensor = self.update(TempHumidity, self.temphumidity(0x70))
+
+        self.assertEquals(sensor.key, (0x52, 0x02, 0x7002))
+        self.assertEquals(sensor.id, "0x7002")
+        self.assertEquals(sensor.battery_level, 9)
+        self.assertEquals(sensor.signal_level, 8)
+        self.assertEquals(sensor.last_seen, 1000)
+        self.assertEquals(sensor.data['humidity'], 45)
+        self.assertIs(self.registry.get((0x52, 0x02, 0x7002)), sensor)
+        self.assertEquals(len(self.registry), 1)
+
+    def test_update_existing(self):
+
+        first = self.update(TempHumidity, self.temphumidity(0x70))
+        self.now = 1010
+        second = self.update(TempHumidity, self.temphumidity(0x70, 0x51))
+
+        self.assertIs(first, second)
+        self.assertEquals(len(self.registry), 1)
+        self.assertEquals(second.last_seen, 1010)
+        self.assertEquals(self.registry.low_battery(1), [second])
+        self.assertEquals(self.registry.low_battery(0), [])
+
+    def test_by_id(self):
+
+        sensor = self.update(TempHumidity, self.temphumidity(0x70))
+        self.update(TempHumidity, self.temphumidity(0x71))
+
+        self.assertEquals(self.registry.by_id("0x7002"), [sensor])
+        self.assertEquals(self.registry.by_id("0x0000"), [])
+
+    def test_by_type(self):
+
+        temphumidity = self.update(TempHumidity, self.temphumidity(0x70))
+        elec = self.update(Elec, bytearray(
+            b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00\x02\xB4\x00\x00\x0C\x46'
+            b'\xA8\x11\x69'))
+
+        self.assertEquals(self.registry.by_type(0x52), [temphumidity])
+        self.assertEquals(self.registry.by_type(0x5A, 0x01), [elec])
+        self.assertEquals(self.registry.by_type(0x5A, 0x02), [])
+
+    def test_no_battery(self):
+
+        sensor = self.update(Lighting2, bytearray(
+            b'\x0B\x11\x00\x01\x01\x11\xF3\x42\x0A\x01\x0F\x40'))
+
+        self.assertIsNone(sensor.battery_level)
+        self.assertEquals(self.registry.low_battery(15), [])
+        self.assertEquals(self.registry.weak_signal(4), [sensor])
+
+    def test_last_seen(self):
+
+        old = self.update(TempHumidity, self.temphumidity(0x70))
+        self.now = 1010
+        new = self.update(TempHumidity, self.temphumidity(0x71))
+
+        self.assertEquals(self.registry.seen_since(1005), [new])
+        self.assertEquals(self.registry.seen_since(1000), [new, old])
+        self.assertEquals(self.registry.not_seen_since(1005), [old])
+
+        self.now = 1020
+        self.update(TempHumidity, self.temphumidity(0x70))
+
+        self.assertEquals(self.registry.not_seen_since(1015), [new])
+
+    def test_remove(self):
+
+        sensor = self.update(TempHumidity, self.temphumidity(0x70))
+        self.registry.remove(sensor.key)
+
+        self.assertNotIn(sensor.key, self.registry)
+        self.assertEquals(self.registry.by_id("0x7002"), [])
+        self.assertEquals(self.registry.by_type(0x52), [])
+        self.assertEquals(self.registry.low_battery(15), [])
+
+    def test_lighting_units(self):
+
+        for unit_code in (1, 2):
+            self.update(Lighting2, bytearray(
+                Lighting2.encode(0x00, 0x0111F342, unit_code, "On")))
+
+        sensor = self.update(Lighting6, bytearray(
+            Lighting6.encode(0x00, 0x0102, 0x42, 3, "On")))
+
+        self.assertEquals(len(self.registry), 3)
+        self.assertEquals(len(self.registry.by_id("0x0111F342")), 2)
+        self.assertEquals(sensor.key, (0x15, 0x00, b'\x01\x02', 0x42, 3))
+        self.assertEquals(sensor.packet_type, 0x15)
+        self.assertEquals(sensor.packet_subtype, 0x00)
+
+    def test_ignored(self):
+
+        status = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                           b'\x2F\x01\x01\x00\x00')
+
+        self.assertIsNone(self.update(Status, status))
+        self.assertIsNone(self.update(Transmitter, bytearray(
+            b'\x04\x02\x01\x07\x00')))
+        self.assertIsNone(self.update(Packet, bytearray(
+            b'\x05\xEE\x01\x00\x01\x02')))
+        self.assertEquals(len(self.registry), 0)
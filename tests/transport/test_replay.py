@@ -0,0 +1,127 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock
+
+from rfxcom.protocol import TempHumidity
+from rfxcom.transport.capture import CaptureRecorder
+from rfxcom.transport.replay import ReplayTransport
+
+
+class ReplayTransportTestCase(TestCase):
+
+    def setUp(self):
+
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'capture.rfx')
+        self.packet = bytearray(b'\x0A\x52\x02\x11\x70\x02\x80\xA7\x2D\x03'
+                                b'\x89')
+
+        now = [0]
+        recorder = CaptureRecorder(self.path, clock=lambda: now[0])
+
+        for second in (0, 1, 3):
+            now[0] = second
+            self.packet[3] = second
+            recorder.record(self.packet)
+
+        recorder.close()
+
+        self.now = 100
+        self.sleeps = []
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+    def transport(self, **kwargs):
+        return ReplayTransport(self.path, clock=lambda: self.now,
+                               sleep=self.sleep, **kwargs)
+
+    def test_callback(self):
+
+        callback = Mock()
+        transport = self.transport(callback=callback)
+        transport.run()
+
+        self.assertEquals(callback.call_count, 3)
+        self.assertEquals(
+            [args[0].data['sequence_number']
+             for args, _ in callback.call_args_list], [0, 1, 3])
+        self.assertIsInstance(callback.call_args[0][0], TempHumidity)
+        transport.close()
+
+    def test_callbacks(self):
+
+        callback = Mock()
+        transport = self.transport(callbacks={TempHumidity: callback})
+        transport.run()
+
+        self.assertEquals(callback.call_count, 3)
+        transport.close()
+
+    def test_original_timing(self):
+
+        transport = self.transport(callback=Mock())
+
+        self.assertEquals(transport.run(), 1)
+        self.assertEquals(self.sleeps, [1, 2])
+        self.assertEquals(transport.elapsed, 3)
+        transport.close()
+
+    def test_speed(self):
+
+        transport = self.transport(callback=Mock(), speed=10)
+        transport.run()
+
+        self.assertEquals(self.sleeps, [0.1, 0.2])
+        self.assertAlmostEquals(transport.fps, 10)
+        transport.close()
+
+    def test_speed_callbacks_slower(self):
+
+        def callback(parser):
+            self.now += 1.2
+
+        transport = self.transport(callback=callback)
+        transport.run()
+
+        # The first packet took longer than the gap to the second, which is
+        # replayed straight away, and the third waits for less time.
+        self.assertEquals(self.sleeps, [0.6])
+        transport.close()
+
+    def test_as_fast_as_possible(self):
+
+        transport = self.transport(callback=Mock(), speed=None)
+        transport.run()
+
+        self.assertEquals(self.sleeps, [])
+        self.assertEquals(transport.count, 3)
+        self.assertEquals(transport.fps, 0)
+        transport.close()
+
+    def test_read(self):
+
+        transport = self.transport(callback=Mock())
+
+        self.assertEquals(transport.read()[0][3], 0)
+        self.assertFalse(transport.finished)
+
+        transport.read()
+        transport.read()
+
+        self.assertEquals(transport.read(), [])
+        self.assertTrue(transport.finished)
+        transport.close()
+
+    def test_write_dropped(self):
+
+        transport = self.transport(callback=Mock())
+        transport.write(b'\x0D\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+                        b'\x00\x00')
+        transport.close()